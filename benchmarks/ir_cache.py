@@ -0,0 +1,96 @@
+"""
+Module:
+3250.1 Compilateurs
+Auteur:
+WICKI Sélien
+Date: 18.10.2026
+
+IR cache (pdfIrCache) against the front end : time to lex, parse and analyse a synthetic
+document against the time to load its analysed IR from the cache.
+
+    python benchmarks/ir_cache.py [--sections 100,1000,5000] [--repeat 5]
+
+The loaded IR must be the analysed IR (same styles, content and messages), and a corrupted
+entry must be detected and rebuilt (exits with status 1 otherwise).
+"""
+
+# System imports
+import os
+import sys
+import time
+import tempfile
+
+# The compiler modules are in the parent directory
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pdfCompiler import Compiler
+from pdfIrCache import IrCache, ir_key
+from pdfAst import to_data
+from synthetic_document import generate_document
+
+
+def best_time(function, repeat):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def comparable(analysis):
+    """Analysis with its syntax tree nodes as data (nodes have no equality)."""
+    styles, page_number, numberize_titles, doc_content, errors, warnings = analysis
+    content = [{**item, "content": to_data(item["content"])} for item in doc_content]
+    return styles, page_number, numberize_titles, content, errors, warnings
+
+
+def run(sections_list=(100, 1000, 5000), repeat=5):
+    print(f"{'sections':>9} {'front end (s)':>14} {'IR load (s)':>12} {'ratio':>7} {'entry (KiB)':>12}")
+
+    with tempfile.TemporaryDirectory() as directory:
+        cache = IrCache(directory)
+        front_end = Compiler()
+        cached = Compiler(ir_cache=cache)
+
+        for sections in sections_list:
+            source = generate_document(sections)
+            key = ir_key(source)
+            expected = front_end.front_end(source)
+
+            analyse = best_time(lambda: front_end.front_end(source), repeat)
+            cached.front_end(source)  # Stores the entry
+            load = best_time(lambda: cache.load(key), repeat)
+
+            if comparable(cached.front_end(source)) != comparable(expected):
+                print(f"The cached IR of {sections} sections differs from the analysed IR")
+                return False
+
+            size = os.path.getsize(cache.entry_file(key))
+            print(f"{sections:>9} {analyse:>14.4f} {load:>12.4f} {load / analyse:>7.1%} {size / 1024:>12.0f}")
+
+            # A flipped byte in the payload : detected, removed, rebuilt by the next compilation
+            with open(cache.entry_file(key), 'r+b') as f:
+                f.seek(-10, os.SEEK_END)
+                byte = f.read(1)
+                f.seek(-10, os.SEEK_END)
+                f.write(bytes([byte[0] ^ 0xFF]))
+            corrupt = cache.stats["corrupt"]
+            if cache.load(key) is not None or cache.stats["corrupt"] != corrupt + 1:
+                print("The corrupted entry was not detected")
+                return False
+            cached.front_end(source)
+            if cache.load(key) is None:
+                print("The corrupted entry was not rebuilt")
+                return False
+
+    print("\nSame IR from the cache, corrupted entries detected and rebuilt")
+    return True
+
+
+if __name__ == '__main__':
+    arguments = sys.argv[1:]
+    sections_list = [int(value) for value in arguments[arguments.index("--sections") + 1].split(",")] if "--sections" in arguments else (100, 1000, 5000)
+    repeat = int(arguments[arguments.index("--repeat") + 1]) if "--repeat" in arguments else 5
+    sys.exit(0 if run(sections_list, repeat) else 1)
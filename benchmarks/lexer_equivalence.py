@@ -0,0 +1,111 @@
+"""
+Module:
+3250.1 Compilateurs
+Auteur:
+WICKI Sélien
+Date: 18.10.2026
+
+Differential check of the fast lexer (pdfFastLexer) against the PLY lexer (pdfLexer) : both
+lexers tokenize a generated corpus and must emit the same token stream (type, value, line,
+position) and report the same illegal characters.
+
+    python benchmarks/lexer_equivalence.py [--documents 2000] [--seed 0]
+
+The corpus holds the example files, generated valid documents and random sources built from
+the pieces of the language (keywords, prefixes of keywords, strings, numbers, blanks, accented
+and illegal characters). Exits with status 1 at the first difference.
+"""
+
+# System imports
+import os
+import io
+import sys
+import glob
+import random
+import contextlib
+
+# The compiler modules are in the parent directory
+root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, root)
+
+from pdfLexer import lexer as ply_lexer
+from pdfFastLexer import lexer as fast_lexer
+from synthetic_document import generate_document
+
+# Pieces of the random sources
+pieces = [
+    "$style", "$pageNumber", "$numberizeTitle", "$title", "$section", "$bold", "$italic", "$underlined",
+    "$sty", "$", "$Title",
+    "#name", "#style", "#fontSize", "#font", "#fontColor", "#level", "#pageNumberPosition",
+    "#pageNumberFontSize", "#pageNumberFont", "#pageNumberFontColor", "#pageNumberStart",
+    "#numberizeTitleStart", "#names", "#", "#unknown",
+    "(", ")", "{", "}", "=", ",", '"', '"Arial"', '""', '"multi\nline"',
+    "0", "12", "007", "12px", "text", "Some words", "été", "ça", "l'école", "a_b;c", "-!?.",
+    " ", "  ", "\t", "\n", "\n\n", " \n ", "@", "*", "<b>", "%", "\r", "\x0b", "\x1c", "\x85", "\xa0",
+    "\u2003", "\u2028", "\u3000", "\u200b", "\U0001f600",
+]
+
+
+def tokens(lexer, source):
+    """Token stream and printed messages of a lexer on a source."""
+    lexer = lexer.clone()
+    lexer.lineno = 1
+    lexer.lexstatestack = []
+    lexer.begin("INITIAL")
+
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        lexer.input(source)
+        stream = []
+        while True:
+            tok = lexer.token()
+            if not tok:
+                break
+            stream.append((tok.type, tok.value, tok.lineno, tok.lexpos))
+    return stream, output.getvalue()
+
+
+def random_source(rng):
+    return "".join(rng.choice(pieces) for _ in range(rng.randint(1, 60)))
+
+
+def corpus(documents, seed):
+    """(name, source) of the documents to compare."""
+    for path in sorted(glob.glob(os.path.join(root, "*Code", "*.txt"))):
+        with open(path, 'r') as f:
+            yield os.path.basename(path), f.read()
+
+    for sections in (1, 10, 1000):
+        yield f"generated {sections} sections", generate_document(sections)
+
+    rng = random.Random(seed)
+    for i in range(documents):
+        yield f"random {i}", random_source(rng)
+
+
+def run(documents=2000, seed=0):
+    count = 0
+    for name, source in corpus(documents, seed):
+        expected = tokens(ply_lexer, source)
+        found = tokens(fast_lexer, source)
+        if found != expected:
+            print(f"Difference on {name} : {source!r}")
+            for ply_token, fast_token in zip(expected[0], found[0]):
+                if ply_token != fast_token:
+                    print(f"  PLY  : {ply_token}\n  fast : {fast_token}")
+                    break
+            else:
+                print(f"  PLY  : {len(expected[0])} tokens, output {expected[1]!r}")
+                print(f"  fast : {len(found[0])} tokens, output {found[1]!r}")
+            return False
+        count += 1
+
+    print(f"Same token stream on {count} documents")
+    return True
+
+
+if __name__ == '__main__':
+    arguments = sys.argv[1:]
+    documents = int(arguments[arguments.index("--documents") + 1]) if "--documents" in arguments else 2000
+    seed = int(arguments[arguments.index("--seed") + 1]) if "--seed" in arguments else 0
+    sys.exit(0 if run(documents, seed) else 1)
@@ -0,0 +1,73 @@
+"""
+Module:
+3250.1 Compilateurs
+Auteur:
+WICKI Sélien
+Date: 18.10.2026
+
+Throughput of the lexer backends : tokens per second of the PLY lexer (pdfLexer) and of the
+fast lexer (pdfFastLexer) on generated documents.
+
+    python benchmarks/lexer_speed.py [--sections 20000] [--repeat 5] [--min-speedup 2.0]
+
+Both lexers run in turn `repeat` times, the best time of each is kept. Exits with status 1 if
+the fast lexer is less than `min-speedup` times faster than the PLY lexer.
+"""
+
+# System imports
+import os
+import sys
+import time
+
+# The compiler modules are in the parent directory
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pdfLexer import lexer as ply_lexer
+from pdfFastLexer import lexer as fast_lexer
+from synthetic_document import generate_document
+
+
+def time_lexer(lexer, source):
+    """Number of tokens and CPU time of a tokenization of the source."""
+    lexer = lexer.clone()
+    lexer.lineno = 1
+    lexer.begin("INITIAL")
+
+    start = time.process_time()
+    lexer.input(source)
+    token = lexer.token
+    count = 0
+    while token():
+        count += 1
+    return count, time.process_time() - start
+
+
+def run(sections=20000, repeat=5, min_speedup=2.0):
+    source = generate_document(sections)
+    best = {}
+    counts = {}
+    for _ in range(repeat):
+        for name, lexer in (("ply", ply_lexer), ("fast", fast_lexer)):
+            counts[name], elapsed = time_lexer(lexer, source)
+            best[name] = min(best.get(name, elapsed), elapsed)
+
+    if counts["ply"] != counts["fast"]:
+        print(f"The lexers do not emit the same number of tokens : {counts}")
+        return False
+
+    print(f"{len(source)} characters, {counts['ply']} tokens")
+    print(f"{'lexer':>6} {'time (s)':>10} {'tokens/s':>12}")
+    for name in ("ply", "fast"):
+        print(f"{name:>6} {best[name]:>10.3f} {counts[name] / best[name]:>12.0f}")
+
+    speedup = best["ply"] / best["fast"]
+    print(f"\nSpeedup of the fast lexer : {speedup:.2f} (minimum {min_speedup})")
+    return speedup >= min_speedup
+
+
+if __name__ == '__main__':
+    arguments = sys.argv[1:]
+    sections = int(arguments[arguments.index("--sections") + 1]) if "--sections" in arguments else 20000
+    repeat = int(arguments[arguments.index("--repeat") + 1]) if "--repeat" in arguments else 5
+    min_speedup = float(arguments[arguments.index("--min-speedup") + 1]) if "--min-speedup" in arguments else 2.0
+    sys.exit(0 if run(sections, repeat, min_speedup) else 1)
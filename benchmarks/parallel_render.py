@@ -0,0 +1,123 @@
+"""
+Module:
+3250.1 Compilateurs
+Auteur:
+WICKI Sélien
+Date: 18.10.2026
+
+Parallel rendering (pdfParallel) against the serial create_pdf : wall time of the generation of
+the PDF of a synthetic document with 1 to `max-workers` worker processes.
+
+    python benchmarks/parallel_render.py [--sections 2000] [--max-workers <number of CPUs>] [--repeat 3]
+
+The serial build gives the reference PDF, every parallel build must give the same bytes (exits
+with status 1 otherwise). The layout of the pages stays serial : the speedup is bounded by the
+share of the time spent in the main process (unpickling the prepared paragraphs, placing them,
+drawing, writing the file). This share is measured in one process first, so the bound is also
+given on a machine with a single CPU (where create_pdf_parallel builds the PDF serially).
+
+Measured on a single slow core (best of 3 to 5) :
+
+    sections   serial   prewrap   pickle   unpickle   layout   bound
+        2000    2.08 s    1.59 s   0.12 s     0.49 s   0.76 s   1.66
+        8000    8.42 s    7.11 s   0.50 s     1.78 s   3.06 s   1.74
+
+On this core, a pool of 1 to 4 workers took 0.5 to 1.1 times the serial time : the workers
+compete with the layout for the only CPU.
+"""
+
+# System imports
+import io
+import os
+import sys
+import time
+import pickle
+import itertools
+import tempfile
+
+# The compiler modules are in the parent directory
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pdfCompiler import Compiler
+from pdfGenerator import create_pdf, build_document, FlowableStream
+from pdfParallel import create_pdf_parallel, init_worker, prewrap_segment, split_segments, frame_width
+from synthetic_document import generate_document
+
+
+def best_time(function, repeat):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def stage_times(semantic_data, repeat):
+    """Best time of each stage of the parallel rendering run in this process (the work of the workers included)."""
+    init_worker(semantic_data["Styles"], frame_width())
+    segments = split_segments(semantic_data["Content"])
+    state = {}
+
+    def prewrap():
+        state["prepared"] = [prewrap_segment(segment) for segment in segments]
+
+    def dump():
+        state["pickled"] = [pickle.dumps(prepared) for prepared in state["prepared"]]
+
+    def load():
+        state["prepared"] = [pickle.loads(pickled) for pickled in state["pickled"]]
+
+    def layout():
+        story = FlowableStream(itertools.chain.from_iterable(state["prepared"]))
+        build_document(story, semantic_data["PageNumberConfig"], io.BytesIO(), True)
+
+    times = {"prewrap": best_time(prewrap, 1), "pickle": best_time(dump, repeat)}
+    # Each layout uses freshly unpickled paragraphs (a laid out paragraph keeps its lines)
+    loads, layouts = zip(*((best_time(load, 1), best_time(layout, 1)) for _ in range(repeat)))
+    times["unpickle"], times["layout"] = min(loads), min(layouts)
+    return times
+
+
+def run(sections=2000, max_workers=None, repeat=3):
+    compiler = Compiler()
+    styles, page_number, _, doc_content, _, _ = compiler.analyze(compiler.parse(generate_document(sections)))
+    semantic_data = {"Styles": styles, "PageNumberConfig": page_number, "Content": doc_content}
+    max_workers = max_workers or os.cpu_count()
+
+    with tempfile.TemporaryDirectory() as directory:
+        serial_file = os.path.join(directory, "serial.pdf")
+        serial = best_time(lambda: create_pdf(semantic_data, serial_file, invariant=True), repeat)
+        with open(serial_file, 'rb') as f:
+            expected = f.read()
+
+        times = stage_times(semantic_data, repeat)
+        main = times["unpickle"] + times["layout"]
+        print(f"{sections} sections, {os.cpu_count()} CPUs")
+        print(f"Serial {serial:.3f} s : " + ", ".join(f"{stage} {elapsed:.3f} s" for stage, elapsed in times.items()))
+        print(f"Main process {main:.3f} s ({main / serial:.0%} of the serial time), speedup at most {serial / main:.2f}\n")
+        print(f"{'workers':>8} {'time (s)':>10} {'speedup':>8}")
+        print(f"{'serial':>8} {serial:>10.3f} {1:>8.2f}")
+
+        for workers in range(1, max_workers + 1):
+            parallel_file = os.path.join(directory, f"parallel{workers}.pdf")
+            elapsed = best_time(
+                lambda: create_pdf_parallel(semantic_data, parallel_file, invariant=True, workers=workers), repeat
+            )
+            with open(parallel_file, 'rb') as f:
+                if f.read() != expected:
+                    print(f"The PDF built with {workers} workers differs from the serial PDF")
+                    return False
+            print(f"{workers:>8} {elapsed:>10.3f} {serial / elapsed:>8.2f}")
+
+    print("\nSame PDF for every number of workers")
+    return True
+
+
+if __name__ == '__main__':
+    arguments = sys.argv[1:]
+    sections = int(arguments[arguments.index("--sections") + 1]) if "--sections" in arguments else 2000
+    max_workers = int(arguments[arguments.index("--max-workers") + 1]) if "--max-workers" in arguments else None
+    repeat = int(arguments[arguments.index("--repeat") + 1]) if "--repeat" in arguments else 3
+    sys.exit(0 if run(sections, max_workers, repeat) else 1)
@@ -0,0 +1,74 @@
+"""
+Module:
+3250.1 Compilateurs
+Auteur:
+WICKI Sélien
+Date: 18.10.2026
+
+Scaling benchmark of the parser : parses documents of 10 to 100k sections and checks that the
+parse time per section stays constant (linear parse time). Each size is parsed with one
+instruction per line and with the whole document on a single line.
+
+    python benchmarks/parse_scaling.py [--max 100000] [--tolerance 2.0]
+
+Exits with status 1 if, for one of the two layouts, the time per section of the largest document
+is more than `tolerance` times the time per section of the 1000 sections document.
+"""
+
+# System imports
+import os
+import sys
+import time
+
+# The compiler modules are in the parent directory
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pdfCompiler import Compiler
+from synthetic_document import generate_document
+
+
+def time_parse(compiler, source, repeat):
+    """Best time of `repeat` parses of the source."""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        compiler.parse(source)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def run(max_sections=100000, tolerance=2.0):
+    compiler = Compiler()
+    sizes = [size for size in (10, 100, 1000, 10000, 100000) if size <= max_sections]
+    linear = True
+
+    for layout, separator in (("one instruction per line", "\n"), ("single line", " ")):
+        print(f"{layout}\n{'sections':>10} {'time (s)':>10} {'us/section':>12}")
+        per_section = {}
+        for size in sizes:
+            source = generate_document(size, separator=separator)
+            elapsed = time_parse(compiler, source, repeat=5 if size <= 1000 else 1)
+            per_section[size] = elapsed / size
+            print(f"{size:>10} {elapsed:>10.4f} {per_section[size] * 1e6:>12.2f}")
+
+        # Small documents are dominated by constant costs : the reference is 1000 sections
+        reference = per_section.get(1000)
+        largest = sizes[-1]
+        if reference is None or largest == 1000:
+            print()
+            continue
+
+        ratio = per_section[largest] / reference
+        print(f"Time per section at {largest} sections / at 1000 sections : {ratio:.2f} (tolerance {tolerance})\n")
+        linear = linear and ratio <= tolerance
+
+    print("Linear parse time" if linear else "Parse time is NOT linear")
+    return linear
+
+
+if __name__ == '__main__':
+    arguments = sys.argv[1:]
+    max_sections = int(arguments[arguments.index("--max") + 1]) if "--max" in arguments else 100000
+    tolerance = float(arguments[arguments.index("--tolerance") + 1]) if "--tolerance" in arguments else 2.0
+    sys.exit(0 if run(max_sections, tolerance) else 1)
@@ -0,0 +1,197 @@
+"""
+Module:
+3250.1 Compilateurs
+Auteur:
+WICKI Sélien
+Date: 18.10.2026
+
+End-to-end benchmark of the compiler : time and peak memory of each stage of the pipeline on
+synthetic documents (see synthetic_document.py).
+
+    python benchmarks/pipeline.py [--sections 100,1000] [--inline-density 0.5] [--styles 3]
+                                  [--title-depth 3] [--repeat 3] [--lexer ply] [--low-memory]
+                                  [--output results.json] [--baseline benchmarks/baseline.json]
+                                  [--threshold 0.25] [--update-baseline]
+
+Stages :
+    lexer -> tokenization of the source (Compiler.tokenize)
+    parser.parse -> parsing of the source (lexing included, as in a compilation)
+    semantical_analysis -> semantic analysis of the parse tree
+    create_pdf -> generation of the PDF (to a temporary file, --low-memory : low memory mode of create_pdf)
+
+The time of a stage is its best CPU time of `repeat` runs, the stages being run in turn. Its
+peak memory (tracemalloc) is measured in a separate run, tracing slows the code down.
+
+The results are written as JSON to --output. When the baseline file exists, each stage is
+compared to it : exits with status 1 if the time or the peak memory of a stage exceeds the
+baseline by more than `threshold` (0.25 -> 25 %). --update-baseline writes the results as the
+new baseline. Baselines are only comparable on the same machine.
+"""
+
+# System imports
+import os
+import sys
+import json
+import time
+import platform
+import tempfile
+import tracemalloc
+
+# The compiler modules are in the parent directory
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from reportlab import Version as reportlab_version
+
+from pdfCompiler import Compiler
+from pdfSemantic import semantical_analysis
+from pdfGenerator import create_pdf
+from synthetic_document import generate_document
+
+default_baseline = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+
+stages = ["lexer", "parser.parse", "semantical_analysis", "create_pdf"]
+
+
+def stage_functions(compiler, source, pdf_file, low_memory=False):
+    """Function running each stage, every stage gets the result of the previous one."""
+    parsed_data = compiler.parse(source)
+    styles, page_number, _, doc_content, errors, _ = semantical_analysis(parsed_data)
+    if errors:
+        raise ValueError(f"The generated document has errors : {errors[:3]}")
+    semantic_data = {"Styles": styles, "PageNumberConfig": page_number, "Content": doc_content}
+
+    return {
+        "lexer": lambda: compiler.tokenize(source),
+        "parser.parse": lambda: compiler.parse(source),
+        "semantical_analysis": lambda: semantical_analysis(parsed_data),
+        "create_pdf": lambda: create_pdf(semantic_data, pdf_file, invariant=True, low_memory=low_memory),
+    }
+
+
+def measure(functions, repeat):
+    """{stage: {"time": best CPU time (s), "peak_memory": bytes}}"""
+    times = {}
+    for _ in range(repeat):
+        for stage in stages:
+            start = time.process_time()
+            functions[stage]()
+            elapsed = time.process_time() - start
+            times[stage] = min(times.get(stage, elapsed), elapsed)
+
+    results = {}
+    tracemalloc.start()
+    for stage in stages:
+        tracemalloc.reset_peak()
+        base = tracemalloc.get_traced_memory()[0]
+        functions[stage]()
+        results[stage] = {"time": times[stage], "peak_memory": tracemalloc.get_traced_memory()[1] - base}
+    tracemalloc.stop()
+    return results
+
+
+def run_benchmark(sizes, document_options, repeat=3, lexer_backend="ply", low_memory=False):
+    """Results of the benchmark (JSON serializable) on documents of each size."""
+    compiler = Compiler(lexer_backend=lexer_backend)
+    results = {
+        "python": platform.python_version(),
+        "reportlab": reportlab_version,
+        "lexer": lexer_backend,
+        "low_memory": low_memory,
+        "repeat": repeat,
+        "documents": {},
+    }
+
+    with tempfile.TemporaryDirectory() as directory:
+        for sections in sizes:
+            source = generate_document(sections, **document_options)
+            pdf_file = os.path.join(directory, f"{sections}.pdf")
+            stage_results = measure(stage_functions(compiler, source, pdf_file, low_memory), repeat)
+            results["documents"][f"{sections} sections"] = {
+                "sections": sections,
+                **document_options,
+                "characters": len(source),
+                "pdf_bytes": os.path.getsize(pdf_file),
+                "stages": stage_results,
+            }
+    return results
+
+
+def print_results(results):
+    print(f"{'document':>16} {'stage':>20} {'time (s)':>10} {'peak memory (KiB)':>18}")
+    for name, document in results["documents"].items():
+        for stage, values in document["stages"].items():
+            print(f"{name:>16} {stage:>20} {values['time']:>10.4f} {values['peak_memory'] / 1024:>18.0f}")
+
+
+def regressions(results, baseline, threshold):
+    """Messages of the stages slower or bigger than in the baseline by more than threshold."""
+    messages = []
+    for name, document in results["documents"].items():
+        base_document = baseline.get("documents", {}).get(name)
+        if base_document is None:
+            continue
+        for stage, values in document["stages"].items():
+            base_values = base_document["stages"].get(stage)
+            if base_values is None:
+                continue
+            for measure_name in ("time", "peak_memory"):
+                base_value = base_values[measure_name]
+                if base_value > 0 and values[measure_name] > base_value * (1 + threshold):
+                    messages.append(
+                        f"{name}, {stage} : {measure_name} {values[measure_name]:.4g} "
+                        f"> baseline {base_value:.4g} (+{values[measure_name] / base_value - 1:.0%})"
+                    )
+    return messages
+
+
+def run(sizes, document_options, repeat=3, lexer_backend="ply", low_memory=False, output=None,
+        baseline_file=default_baseline, threshold=0.25, update_baseline=False):
+    results = run_benchmark(sizes, document_options, repeat, lexer_backend, low_memory)
+    print_results(results)
+
+    if output:
+        with open(output, 'w') as f:
+            json.dump(results, f, indent=2)
+
+    success = True
+    if update_baseline:
+        with open(baseline_file, 'w') as f:
+            json.dump(results, f, indent=2)
+        print(f"\nBaseline written to {baseline_file}")
+    elif os.path.exists(baseline_file):
+        with open(baseline_file, 'r') as f:
+            baseline = json.load(f)
+        messages = regressions(results, baseline, threshold)
+        print(f"\nComparison with {baseline_file} (threshold {threshold:.0%}) :")
+        for message in messages:
+            print(f"  Regression : {message}")
+        if not messages:
+            print("  No regression")
+        success = not messages
+    return success
+
+
+if __name__ == '__main__':
+    arguments = sys.argv[1:]
+
+    def option(name, default, kind):
+        return kind(arguments[arguments.index(name) + 1]) if name in arguments else default
+
+    sizes = [int(size) for size in option("--sections", "100,1000", str).split(",")]
+    document_options = {
+        "inline_density": option("--inline-density", 0.5, float),
+        "styles": option("--styles", 3, int),
+        "title_depth": option("--title-depth", 3, int),
+    }
+    success = run(
+        sizes,
+        document_options,
+        repeat=option("--repeat", 3, int),
+        lexer_backend=option("--lexer", "ply", str),
+        low_memory="--low-memory" in arguments,
+        output=option("--output", None, str),
+        baseline_file=option("--baseline", default_baseline, str),
+        threshold=option("--threshold", 0.25, float),
+        update_baseline="--update-baseline" in arguments,
+    )
+    sys.exit(0 if success else 1)
@@ -0,0 +1,82 @@
+"""
+Module:
+3250.1 Compilateurs
+Auteur:
+WICKI Sélien
+Date: 18.10.2026
+
+Plain paragraphs (pdfGenerator.PlainParagraph) against reportlab's Paragraph : time to build the
+paragraphs of a synthetic document and lay out its pages, for text-heavy documents (no inline
+instruction) and documents with inline instructions.
+
+    python benchmarks/plain_layout.py [--sections 2000] [--densities 0,0.5] [--repeat 3]
+
+The width cache of the words is emptied before every run (the time of a first document).
+Both layouts must give the same PDF (exits with status 1 otherwise).
+"""
+
+# System imports
+import io
+import os
+import sys
+import time
+
+# The compiler modules are in the parent directory
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from reportlab.platypus import Paragraph
+
+from pdfCompiler import Compiler
+import pdfGenerator
+from pdfGenerator import build_stylesheet, item_flowables, build_document, PlainParagraph
+from synthetic_document import generate_document
+
+
+def render(styles_data, page_number, doc_content, paragraph_class):
+    """PDF of the analysed document, its paragraphs built with paragraph_class."""
+    pdfGenerator.word_width_cache.clear()
+    styles = build_stylesheet(styles_data)
+    story = []
+    for item in doc_content:
+        story.extend(item_flowables(item, styles, paragraph_class=paragraph_class))
+    output = io.BytesIO()
+    build_document(story, page_number, output, invariant=True)
+    return output.getvalue()
+
+
+def best_time(function, repeat):
+    best = None
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def run(sections=2000, densities=(0, 0.5), repeat=3):
+    compiler = Compiler()
+    print(f"{'inline density':>15} {'Paragraph (s)':>14} {'PlainParagraph (s)':>19} {'speedup':>8}")
+
+    for density in densities:
+        styles, page_number, _, doc_content, _, _ = compiler.analyze(
+            compiler.parse(generate_document(sections, inline_density=density))
+        )
+        reference, expected = best_time(lambda: render(styles, page_number, doc_content, Paragraph), repeat)
+        plain, pdf = best_time(lambda: render(styles, page_number, doc_content, PlainParagraph), repeat)
+        if pdf != expected:
+            print(f"The PDF of the plain paragraphs differs from the PDF of Paragraph (inline density {density})")
+            return False
+        print(f"{density:>15} {reference:>14.3f} {plain:>19.3f} {reference / plain:>8.2f}")
+
+    print("\nSame PDF with PlainParagraph and Paragraph")
+    return True
+
+
+if __name__ == '__main__':
+    arguments = sys.argv[1:]
+    sections = int(arguments[arguments.index("--sections") + 1]) if "--sections" in arguments else 2000
+    densities = [float(value) for value in arguments[arguments.index("--densities") + 1].split(",")] if "--densities" in arguments else (0, 0.5)
+    repeat = int(arguments[arguments.index("--repeat") + 1]) if "--repeat" in arguments else 3
+    sys.exit(0 if run(sections, densities, repeat) else 1)
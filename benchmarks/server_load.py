@@ -0,0 +1,139 @@
+"""
+Module:
+3250.1 Compilateurs
+Auteur:
+WICKI Sélien
+Date: 18.10.2026
+
+Load test of the compile server (pdfServer), fully local : a server is started in this process
+on a free port, `clients` threads send POST /compile requests over keep-alive connections.
+
+    python benchmarks/server_load.py [--requests 200] [--clients 8] [--sections 20] [--workers <CPUs>]
+                                     [--queue 64] [--timeout 30] [--cold 5]
+
+Reports the throughput, the latency percentiles and the answers (200, 503, 504, ...). --cold runs
+that many `python pdfy.py - -` subprocesses first, for the latency of a cold compilation.
+"""
+
+# System imports
+import os
+import sys
+import json
+import time
+import asyncio
+import threading
+import subprocess
+import http.client
+
+# The compiler modules are in the parent directory
+root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, root)
+
+from pdfServer import CompileServer, default_queue_size, default_timeout
+from synthetic_document import generate_document
+
+
+def start_server(compile_server):
+    """Run the server in a thread (its own event loop), returns (port, stop function)."""
+    loop = asyncio.new_event_loop()
+    started = threading.Event()
+
+    def run():
+        asyncio.set_event_loop(loop)
+        loop.run_until_complete(compile_server.start(port=0))
+        started.set()
+        loop.run_forever()
+        loop.run_until_complete(compile_server.close())
+
+    thread = threading.Thread(target=run, daemon=True)
+    thread.start()
+    started.wait()
+
+    def stop():
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join()
+
+    return compile_server.addresses()[0][1], stop
+
+
+def client(port, sources, results):
+    connection = http.client.HTTPConnection("127.0.0.1", port)
+    for source in sources:
+        start = time.perf_counter()
+        connection.request("POST", "/compile", body=source.encode("utf-8"))
+        response = connection.getresponse()
+        response.read()
+        results.append((response.status, time.perf_counter() - start))
+    connection.close()
+
+
+def percentile(values, fraction):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(fraction * len(values)))]
+
+
+def cold_latency(source, runs):
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, os.path.join(root, "pdfy.py"), "-", "-"], input=source.encode("utf-8"),
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=True)
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def run(requests=200, clients=8, sections=20, workers=None, queue_size=default_queue_size, timeout=default_timeout, cold=0):
+    sources = [generate_document(sections, seed=seed) for seed in range(requests)]
+
+    if cold:
+        print(f"Cold compilation (python pdfy.py - -): {cold_latency(sources[0], cold):.3f} s")
+
+    compile_server = CompileServer(workers=workers, queue_size=queue_size, timeout=timeout)
+    port, stop = start_server(compile_server)
+
+    results = []
+    threads = [threading.Thread(target=client, args=(port, sources[index::clients], results)) for index in range(clients)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    connection = http.client.HTTPConnection("127.0.0.1", port)
+    connection.request("GET", "/health")
+    health = json.loads(connection.getresponse().read())
+    connection.close()
+    stop()
+
+    statuses = {}
+    for status, _ in results:
+        statuses[status] = statuses.get(status, 0) + 1
+    latencies = [latency for status, latency in results if status == 200]
+
+    print(f"{requests} requests ({sections} sections each), {clients} clients, {compile_server.workers} workers, queue {queue_size}")
+    print(f"Throughput: {len(results) / elapsed:.1f} requests/s ({elapsed:.2f} s)")
+    if latencies:
+        print(f"Latency (200): p50 {percentile(latencies, 0.5):.3f} s, p95 {percentile(latencies, 0.95):.3f} s, "
+              f"p99 {percentile(latencies, 0.99):.3f} s")
+    print(f"Answers: {', '.join(f'{status}: {count}' for status, count in sorted(statuses.items()))}")
+    print(f"Health: {health}")
+    return statuses.get(200, 0) + statuses.get(503, 0) == len(results)
+
+
+if __name__ == '__main__':
+    arguments = sys.argv[1:]
+
+    def option(name, default, kind):
+        return kind(arguments[arguments.index(name) + 1]) if name in arguments else default
+
+    success = run(
+        requests=option("--requests", 200, int),
+        clients=option("--clients", 8, int),
+        sections=option("--sections", 20, int),
+        workers=option("--workers", None, int),
+        queue_size=option("--queue", default_queue_size, int),
+        timeout=option("--timeout", default_timeout, float),
+        cold=option("--cold", 0, int),
+    )
+    sys.exit(0 if success else 1)
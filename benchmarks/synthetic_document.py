@@ -0,0 +1,96 @@
+"""
+Module:
+3250.1 Compilateurs
+Auteur:
+WICKI Sélien
+Date: 18.10.2026
+
+Generator of synthetic Pdfy documents for the benchmarks.
+
+    python benchmarks/synthetic_document.py output.pdfy [--sections 1000] [--inline-density 0.5]
+                                            [--styles 3] [--title-depth 3] [--seed 0]
+
+The documents are valid (no error, no warning) : every title and section uses one of the
+declared styles, the titles go down to title-depth levels and are numbered, and each section
+holds about `inline-density` inline instructions ($bold, $italic, $underlined) per sentence.
+The same parameters and seed always give the same document. Every benchmark and the tests
+generate their documents here.
+"""
+
+# System imports
+import sys
+import random
+
+# Words of the generated sentences
+words = [
+    "compiler", "document", "section", "title", "style", "page", "number", "text", "layout",
+    "paragraph", "font", "size", "grammar", "token", "parser", "tree", "analysis", "output",
+    "the", "a", "of", "and", "with", "for", "each", "every", "some", "more", "than", "is",
+]
+
+inline_instructions = ["$bold", "$italic", "$underlined"]
+
+
+def sentence(rng, length=8):
+    text = " ".join(rng.choice(words) for _ in range(length))
+    return text[0].upper() + text[1:] + "."
+
+
+def generate_document(sections=1000, inline_density=0.5, styles=3, title_depth=3, seed=0, separator="\n"):
+    """
+    Source of a document of `sections` sections, each preceded by a title.
+
+    inline_density -> average number of inline instructions per sentence of a section (0 : plain text)
+    styles -> number of declared styles, used in turn by the titles and sections
+    title_depth -> levels of the titles (1 to title_depth)
+    separator -> between the instructions and the sentences of a section, " " : the whole
+                 document on one line
+    """
+    rng = random.Random(seed)
+    parts = []
+
+    style_names = [f'"style{i}"' for i in range(styles)]
+    for i, name in enumerate(style_names):
+        parts.append(f"$style(#name={name}, #fontSize={10 + i % 8})")
+    parts.append('$pageNumber(#pageNumberPosition="bottom-right", #pageNumberFontSize=9)')
+    parts.append("$numberizeTitle(#numberizeTitleStart=1)")
+
+    level = 0
+    for i in range(sections):
+        # Titles go one level deeper or back up to any upper level
+        level = rng.randint(1, min(level + 1, title_depth))
+        title_style = f", #style={style_names[i % styles]}" if styles else ""
+        parts.append(f"$title(#level={level}{title_style}){{Chapter {i} {sentence(rng, 4)}}}")
+
+        content = []
+        for _ in range(rng.randint(2, 6)):
+            content.append(sentence(rng))
+            # Inline instructions after the sentence, inline_density on average
+            count = int(inline_density) + (rng.random() < inline_density % 1)
+            for _ in range(count):
+                content.append(f"{rng.choice(inline_instructions)}(){{{sentence(rng, 3)}}}")
+        section_style = f"(#style={style_names[(i + 1) % styles]})" if styles else "()"
+        indentation = "\n    " if separator == "\n" else separator
+        parts.append(f"$section{section_style}{{{indentation}" + indentation.join(content) + f"{separator}}}")
+
+    return separator.join(parts) + "\n"
+
+
+if __name__ == '__main__':
+    arguments = sys.argv[1:]
+    if not arguments or arguments[0].startswith("--"):
+        print(__doc__)
+        sys.exit(1)
+
+    def option(name, default, kind):
+        return kind(arguments[arguments.index(name) + 1]) if name in arguments else default
+
+    source = generate_document(
+        sections=option("--sections", 1000, int),
+        inline_density=option("--inline-density", 0.5, float),
+        styles=option("--styles", 3, int),
+        title_depth=option("--title-depth", 3, int),
+        seed=option("--seed", 0, int),
+    )
+    with open(arguments[0], 'w') as f:
+        f.write(source)
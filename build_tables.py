@@ -0,0 +1,77 @@
+"""
+Module:
+3250.1 Compilateurs
+Auteur:
+WICKI Sélien
+Date: 18.10.2026
+
+Build step generating the precomputed lexer and parser tables shipped with the compiler
+(pdflextab.py and pdfparsetab.py) and the snapshot of the font and color names of reportlab
+(pdfnametab.py, used by the check mode). Run it after every change of the tokens or the grammar,
+and after an update of reportlab :
+
+    python build_tables.py [--debug]
+
+--debug also writes the LALR debug file parser.out.
+"""
+
+# System imports
+import os
+import sys
+
+import ply.lex as lex
+import ply.yacc as yacc
+
+# Output next to the compiler modules
+output_dir = os.path.dirname(os.path.abspath(__file__))
+
+# Snapshot of the names of reportlab (see pdfSemantic.use_name_snapshot)
+nametab_module = "pdfnametab"
+
+
+def remove_table(module_name):
+    """Remove a generated table module (and its compiled version) so that it is rebuilt."""
+    path = os.path.join(output_dir, module_name + ".py")
+    if os.path.exists(path):
+        os.remove(path)
+    sys.modules.pop(module_name, None)
+
+
+def build_tables(debug=False):
+    import pdfLexer
+    import pdfParser
+
+    # Lexer table : master regexes of every state + signature of the rules
+    remove_table(pdfLexer.lextab_module)
+    lexer = lex.lex(module=pdfLexer)
+    lexer.writetab(pdfLexer.lextab_module, output_dir)
+    with open(os.path.join(output_dir, pdfLexer.lextab_module + ".py"), 'a') as f:
+        f.write(f"_lexsignature = {pdfLexer.lexer_signature()!r}\n")
+
+    # Parser table : LALR action/goto tables, the grammar signature is stored by yacc
+    remove_table(pdfParser.parsetab_module)
+    yacc.yacc(module=pdfParser, tabmodule=pdfParser.parsetab_module, outputdir=output_dir,
+              debug=debug, write_tables=True)
+
+    build_name_table()
+
+    print(f"Tables written in {output_dir}: {pdfLexer.lextab_module}.py, {pdfParser.parsetab_module}.py, {nametab_module}.py")
+
+
+def build_name_table():
+    """Snapshot of the standard fonts and of the named colors of the installed reportlab."""
+    from reportlab import Version
+    from reportlab.pdfbase import pdfmetrics
+    from reportlab.lib import colors
+
+    with open(os.path.join(output_dir, nametab_module + ".py"), 'w') as f:
+        f.write(f"# {nametab_module}.py\n")
+        f.write("# This file is automatically generated by build_tables.py. Do not edit.\n")
+        f.write("# Font and color names of reportlab, checked by the semantic analysis without importing reportlab\n")
+        f.write(f"_reportlab_version = {Version!r}\n")
+        f.write(f"standard_fonts = {tuple(sorted(pdfmetrics.standardFonts))!r}\n")
+        f.write(f"named_colors = {tuple(sorted(colors.getAllNamedColors()))!r}\n")
+
+
+if __name__ == '__main__':
+    build_tables(debug="--debug" in sys.argv[1:])
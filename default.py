@@ -7,12 +7,13 @@ WICKI Sélien
 Date: 26.01.2025 
 """
 
-# Allowed arguments for each instruction
-style_arguments = ["#name", "#font", "#fontSize", "#font_color"]
-page_number_arguments = ["#pageNumberPosition", "#pageNumberFontSize", "#pageNumberFont", "#pageNumberFontColor", "#pageNumberStart"]
-section_arguments = ["#style"]
-title_arguments = ["#style", "#level"]
-numberize_title_arguments = ["#numberizeTitleStart"]
+# Allowed arguments for each instruction (sets : membership is checked for every argument)
+style_arguments = frozenset(["#name", "#font", "#fontSize", "#font_color"])
+page_number_arguments = frozenset(["#pageNumberPosition", "#pageNumberFontSize", "#pageNumberFont", "#pageNumberFontColor", "#pageNumberStart"])
+section_arguments = frozenset(["#style"])
+title_arguments = frozenset(["#style", "#level"])
+numberize_title_arguments = frozenset(["#numberizeTitleStart"])
+include_arguments = frozenset(["#file"])
 
 
 # Default values for optional arguments
@@ -49,7 +50,7 @@ default_title = {
 }
 
 default_section = {
-    '#style': '"defaultStyle"'
+    '#style': default_section_style["#name"]
 }
 
 default_numberize_title = {
@@ -57,7 +58,7 @@ default_numberize_title = {
 }
 
 # Generated by ChatGPT to know which color is supported
-allowed_page_nb_positions = ["bottom-left", "bottom-right", "top-left", "top-right"]
+allowed_page_nb_positions = frozenset(["bottom-left", "bottom-right", "top-left", "top-right"])
 
 # Range for the arguments
 font_size_range = (4, 100)
@@ -66,5 +67,5 @@ title_level_range = (1, 10)
 
 
 # Nested instructions allowed inside a section
-section_nested_instructions = ["$bold", "$italic", "$underlined"]
+section_nested_instructions = frozenset(["$bold", "$italic", "$underlined"])
 
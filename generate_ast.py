@@ -1,36 +1,185 @@
-from graphviz import Digraph
-
-def add_node(dot, parent_id, node):
-    """Recursively add nodes to the graph from the tree."""
-    if isinstance(node, dict):
-        for key, value in node.items():
-            node_id = f"{parent_id}_{key}"
-            dot.node(node_id, label=key)
-            dot.edge(parent_id, node_id)  # Connect parent to current node
-            # Recursively add children
-            add_node(dot, node_id, value)
-    elif isinstance(node, list):
-        for idx, item in enumerate(node):
-            node_id = f"{parent_id}_list_{idx}"
-            dot.node(node_id, label=f"List Item {idx}")
-            dot.edge(parent_id, node_id)
-            add_node(dot, node_id, item)
+"""
+Module:
+3250.1 Compilateurs
+Auteur:
+WICKI Sélien
+Date: 18.10.2026
+"""
+
+# System imports
+import sys
+import json
+import subprocess
+from enum import Enum
+
+from pdfAst import Node, Instruction, Argument, Text, Inline
+
+# Largest number of nodes written by default (0 : no limit), the other ones are counted and collapsed
+default_max_nodes = 5000
+
+# Longest text shown in a label (longer texts are cut with ...)
+label_width = 60
+
+# Default file of the tree for each format
+default_output = {"dot": "parse_tree.dot", "json": "parse_tree.json", "outline": "-"}
+
+
+def shorten(text, width=label_width):
+    """Text on one line, cut to width characters."""
+    text = text.replace("\\", "\\\\").replace("\n", "\\n").replace("\t", "\\t")
+    return text if len(text) <= width else text[:width - 3] + "..."
+
+
+def describe(value, key=None, root=False):
+    """
+    (label, children) of a value of the tree : a syntax tree node, a list of nodes or plain data
+    (see pdfAst.to_data). children -> list of (key, value), key being None in lists and nodes.
+    """
+    children = ()
+    if isinstance(value, Instruction):
+        label = f"{value.kind.value} (line {value.line})"
+        children = [(None, item) for item in value.arguments + (value.content or [])]
+    elif isinstance(value, Argument):
+        label = f"{value.name.value}={shorten(value.value)}"
+    elif isinstance(value, Text):
+        label = f'"{shorten(value.value)}"'
+    elif isinstance(value, Inline):
+        label = f'{value.kind.value} "{shorten(value.text)}"'
+    elif isinstance(value, Node):
+        label = type(value).__name__
+        children = [(field, getattr(value, field)) for field in value.fields]
+    elif isinstance(value, dict):
+        label = str(value.get("node", ""))  # Type of a node of to_data
+        children = [(child_key, child) for child_key, child in value.items() if child_key != "node"]
+    elif isinstance(value, (list, tuple)):
+        label = "Document" if root else f"{len(value)} items"
+        children = [(None, item) for item in value]
+    elif isinstance(value, Enum):
+        label = str(value.value)
     else:
-        # Leaf node (value of the tree)
-        node_id = f"{parent_id}_leaf"
-        dot.node(node_id, label=str(node))
-        dot.edge(parent_id, node_id)
-
-def generate_tree_image(tree_data):
-    """Generate and save a graphical tree from tree data."""
-    dot = Digraph(comment='Parse Tree')
-
-    # Initialize root
-    dot.node('root', label="Root")
-    
-    # Add tree nodes recursively
-    add_node(dot, 'root', tree_data)
-    
-    # Render and save the tree as an image (PNG format)
-    dot.render('parse_tree', format='png', cleanup=True)
-    print("Parse tree image generated as 'parse_tree.png'")
\ No newline at end of file
+        label = shorten(str(value))
+
+    if key is not None:
+        label = f"{key}: {label}" if label else str(key)
+    return label or "{}", children
+
+
+def walk(tree, max_depth=None, max_nodes=default_max_nodes):
+    """
+    Nodes of the tree in depth first order, as (index, parent index, depth, label, collapsed) : the
+    root is 0 (parent None, depth 0), collapsed -> number of children not walked (below max_depth).
+    The traversal uses its own stack (no recursion limit, whatever the depth of the tree).
+
+    After max_nodes nodes (0 or None : no limit) the rest of the tree is only counted, a last node
+    under the root gives their number.
+    """
+    stack = [(None, None, tree, 0)]  # (parent index, key, value, depth), the next node at the end
+    index = 0
+    skipped = 0
+
+    while stack:
+        parent, key, value, depth = stack.pop()
+        label, children = describe(value, key, depth == 0)
+
+        if max_nodes and index >= max_nodes:  # Only counted
+            skipped += 1
+            stack.extend((None, child_key, child, depth + 1) for child_key, child in children)
+            continue
+
+        if max_depth is not None and depth >= max_depth and children:
+            yield index, parent, depth, label, len(children)
+        else:
+            yield index, parent, depth, label, 0
+            stack.extend((index, child_key, child, depth + 1) for child_key, child in reversed(children))
+        index += 1
+
+    if skipped:
+        yield index, 0, 1, f"... {skipped} more nodes", 0
+
+
+#############################################################################
+#                                   Writers                                 #
+#############################################################################
+
+def write_outline(tree, stream=None, max_depth=None, max_nodes=default_max_nodes):
+    """Tree as indented text, one node per line (stream None : the standard output)."""
+    stream = stream or sys.stdout
+    for _, _, depth, label, collapsed in walk(tree, max_depth, max_nodes):
+        stream.write("  " * depth + label + (f" [+{collapsed} collapsed]" if collapsed else "") + "\n")
+
+
+def dot_label(label):
+    return label.replace("\\", "\\\\").replace('"', '\\"')
+
+
+def write_dot(tree, stream, max_depth=None, max_nodes=default_max_nodes):
+    """
+    Tree as a graphviz DOT graph, written node by node (the graph is never held in memory). Render
+    it with dot, as a separate step (see render_dot).
+    """
+    stream.write('digraph "Parse Tree" {\n    node [shape=box, fontname="Helvetica"];\n')
+    for index, parent, _, label, collapsed in walk(tree, max_depth, max_nodes):
+        if collapsed:
+            stream.write(f'    n{index} [label="{dot_label(label)}\\n[+{collapsed} collapsed]", style=dashed];\n')
+        else:
+            stream.write(f'    n{index} [label="{dot_label(label)}"];\n')
+        if parent is not None:
+            stream.write(f"    n{parent} -> n{index};\n")
+    stream.write("}\n")
+
+
+def write_json(tree, stream, max_depth=None, max_nodes=default_max_nodes):
+    """
+    Tree as nested JSON objects {"label": ..., "children": [...]} ("collapsed" : number of children
+    not written), written node by node from the depth of each node.
+    """
+    previous = None  # Depth of the last node written, its object is still open
+    for _, _, depth, label, collapsed in walk(tree, max_depth, max_nodes):
+        if previous is not None:
+            if depth > previous:  # First child of the previous node
+                stream.write(', "children": [')
+            else:  # Closes the previous node, and its parents down to the depth of this one
+                stream.write("}" + "]}" * (previous - depth) + ", ")
+        node = {"label": label, "collapsed": collapsed} if collapsed else {"label": label}
+        stream.write(json.dumps(node, ensure_ascii=False)[:-1])
+        previous = depth
+    if previous is not None:
+        stream.write("}" + "]}" * previous)
+    stream.write("\n")
+
+
+writers = {"outline": write_outline, "dot": write_dot, "json": write_json}
+
+
+def write_tree(tree, output_format="dot", output_file=None, max_depth=None, max_nodes=default_max_nodes):
+    """Write the tree to output_file (- : the standard output, None : default_output of the format), returns the file."""
+    writer = writers[output_format]
+    output_file = output_file or default_output[output_format]
+    if output_file == "-":
+        writer(tree, sys.stdout, max_depth, max_nodes)
+    else:
+        with open(output_file, 'w', encoding="utf-8") as f:
+            writer(tree, f, max_depth, max_nodes)
+    return output_file
+
+
+def render_dot(dot_file, image_format="png", image_file=None):
+    """Render a DOT file with the dot program of graphviz (dot -T<format>), returns the image file."""
+    image_file = image_file or dot_file.rsplit(".", 1)[0] + "." + image_format
+    subprocess.run(["dot", f"-T{image_format}", dot_file, "-o", image_file], check=True)
+    return image_file
+
+
+# Render a DOT file written by -p : python generate_ast.py parse_tree.dot [png|svg|pdf]
+if __name__ == '__main__':
+    if len(sys.argv) < 2:
+        print("Usage: python generate_ast.py <file.dot> [png|svg|pdf]")
+        exit(1)
+    try:
+        print(f"Tree image generated as '{render_dot(sys.argv[1], sys.argv[2] if len(sys.argv) > 2 else 'png')}'")
+    except FileNotFoundError:
+        print("The dot program of graphviz is not installed (https://graphviz.org/download/)")
+        exit(1)
+    except subprocess.CalledProcessError as e:
+        print(f"dot failed with status {e.returncode}")
+        exit(1)
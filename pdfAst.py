@@ -0,0 +1,169 @@
+"""
+Module:
+3250.1 Compilateurs
+Auteur:
+WICKI Sélien
+Date: 18.10.2026
+"""
+
+from enum import Enum
+
+
+class InstructionKind(Enum):
+    """Instructions of the language (value = keyword in the source)."""
+    STYLE = "$style"
+    PAGE_NUMBER = "$pageNumber"
+    NUMBERIZE_TITLE = "$numberizeTitle"
+    TITLE = "$title"
+    SECTION = "$section"
+    BOLD = "$bold"
+    ITALIC = "$italic"
+    UNDERLINED = "$underlined"
+    INCLUDE = "$include"
+
+
+class ArgumentName(Enum):
+    """Arguments of the instructions (value = name in the source)."""
+    NAME = "#name"
+    STYLE = "#style"
+    FONT_SIZE = "#fontSize"
+    FONT = "#font"
+    FONT_COLOR = "#fontColor"
+    LEVEL = "#level"
+    PAGE_NUMBER_POSITION = "#pageNumberPosition"
+    PAGE_NUMBER_FONT_SIZE = "#pageNumberFontSize"
+    PAGE_NUMBER_FONT = "#pageNumberFont"
+    PAGE_NUMBER_FONT_COLOR = "#pageNumberFontColor"
+    PAGE_NUMBER_START = "#pageNumberStart"
+    NUMBERIZE_TITLE_START = "#numberizeTitleStart"
+    FILE = "#file"
+
+
+# Inline instructions (only allowed in the content of a $section)
+inline_kinds = frozenset([InstructionKind.BOLD, InstructionKind.ITALIC, InstructionKind.UNDERLINED])
+
+
+class Node:
+    """
+    Base of the nodes of the syntax tree.
+    Every node carries the span of its source : line/column of its first and last character
+    (lines and columns start at 1).
+    """
+    __slots__ = ("line", "column", "end_line", "end_column")
+
+    # Fields of the node (without the span), in the order of the constructor
+    fields = ()
+
+    def __init__(self, line=0, column=0, end_line=0, end_column=0):
+        self.line = line
+        self.column = column
+        self.end_line = end_line
+        self.end_column = end_column
+
+    def span(self):
+        return (self.line, self.column, self.end_line, self.end_column)
+
+    def to_data(self, spans=False):
+        """Plain dicts/lists/strings version of the node (JSON serializable, used for hashing and dumps)."""
+        data = {"node": type(self).__name__}
+        for field in self.fields:
+            data[field] = to_data(getattr(self, field), spans)
+        if spans:
+            data["span"] = list(self.span())
+        return data
+
+    def __eq__(self, other):
+        return type(self) is type(other) and all(
+            getattr(self, field) == getattr(other, field) for field in self.fields + Node.__slots__
+        )
+
+    def __repr__(self):
+        fields = ", ".join(f"{field}={getattr(self, field)!r}" for field in self.fields)
+        return f"{type(self).__name__}({fields}, line={self.line}, column={self.column})"
+
+
+class Instruction(Node):
+    """Instruction with its arguments and its content ($style, $section, $title, ...)."""
+    __slots__ = ("kind", "arguments", "content")
+    fields = ("kind", "arguments", "content")
+
+    def __init__(self, kind, arguments, content, *span):
+        super().__init__(*span)
+        self.kind = kind  # InstructionKind
+        self.arguments = arguments  # list of Argument
+        self.content = content  # list of Text/Inline/Instruction, None for instructions without braces
+
+    def argument_dict(self):
+        """Arguments as a {"#name": value} dict (the last value wins if an argument is repeated)."""
+        return {argument.name.value: argument.value for argument in self.arguments}
+
+
+class Argument(Node):
+    """#name=value argument of an instruction."""
+    __slots__ = ("name", "value")
+    fields = ("name", "value")
+
+    def __init__(self, name, value, *span):
+        super().__init__(*span)
+        self.name = name  # ArgumentName
+        self.value = value  # str, as written in the source (strings keep their quotes)
+
+
+class Text(Node):
+    """Plain text of a content."""
+    __slots__ = ("value",)
+    fields = ("value",)
+
+    def __init__(self, value, *span):
+        super().__init__(*span)
+        self.value = value
+
+
+class Inline(Node):
+    """Inline formatting of a text : $bold(){...}, $italic(){...}, $underlined(){...}."""
+    __slots__ = ("kind", "text")
+    fields = ("kind", "text")
+
+    def __init__(self, kind, text, *span):
+        super().__init__(*span)
+        self.kind = kind  # InstructionKind.BOLD, ITALIC or UNDERLINED
+        self.text = text
+
+
+def to_data(value, spans=False):
+    """Plain data version of a node, a list of nodes or a value."""
+    if isinstance(value, Node):
+        return value.to_data(spans)
+    if isinstance(value, list):
+        return [to_data(item, spans) for item in value]
+    if isinstance(value, dict):
+        return {key: to_data(item, spans) for key, item in value.items()}
+    if isinstance(value, Enum):
+        return value.value
+    return value
+
+
+def text_of(content):
+    """Text of a content (list of Text/Inline nodes), without the formatting."""
+    return "".join(item.value if isinstance(item, Text) else item.text for item in content if isinstance(item, (Text, Inline)))
+
+
+def node_count(value):
+    """Number of nodes of a node or of a list of nodes (instructions, arguments, texts and inlines)."""
+    if isinstance(value, list):
+        return sum(node_count(item) for item in value)
+    if not isinstance(value, Node):
+        return 0
+    return 1 + sum(node_count(getattr(value, field)) for field in value.fields)
+
+
+def shift_lines(value, delta):
+    """Move the spans of a node or of a list of nodes (and of their children) by delta lines."""
+    if isinstance(value, list):
+        for item in value:
+            shift_lines(item, delta)
+    elif isinstance(value, Node):
+        value.line += delta
+        value.end_line += delta
+        for field in value.fields:
+            shift_lines(getattr(value, field), delta)
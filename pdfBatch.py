@@ -0,0 +1,234 @@
+"""
+Module:
+3250.1 Compilateurs
+Auteur:
+WICKI Sélien
+Date: 18.10.2026
+"""
+
+# System imports
+import os
+import sys
+import glob
+import json
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+
+# Extension used when a directory is given as batch input
+source_extension = ".pdfy"
+
+# Extensions of the files read as manifests (any other file is a source, see collect_jobs)
+manifest_extensions = (".json", ".txt", ".list")
+
+
+#############################################################################
+#                               Job collection                              #
+#############################################################################
+
+def output_name(input_file, output_dir, base_dir=None):
+    """
+    Build the output file name of an input file (same stem, .pdf extension) in output_dir. With a
+    base_dir, the directory of the input relative to base_dir is kept under output_dir.
+    """
+    stem = os.path.splitext(os.path.basename(input_file))[0]
+    if base_dir is not None:
+        output_dir = os.path.join(output_dir, os.path.relpath(os.path.dirname(input_file), base_dir))
+    return os.path.normpath(os.path.join(output_dir, stem + ".pdf"))
+
+
+def read_manifest(manifest_file):
+    """
+    Read a batch manifest. Two formats are accepted :
+
+    JSON (.json) : either {"input.pdfy": "output.pdf", ...}
+                   or [{"input": "input.pdfy", "output": "output.pdf"}, ...]
+
+    Text (any other extension) : one job per line, input and output separated by a tab.
+                                 Empty lines and lines starting with '#' are ignored.
+
+    Relative paths are resolved from the directory of the manifest.
+    Raises ValueError for a manifest that cannot be read.
+    """
+    base_dir = os.path.dirname(os.path.abspath(manifest_file))
+    jobs = []
+
+    try:
+        with open(manifest_file, 'r') as f:
+            if manifest_file.endswith(".json"):
+                data = json.load(f)
+                if isinstance(data, dict):
+                    pairs = list(data.items())
+                else:
+                    pairs = [(entry["input"], entry["output"]) for entry in data]
+                if not all(isinstance(path, str) for pair in pairs for path in pair):
+                    raise ValueError(f"Manifest {manifest_file}: the inputs and outputs must be strings")
+            else:
+                pairs = []
+                for line_number, line in enumerate(f, start=1):
+                    line = line.strip()
+                    if not line or line.startswith("#"):
+                        continue
+                    fields = line.split("\t")
+                    if len(fields) != 2:
+                        raise ValueError(f"Manifest {manifest_file}, line {line_number}: expected '<input>\\t<output>'")
+                    pairs.append((fields[0].strip(), fields[1].strip()))
+    except (OSError, UnicodeDecodeError, json.JSONDecodeError) as e:
+        raise ValueError(f"Manifest {manifest_file}: {e}") from e
+    except (KeyError, TypeError, AttributeError) as e:
+        raise ValueError(f"Manifest {manifest_file}: expected an object or a list of {{\"input\": ..., \"output\": ...}}") from e
+
+    for input_file, output_file in pairs:
+        jobs.append((os.path.join(base_dir, input_file), os.path.join(base_dir, output_file)))
+
+    return jobs
+
+
+def collect_jobs(target, output_dir=None, manifest=False):
+    """
+    Turn a batch target into a list of (input_file, output_file) jobs.
+
+    target can be :
+    - a directory : every *.pdfy file inside it is compiled
+    - a manifest file (.json, .txt or .list, any file with manifest=True) : the output names are
+      taken from the manifest (see read_manifest)
+    - a glob pattern or a source file : every matching file is compiled
+
+    For directories and globs, the PDFs are written in output_dir (default: next to the sources),
+    the files of different directories under their directory relative to the common directory
+    of the inputs. Raises ValueError for a manifest that cannot be read, and when two different
+    inputs would be written to the same PDF.
+    """
+    if manifest or (os.path.isfile(target) and target.lower().endswith(manifest_extensions)):
+        jobs = read_manifest(target)
+    else:
+        if os.path.isdir(target):
+            inputs = sorted(glob.glob(os.path.join(target, "*" + source_extension)))
+        else:
+            inputs = sorted(path for path in glob.glob(target) if os.path.isfile(path))
+
+        base_dir = os.path.commonpath([os.path.dirname(os.path.abspath(path)) for path in inputs]) if inputs else None
+        jobs = []
+        for input_file in inputs:
+            if output_dir is None:
+                jobs.append((input_file, output_name(input_file, os.path.dirname(input_file))))
+            else:
+                jobs.append((input_file, output_name(os.path.abspath(input_file), output_dir, base_dir)))
+
+    # Two inputs writing the same PDF would overwrite each other (a job listed twice is compiled once)
+    inputs_of_output = {}
+    for input_file, output_file in jobs:
+        output_key = os.path.normcase(os.path.abspath(output_file))
+        other = inputs_of_output.setdefault(output_key, input_file)
+        if os.path.abspath(other) != os.path.abspath(input_file):
+            raise ValueError(f"{other} and {input_file} would both be written to {output_file}")
+    return jobs
+
+
+def schedule_jobs(jobs):
+    """Indexes of the jobs, largest files first, so that the big documents do not end up alone at the tail of the batch."""
+    def size(index):
+        try:
+            return os.path.getsize(jobs[index][0])
+        except OSError:
+            return 0
+    return sorted(range(len(jobs)), key=size, reverse=True)
+
+
+#############################################################################
+#                                   Worker                                  #
+#############################################################################
+
+# Set once per worker process by init_worker, reused for every job of the worker
+_worker_compiler = None
+
+
+def init_worker(output_cache=None, ir_cache=None):
+    """
+    Build the compiler (lexer/parser tables) and import reportlab once per worker process.
+    output_cache -> OutputCache whose directory is shared by the workers (None : no cache)
+    ir_cache -> IrCache whose directory is shared by the workers (None : no cache)
+    """
+    global _worker_compiler
+
+    from pdfCompiler import Compiler
+    import pdfGenerator  # noqa: F401 (warm reportlab before the first job)
+
+    _worker_compiler = Compiler(strict=True, output_cache=output_cache, ir_cache=ir_cache)
+
+
+def compile_job(job):
+    """Compile one (input_file, output_file) job and return its summary entry."""
+    if _worker_compiler is None:
+        init_worker()
+
+    input_file, output_file = job
+    result = {"input": input_file, "output": output_file, "status": "ok", "errors": [], "warnings": [], "time": 0.0}
+    start = time.perf_counter()
+
+    try:
+        output_directory = os.path.dirname(output_file)
+        if output_directory:
+            os.makedirs(output_directory, exist_ok=True)
+
+        errors, warnings = _worker_compiler.compile_file(input_file, output_file)
+        result["errors"].extend(errors)
+        result["warnings"].extend(warnings)
+        if errors:
+            result["status"] = "error"
+
+    except Exception as e:
+        result["status"] = "error"
+        result["errors"].append(f"Error: {type(e).__name__}: {e}")
+
+    result["time"] = time.perf_counter() - start
+    return result
+
+
+#############################################################################
+#                                   Batch                                   #
+#############################################################################
+
+def run_batch(jobs, workers=None, output_cache=None, ir_cache=None):
+    """
+    Compile every job in a process pool and return the summary entries (in scheduling order).
+    Each worker keeps its lexer/parser/reportlab loaded between jobs.
+    output_cache -> OutputCache (see pdfOutputCache), the unchanged sources are not compiled again
+    ir_cache -> IrCache (see pdfIrCache), the unchanged sources are not analysed again
+    """
+    order = schedule_jobs(jobs)
+    if not order:
+        return []
+
+    # By job index : a job listed twice in a manifest has one entry per listing, compiled once
+    results = {}
+    with ProcessPoolExecutor(max_workers=workers, initializer=init_worker, initargs=(output_cache, ir_cache)) as executor:
+        listings = {}  # job -> its indexes, in scheduling order
+        for index in order:
+            listings.setdefault(jobs[index], []).append(index)
+        # Submitted in scheduling order : the pool hands out the largest files first
+        futures = {executor.submit(compile_job, job): indexes for job, indexes in listings.items()}
+        for future in as_completed(futures):
+            indexes = futures[future]
+            job = jobs[indexes[0]]
+            try:
+                result = future.result()
+            except Exception as e:  # Worker crashed
+                result = {"input": job[0], "output": job[1], "status": "error", "errors": [f"Error: worker failed: {e}"], "warnings": [], "time": 0.0}
+            for index in indexes:
+                results[index] = result
+
+    return [results[index] for index in order]
+
+
+def print_summary(results, stream=sys.stdout):
+    """Print one line per file and the totals of the batch."""
+    for result in results:
+        status = "OK   " if result["status"] == "ok" else "ERROR"
+        print(f"{status} {result['input']} -> {result['output']} ({result['time']:.3f}s, {len(result['errors'])} errors, {len(result['warnings'])} warnings)", file=stream)
+        for message in result["errors"]:
+            print(f"      {message}", file=stream)
+
+    failed = sum(1 for result in results if result["status"] != "ok")
+    print(f"\n{len(results)} files compiled, {len(results) - failed} succeeded, {failed} failed.", file=stream)
+    return failed
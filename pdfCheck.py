@@ -0,0 +1,224 @@
+"""
+Module:
+3250.1 Compilateurs
+Auteur:
+WICKI Sélien
+Date: 18.10.2026
+"""
+
+# System imports
+import io
+import os
+import re
+import sys
+import glob
+import json
+import time
+import contextlib
+from concurrent.futures import ProcessPoolExecutor
+
+# Only the lexer, the parser and the semantic analysis : reportlab is never imported,
+# the font and color names come from the snapshot pdfnametab (see pdfSemantic.use_name_snapshot)
+from pdfCompiler import Compiler
+import pdfSemantic
+
+# Extension of the sources searched in the directories given to the check
+source_extension = ".pdfy"
+
+# Files checked in the process itself below this number (starting workers costs more than the check)
+parallel_threshold = 64
+
+# Largest number of files sent to a worker at once
+max_chunk_size = 64
+
+# Line number in the messages of the lexer and the parser : "Syntax error at 'x' (line 3)"
+message_line = re.compile(r"\(line (\d+)\)$")
+
+# Prefix of the messages of the semantic analysis -> severity of the diagnostic
+severity_prefixes = (("Error: ", "error"), ("Warning: ", "warning"))
+
+
+#############################################################################
+#                                 Diagnostics                               #
+#############################################################################
+
+def diagnostic(file_name, line, severity, message):
+    """A diagnostic : file, line (None when unknown), severity (error or warning) and message."""
+    for prefix, prefix_severity in severity_prefixes:
+        if message.startswith(prefix):
+            severity, message = prefix_severity, message[len(prefix):]
+            break
+    return {"file": file_name, "line": line, "severity": severity, "message": message}
+
+
+def parser_diagnostics(file_name, messages, line_count):
+    """Diagnostics of the messages printed by the lexer and the parser for a file of line_count lines (None : unknown)."""
+    diagnostics = []
+    for message in messages:
+        if message == "Syntax error at EOF":
+            line = line_count
+        else:
+            found = message_line.search(message)
+            line = int(found.group(1)) if found else None
+        diagnostics.append(diagnostic(file_name, line, "error", message))
+    return diagnostics
+
+
+def check_source(input_string, file_name="<string>", compiler=None):
+    """
+    Diagnostics of a source : the messages of the lexer and the parser, then those of the
+    semantic analysis, each one at the line of the top-level instruction reporting it (in the
+    included file for an included instruction). Same checks as a compilation, no PDF is generated.
+    """
+    compiler = compiler if compiler is not None else Compiler()
+
+    # The lexer and the parser print their messages (those of the included files are in the resolution)
+    with contextlib.redirect_stdout(io.StringIO()) as output:
+        parsed_data = compiler.parse(input_string)
+    source_file = file_name if parsed_data and os.path.isfile(file_name) else None
+    with contextlib.redirect_stdout(io.StringIO()):
+        resolution = compiler.resolve_includes(parsed_data, source_file) if parsed_data else None
+
+    diagnostics = parser_diagnostics(file_name, output.getvalue().splitlines(), input_string.count("\n") + 1)
+
+    if resolution is None:
+        if not diagnostics:
+            diagnostics.append(diagnostic(file_name, None, "error", "Syntax error, the document could not be parsed."))
+        return diagnostics
+
+    from pdfInclude import display_name
+    for included, message in resolution.messages:
+        diagnostics.extend(parser_diagnostics(display_name(included), [message], None))
+
+    # The analyzer does not know the lines : the messages added by an instruction are at its line
+    root = os.path.realpath(source_file) if source_file else None
+
+    def instruction_file(path):
+        return file_name if path is None or path == root else display_name(path)
+
+    for message, (included, line) in zip(resolution.errors, resolution.error_origins):
+        diagnostics.append(diagnostic(instruction_file(included), line, "error", message))
+
+    analyzer = pdfSemantic.SemanticAnalyzer()
+    error_messages, warning_messages = analyzer.error_messages, analyzer.warning_messages
+    for index, instruction in enumerate(resolution.instructions):
+        errors, warnings = len(error_messages), len(warning_messages)
+        analyzer.analyze_instruction(instruction)
+        if len(error_messages) == errors and len(warning_messages) == warnings:
+            continue
+        file = instruction_file(resolution.files[index] if resolution.files is not None else None)
+        for message in error_messages[errors:]:
+            diagnostics.append(diagnostic(file, instruction.line, "error", message))
+        for message in warning_messages[warnings:]:
+            diagnostics.append(diagnostic(file, instruction.line, "warning", message))
+
+    diagnostics.sort(key=lambda item: (item["file"] != file_name, item["file"], item["line"] or 0))
+    return diagnostics
+
+
+#############################################################################
+#                                   Workers                                 #
+#############################################################################
+
+# Set once per process by init_checker, reused for every file of the process
+_checker = None
+
+
+def init_checker():
+    """Build the compiler and take the font and color names from the snapshot, once per process."""
+    global _checker
+    pdfSemantic.use_name_snapshot()
+    _checker = Compiler()
+
+
+def check_file(input_file):
+    """Diagnostics of a source file."""
+    try:
+        with open(input_file, 'r') as f:
+            input_string = f.read()
+    except (OSError, UnicodeDecodeError) as e:
+        return [diagnostic(input_file, None, "error", f"Cannot read the file: {e}")]
+    return check_source(input_string, input_file, _checker)
+
+
+def collect_files(targets):
+    """Source files of the targets : files, directories (every *.pdfy file, recursively) and glob patterns."""
+    files = []
+    for target in targets:
+        if os.path.isdir(target):
+            for directory, _, names in sorted(os.walk(target)):
+                files.extend(os.path.join(directory, name) for name in sorted(names) if name.endswith(source_extension))
+        elif os.path.exists(target):
+            files.append(target)
+        else:
+            files.extend(sorted(glob.glob(target, recursive=True)))
+    return list(dict.fromkeys(files))  # A file given twice is checked once
+
+
+def check_files(input_files, workers=None):
+    """
+    Check the files in parallel, yields the diagnostics of each file in the order of input_files.
+    A few files are checked in the process itself (its analysis then uses the snapshot names).
+    """
+    workers = workers or os.cpu_count()
+
+    if workers == 1 or len(input_files) < parallel_threshold:
+        if _checker is None:
+            init_checker()
+        for input_file in input_files:
+            yield check_file(input_file)
+        return
+
+    chunk_size = max(1, min(max_chunk_size, len(input_files) // (workers * 4)))
+    with ProcessPoolExecutor(max_workers=workers, initializer=init_checker) as executor:
+        yield from executor.map(check_file, input_files, chunksize=chunk_size)
+
+
+#############################################################################
+#                                   Output                                  #
+#############################################################################
+
+def format_diagnostic(item, output_format="text"):
+    """One line per diagnostic : JSON object (json) or file:line: severity: message (text)."""
+    if output_format == "json":
+        return json.dumps(item)
+    line = item["line"] if item["line"] is not None else 0
+    return f"{item['file']}:{line}: {item['severity']}: {item['message']}"
+
+
+def snapshot_note():
+    """Note when the snapshot of the names was built for another reportlab than the installed one."""
+    from pdfnametab import _reportlab_version
+    from pdfOutputCache import reportlab_version
+    installed = reportlab_version()
+    if installed is not None and installed != _reportlab_version:
+        return (f"Note: the font and color names were taken from reportlab {_reportlab_version}, "
+                f"reportlab {installed} is installed (run python build_tables.py)")
+    return None
+
+
+def run_check(targets, workers=None, output_format="text", stream=sys.stdout):
+    """
+    Check every source of the targets and write their diagnostics to stream, the summary to the
+    standard error. Returns the (number of files, errors, warnings).
+    """
+    input_files = collect_files(targets)
+    note = snapshot_note()
+    if note:
+        print(note, file=sys.stderr)
+
+    start = time.perf_counter()
+    errors = warnings = 0
+    for diagnostics in check_files(input_files, workers):
+        for item in diagnostics:
+            if item["severity"] == "error":
+                errors += 1
+            else:
+                warnings += 1
+            stream.write(format_diagnostic(item, output_format) + "\n")
+    elapsed = time.perf_counter() - start
+
+    rate = f" ({len(input_files) / elapsed:.0f} files/s)" if elapsed > 0 and input_files else ""
+    print(f"Checked {len(input_files)} files in {elapsed:.3f} s{rate}: {errors} errors, {warnings} warnings",
+          file=sys.stderr)
+    return len(input_files), errors, warnings
@@ -0,0 +1,352 @@
+"""
+Module:
+3250.1 Compilateurs
+Auteur:
+WICKI Sélien
+Date: 18.10.2026
+"""
+
+# System imports
+import io
+import os
+import copy
+import contextlib
+import importlib
+import threading
+
+# Import the lexer and parser built at import (tables are only built once per process)
+from pdfLexer import lexer as base_lexer
+from pdfParser import parser as base_parser
+from pdfAst import InstructionKind
+
+# Lexer backends : name -> module whose lexer is cloned by every Compiler
+# ply -> the PLY lexer of pdfLexer, fast -> the single regex lexer of pdfFastLexer (same tokens)
+lexer_backends = {"ply": "pdfLexer", "fast": "pdfFastLexer"}
+default_lexer_backend = "ply"
+
+
+def parser_errors(parser_output):
+    """
+    Error messages of the messages printed by the lexer and the parser (recovered syntax errors and
+    illegal characters, those of the included files after the name of their file) : one per line.
+    """
+    return [f"Error: {message}" for message in parser_output.splitlines() if message]
+
+
+def syntax_errors(parser_output):
+    """Errors of a source that could not be parsed : the messages of the parser, a generic error without any."""
+    return parser_errors(parser_output) or ["Error: Syntax error, the document could not be parsed."]
+
+
+class CompilationError(Exception):
+    """No PDF could be generated (syntax error, or errors in strict mode), see compile."""
+
+    def __init__(self, error_messages, warning_messages):
+        super().__init__("\n".join(error_messages))
+        self.error_messages = error_messages
+        self.warning_messages = warning_messages
+
+
+class Compiler:
+    """
+    A reusable compiler instance owning its own lexer, parser state and configuration.
+
+    The module level lexer and parser of pdfLexer/pdfParser are never driven directly :
+    every Compiler works on a clone of the lexer and a copy of the parser, which share the
+    (read-only) lexing and parsing tables but not the state of a running compilation
+    (lineno, lexer state, parser stacks). Two Compilers can therefore be used at the same
+    time from different threads without any lock.
+
+    A single Compiler is not meant to be shared between threads : use get_compiler() to
+    get the instance of the current thread.
+
+    Configuration :
+    print_errors -> print the errors and warnings of the semantic analysis
+    strict -> do not generate a PDF when the document has errors
+    lexer_backend -> lexer used by the parser, a name of lexer_backends
+    low_memory -> generate the PDF in memory independent of the length of the document (see create_pdf)
+    invariant -> reproducible PDF (no creation date / random document id, see build_document)
+    render_workers -> number of processes preparing the paragraphs of the PDF (see pdfParallel),
+                      None : the PDF is generated in the process of the Compiler
+    output_cache -> OutputCache (see pdfOutputCache) giving back the PDF of an already compiled source,
+                    None : every source is compiled
+    ir_cache -> IrCache (see pdfIrCache) giving back the analysed IR of an already analysed source,
+                None : every source is lexed, parsed and analysed
+    includes -> resolve the $include instructions (see pdfInclude), False : every $include is an
+                error (sources of untrusted clients must not read the files of the machine)
+
+    The semantic analysis and the generator (and so reportlab) are only imported when they are
+    first used : a compilation answered by the output cache never loads them.
+
+    timer -> pdfProfile.StageTimer while a compilation is profiled (see profile) : it times each
+             stage of the pipeline (see stage) and the layout of each content item, None otherwise
+    """
+
+    def __init__(self, print_errors=False, strict=False, lexer_backend=default_lexer_backend, low_memory=False,
+                 render_workers=None, output_cache=None, ir_cache=None, includes=True, invariant=False):
+        self.print_errors = print_errors
+        self.strict = strict
+        self.low_memory = low_memory
+        self.invariant = invariant
+        self.render_workers = render_workers
+        self.output_cache = output_cache
+        self.ir_cache = ir_cache
+        self.includes = includes
+        self.resolver = None  # IncludeResolver, created by the first $include
+        self.syntax_errors = []  # Errors of the last source front_end could not parse (see syntax_errors)
+        self.timer = None
+
+        if lexer_backend not in lexer_backends:
+            raise ValueError(f"Unknown lexer backend {lexer_backend!r}, use one of {', '.join(lexer_backends)}")
+        self.lexer_backend = lexer_backend
+
+        # Own lexer (clone shares the master regexes, not the state)
+        backend_lexer = base_lexer if lexer_backend == "ply" else importlib.import_module(lexer_backends[lexer_backend]).lexer
+        self.lexer = backend_lexer.clone()
+        self.lexer.lexstatestack = []
+
+        # Own parser (the copy shares the LALR tables, the stacks are set on each parse)
+        self.parser = copy.copy(base_parser)
+
+    def stage(self, name):
+        """Context of a stage of the pipeline (parser.parse, semantical_analysis, create_pdf, ...), timed by the timer."""
+        return self.timer.stage(name) if self.timer is not None else contextlib.nullcontext()
+
+    def reset(self, first_line=1):
+        """Reset the lexer state left by a previous (possibly failed) compilation."""
+        self.lexer.lineno = first_line
+        self.lexer.lexstatestack = []
+        self.lexer.begin('INITIAL')
+
+    def tokenize(self, input_string):
+        """Return the list of the tokens of the input."""
+        self.reset()
+        self.lexer.input(input_string)
+        tokens = []
+        while True:
+            tok = self.lexer.token()
+            if not tok:
+                break
+            tokens.append(tok)
+        return tokens
+
+    def parse(self, input_string, first_line=1):
+        """
+        Parse the input and return the parsed data (None on a syntax error at EOF).
+        first_line is the line number of the first line of input_string (when it is a part of a file).
+        """
+        self.reset(first_line)
+        return self.parser.parse(input_string, lexer=self.lexer)
+
+    def analyze(self, parsed_data):
+        """Run the semantic analysis, same return value as semantical_analysis."""
+        from pdfSemantic import semantical_analysis
+        return semantical_analysis(parsed_data, print_errors=self.print_errors)
+
+    def include_resolver(self):
+        """IncludeResolver of the Compiler : the parse of the included files is kept between compilations."""
+        if self.resolver is None:
+            from pdfInclude import IncludeResolver
+            self.resolver = IncludeResolver(self)
+        return self.resolver
+
+    def resolve_includes(self, parsed_data, source_file=None):
+        """
+        Replace the $include instructions of the parsed data by the instructions of the included
+        files, relative to the directory of source_file (the current directory without a file).
+        Returns the Resolution (see pdfInclude), the messages of the lexer and the parser of the
+        included files are printed after the name of their file.
+        """
+        from pdfInclude import Resolution, display_name
+
+        if not self.includes:
+            instructions = [instruction for instruction in parsed_data if instruction.kind is not InstructionKind.INCLUDE]
+            errors = ["Error: $include is not allowed for this source."] if len(instructions) != len(parsed_data) else []
+            return Resolution(instructions, errors=errors)
+
+        resolution = self.include_resolver().resolve(parsed_data, source_file)
+        for file, message in resolution.messages:
+            print(f"{display_name(file)}: {message}")
+        return resolution
+
+    def analyze_resolution(self, resolution):
+        """Semantic analysis of a resolved document (same return value), the errors of the inclusion come first."""
+        with self.stage("semantical_analysis"):
+            if self.print_errors and resolution.errors:
+                from pdfOutputCache import print_messages
+                print_messages(resolution.errors, [])
+            analysis = self.analyze(resolution.instructions)
+            if self.timer is not None:
+                self.timer.analysed(resolution.instructions, analysis[3])
+        analysis[4][0:0] = resolution.errors
+        return analysis
+
+    def parse_resolved(self, input_string, source_file=None):
+        """
+        Parse the source and resolve its $include instructions. The messages of the lexer and the
+        parser are printed as they are and also returned : (resolution, parser output), the
+        resolution being None on a syntax error.
+        """
+        with self.stage("parser.parse"), contextlib.redirect_stdout(io.StringIO()) as parser_output:
+            parsed_data = self.parse(input_string)
+            resolution = self.resolve_includes(parsed_data, source_file) if parsed_data else None
+        print(parser_output.getvalue(), end="")
+        return resolution, parser_output.getvalue()
+
+    def front_end(self, input_string, source_file=None):
+        """
+        Parse the source, resolve its $include instructions and analyse it : same return value as
+        semantical_analysis, None on a syntax error (its errors are then in syntax_errors). The messages of the lexer and the parser come
+        first in the errors (see parser_errors). With an ir_cache, the IR of an already analysed
+        source is loaded from it (the messages of the lexer, the parser and the analysis are printed
+        again), unless one of its included files changed since.
+        """
+        if self.ir_cache is None:
+            resolution, parser_output = self.parse_resolved(input_string, source_file)
+            if resolution is None:
+                self.syntax_errors = syntax_errors(parser_output)
+                return None
+            analysis = self.analyze_resolution(resolution)
+            analysis[4][0:0] = parser_errors(parser_output)
+            return analysis
+
+        from pdfIrCache import ir_key
+        from pdfOutputCache import print_messages
+        # The same source includes other files from another directory
+        include_dir = None
+        if "$include" in input_string:
+            include_dir = os.path.dirname(os.path.realpath(source_file)) if source_file else os.path.abspath(os.curdir)
+        key = ir_key(input_string, include_dir)
+        with self.stage("ir_cache"):
+            ir = self.ir_cache.load(key, changed=lambda dependencies: self.include_resolver().changed(dependencies))
+        if ir is not None:
+            parser_output, analysis = ir
+            print(parser_output, end="")
+            if self.print_errors:
+                print_messages(analysis[4], analysis[5])
+        else:
+            # The messages of the lexer and the parser are kept with the IR
+            resolution, parser_output = self.parse_resolved(input_string, source_file)
+            if resolution is None:
+                self.syntax_errors = syntax_errors(parser_output)
+                return None
+            analysis = self.analyze_resolution(resolution)
+            with self.stage("ir_cache"):
+                self.ir_cache.store(key, (parser_output, analysis), resolution.dependencies)
+
+        analysis[4][0:0] = parser_errors(parser_output)
+        return analysis
+
+    def render(self, semantic_data, output_file):
+        """Generate the PDF of already analysed data to output_file (path or binary file object)."""
+        # Imported here so that a Compiler used only for checking never loads the PDF generator
+        from pdfGenerator import SimpleDocTemplate
+        document_class = self.timer.document_class() if self.timer is not None else SimpleDocTemplate
+        with self.stage("create_pdf"):
+            if self.render_workers is not None:
+                from pdfParallel import create_pdf_parallel
+                create_pdf_parallel(semantic_data, output_file, self.invariant, workers=self.render_workers, low_memory=self.low_memory,
+                                    document_class=document_class)
+            else:
+                from pdfGenerator import create_pdf
+                create_pdf(semantic_data, output_file, self.invariant, low_memory=self.low_memory, document_class=document_class)
+
+    def compile(self, input_string, output_file, source_file=None):
+        """
+        Run the whole pipeline on a source string and write the PDF to output_file, a path or a
+        binary file object (io.BytesIO, sys.stdout.buffer, ...). source_file is the file of the
+        source, the paths of its $include instructions are relative to its directory.
+        Returns the (error_messages, warning_messages) of the compilation.
+        """
+        key = None
+        # The key of the output cache only knows the source : a document including files is always compiled
+        if self.output_cache is not None and "$include" not in input_string:
+            from pdfOutputCache import cache_key, print_messages
+            key = cache_key(input_string, strict=self.strict, invariant=self.invariant)
+            with self.stage("output_cache"):
+                messages = self.output_cache.fetch(key, output_file)
+            if messages is not None:
+                if self.print_errors:
+                    print_messages(*messages)
+                return messages
+
+        analysis = self.front_end(input_string, source_file)
+        if analysis is None:
+            return self.syntax_errors, []
+
+        styles, page_number, _, doc_content, error_messages, warning_messages = analysis
+
+        if error_messages and self.strict:
+            return error_messages, warning_messages
+
+        semantic_data = {"Styles": styles, "PageNumberConfig": page_number, "Content": doc_content}
+        if key is None:
+            self.render(semantic_data, output_file)
+        elif isinstance(output_file, (str, os.PathLike)):
+            self.render(semantic_data, output_file)
+            with self.stage("output_cache"):
+                self.output_cache.store(key, output_file, error_messages, warning_messages)
+        else:
+            # What is written to a file object cannot be read back for the cache
+            buffer = io.BytesIO()
+            self.render(semantic_data, buffer)
+            output_file.write(buffer.getvalue())
+            with self.stage("output_cache"):
+                self.output_cache.store(key, buffer.getvalue(), error_messages, warning_messages)
+        return error_messages, warning_messages
+
+    def compile_bytes(self, input_string, source_file=None):
+        """
+        Same as compile, the PDF being rendered in memory.
+        Returns (pdf, error_messages, warning_messages), pdf being the bytes of the PDF or None
+        when no PDF was generated.
+        """
+        buffer = io.BytesIO()
+        error_messages, warning_messages = self.compile(input_string, buffer, source_file)
+        return buffer.getvalue() or None, error_messages, warning_messages
+
+    def profile(self, input_string, output_file, **options):
+        """
+        Compile like compile and return the profile of the compilation (time, memory and counts
+        of each stage, slowest instructions), options and result of pdfProfile.profile_compile.
+        """
+        from pdfProfile import profile_compile
+        return profile_compile(input_string, output_file, compiler=self, **options)
+
+    def compile_file(self, input_file, output_file):
+        """Same as compile, reading the source from input_file."""
+        with open(input_file, 'r') as f:
+            input_string = f.read()
+        return self.compile(input_string, output_file, input_file)
+
+
+# One Compiler per thread, created on first use and reused afterwards
+_thread_compilers = threading.local()
+
+
+def get_compiler(**config):
+    """
+    Return the Compiler of the current thread (created on first call with the given configuration).
+    A later call with a different configuration (no configuration included) replaces the instance
+    of the thread.
+    """
+    compiler = getattr(_thread_compilers, "compiler", None)
+    # An empty configuration is the default one : it also replaces a configured instance
+    if compiler is None or config != getattr(_thread_compilers, "config", None):
+        compiler = Compiler(**config)
+        _thread_compilers.compiler = compiler
+        _thread_compilers.config = config
+    return compiler
+
+
+def compile(source, **config):
+    """
+    Compile a source string and return the bytes of its PDF, without touching the disk.
+    config -> configuration of the Compiler (see Compiler), the Compiler of the thread is reused.
+    Raises CompilationError when no PDF can be generated (syntax error, errors with strict=True) ;
+    the messages of a successful compilation are dropped, use Compiler.compile_bytes to get them.
+    """
+    pdf, error_messages, warning_messages = get_compiler(**config).compile_bytes(source)
+    if pdf is None:
+        raise CompilationError(error_messages, warning_messages)
+    return pdf
@@ -0,0 +1,337 @@
+"""
+Module:
+3250.1 Compilateurs
+Auteur:
+WICKI Sélien
+Date: 18.10.2026
+"""
+
+# System imports
+import re
+import functools
+import itertools
+from collections import namedtuple
+
+import pdfLexer as spec
+
+
+class Token(namedtuple("Token", ["type", "value", "lineno", "lexpos"])):
+    """
+    Token of the fast lexer, same attributes (and same printing) as PLY's LexToken.
+    Built with tuple.__new__(Token, (type, value, lineno, lexpos)), which runs no Python code.
+    The attributes yacc may add to a token (lexer) go to the instance dict.
+    """
+
+    def __repr__(self):
+        return f"LexToken({self.type},{self.value!r},{self.lineno},{self.lexpos})"
+
+    __str__ = __repr__
+
+
+def rule_functions(prefix):
+    """Rule functions of pdfLexer whose name starts with prefix, in order of definition (the order PLY tries them)."""
+    other_states = tuple(f"t_{state}_" for state, _ in spec.states)
+    functions = [
+        rule for name, rule in vars(spec).items()
+        if name.startswith(prefix) and callable(rule) and name != "t_error"
+        and (prefix != "t_" or not name.startswith(other_states))
+    ]
+    return sorted(functions, key=lambda rule: rule.__code__.co_firstlineno)
+
+
+def token_type(rule):
+    """Token type of a rule function (t_arg_STRING -> STRING)."""
+    name = rule.__name__[2:]
+    for state, _ in spec.states:
+        if name.startswith(f"{state}_"):
+            return name[len(state) + 1:]
+    return name
+
+
+# Rules handled by their own alternative of the combined regex, the other rules are keywords
+special_rules = {"newline", "TEXT", "STRING", "NUMBER"}
+
+# Number of tokens lexed ahead of the parser (at least)
+batch_size = 256
+
+# Tokens changing the state of the lexer (t_LPAREN and t_RPAREN of pdfLexer) -> state entered
+state_changes = {"LPAREN": "arg", "RPAREN": "INITIAL"}
+
+
+def keyword(rule):
+    """Literal text matched by a keyword rule (r"\\$style" -> "$style")."""
+    literal = re.sub(r"\\(.)", r"\1", rule.__doc__)
+    if not re.fullmatch(rule.__doc__, literal):
+        raise ValueError(f"Rule {rule.__name__} is not a keyword, add it to special_rules")
+    return literal
+
+
+# Unicode whitespace characters (those of \s, all of them are in the Basic Multilingual Plane)
+whitespace = re.escape("".join(character for character in map(chr, range(0x10000)) if character.isspace()))
+
+
+def expand_whitespace(regex):
+    r"""
+    Same regex with the \s of its character classes written as the list of the whitespace
+    characters : a class made of characters only is checked about twice as fast as a class
+    holding a category (the t_TEXT class of pdfLexer).
+    """
+    def expand_class(match):
+        return re.sub(r"\\.", lambda escape: whitespace if escape.group() == r"\s" else escape.group(), match.group())
+    return re.sub(r"\[(?:\\.|[^\]\\])*\]", expand_class, regex)
+
+
+def build_state(state, compounds=()):
+    """
+    Combined regex of a state, the kind of each of its groups and the keyword lookup table.
+
+    The rules of the state come first, then (inclusive state) those of INITIAL. Every alternative
+    keeps the position of its PLY rule : Python tries the alternatives of a regex in order like
+    PLY tries its rules, so a prefix rule written first still wins (#font is matched before
+    #fontColor, as with PLY). Consecutive keyword rules share one alternative, the type of the
+    token is found in the keyword table ; the state changing tokens have their own alternative.
+    The regex starts by skipping the ignored characters (t_ignore) : the lookahead makes the
+    skip greedy, a token never starts with an ignored character. The last alternative matches
+    any character : an illegal character is a match of kind "error" instead of a gap. The
+    compounds, (kind, regex) alternatives matching several tokens at once, come first.
+
+    Returns (regex, kinds, own_groups, keywords) : kinds[group] is the token type of a special
+    rule, "keyword", "begin" or "error", own_groups are the groups of the rules specific to the state.
+    """
+    groups = [rule_functions("t_") if state == "INITIAL" else rule_functions(f"t_{state}_")]
+    if state != "INITIAL":
+        groups.append(rule_functions("t_"))
+
+    alternatives = [(kind, regex, False) for kind, regex in compounds]  # (kind, pattern, own)
+    keywords = {}  # keyword -> token type
+    for own, functions in zip((True, False), groups):
+        for rule in functions:
+            name = token_type(rule)
+            if name in special_rules:
+                alternatives.append((name, expand_whitespace(rule.__doc__), own))
+                continue
+
+            literal = keyword(rule)
+            keywords[literal] = name
+            if name in state_changes:
+                alternatives.append(("begin", re.escape(literal), own))
+            elif alternatives and alternatives[-1][0] == "keyword" and alternatives[-1][2] == own:
+                alternatives[-1] = ("keyword", alternatives[-1][1] + "|" + re.escape(literal), own)
+            else:
+                alternatives.append(("keyword", re.escape(literal), own))
+    alternatives.append(("error", r"[\s\S]", False))
+
+    ignore = re.escape(spec.t_ignore)
+    pattern = f"[{ignore}]*(?![{ignore}])(?:" + "|".join(f"({regex})" for _, regex, _ in alternatives) + ")"
+    kinds = [None] + [kind for kind, _, _ in alternatives]  # Indexed by the number of the group
+    own_groups = frozenset(group for group, (_, _, own) in enumerate(alternatives, 1) if own)
+    return re.compile(pattern), kinds, own_groups, keywords
+
+
+def compound_rules(keywords):
+    """
+    Alternatives matching the most frequent sequences of tokens of the language in one match,
+    (kind, regex) :
+    call -> an instruction keyword and '(' ($section( : SECTION, LPAREN), enters the arg state
+    close -> ')' and '{' (end of the arguments, start of the content), back to INITIAL
+    end -> '}' and the newlines after it (end of a top-level instruction)
+
+    Each token of a compound is the one PLY gives at its position whatever the state : no rule
+    before the instruction keywords matches '$', and ')', '{', '}' and newlines only match their
+    own rule. The instruction keywords are tried in the order of their rules, which gives the
+    keyword of PLY as long as no keyword is a prefix of another one (the regex would backtrack
+    to the longer one).
+    """
+    instructions = [literal for literal in keywords if literal.startswith("$")]
+    if any(other != literal and other.startswith(literal) for literal in instructions for other in instructions):
+        raise ValueError("An instruction keyword is a prefix of another one, the call compound would not match as PLY")
+    return [
+        ("call", "(?:" + "|".join(map(re.escape, instructions)) + r")\("),
+        ("close", r"\)\{"),
+        ("end", r"\}" + spec.t_newline.__doc__),
+    ]
+
+
+def build_tables():
+    """
+    Tables of the lexer : the regex of each state, the kinds of the groups of the arg regex seen
+    from each state (in INITIAL, the rules specific to arg are of kind "relex") and the
+    transitions : value of a state changing token -> (state entered, kinds of this state).
+    The regex of the arg state, which scans the whole input, starts with the compounds
+    (compound_rules), the one of INITIAL only lexes single tokens again.
+    """
+    initial = build_state("INITIAL")
+    states = {"INITIAL": initial}
+    for name, _ in spec.states:
+        states[name] = build_state(name, compound_rules(initial[3]))
+    _, kinds, own_groups, keywords = states["arg"]
+    scan_kinds = {
+        "arg": kinds,
+        "INITIAL": ["relex" if group in own_groups else kind for group, kind in enumerate(kinds)],
+    }
+    transitions = {
+        value: (state_changes[token_type], scan_kinds[state_changes[token_type]])
+        for value, token_type in keywords.items() if token_type in state_changes
+    }
+    return states, scan_kinds, transitions
+
+
+class FastLexer:
+    """
+    Lexer equivalent to the PLY lexer of pdfLexer, built from the same rules.
+
+    Each state has a single precompiled regex (one group per alternative, the keywords $..., #...,
+    {, }, ... typed through a lookup table) and tokens are tuples : no rule function is called
+    per token. It has the interface of a PLY lexer used by the parser and by Compiler (input,
+    token, clone, begin, lineno, lexpos, lexdata).
+
+    The arg state is inclusive : its regex also matches every token of INITIAL. The whole input
+    is scanned with it in one pass (finditer) whatever the state, a token of a rule specific to
+    arg (#..., strings, numbers, ',' and '=') found in the INITIAL state is lexed again with the
+    regex of INITIAL and the scan resumes after it.
+
+    Tokens are produced by batches of about batch_size tokens, consumed one at a time by token().
+    A batch ends before an illegal character, so that its message is printed when the parser
+    reaches it, as with PLY. lexpos, lineno and lexstate are only updated at the end of the input.
+
+    The most frequent sequences of the arg state are matched by one alternative (compound_rules) :
+    a keyword and its '(', ')' and '{', '}' and the newline after it. Each match gives its tokens
+    directly, which reduces the number of matches per token.
+    """
+
+    def __init__(self, tables=None):
+        # Tables are shared between the clones, like the master regexes of PLY
+        self.tables = tables if tables is not None else build_tables()
+        self.lexdata = ""
+        self.lexpos = 0
+        self.lexlen = 0
+        self.lineno = 1
+        self.lexstatestack = []
+        self.begin("INITIAL")
+
+    def clone(self):
+        return FastLexer(self.tables)
+
+    def begin(self, state):
+        self.lexstate = state
+
+    def current_state(self):
+        return self.lexstate
+
+    def input(self, s):
+        self.lexdata = s
+        self.lexpos = 0
+        self.lexlen = len(s)
+        # token() returns None after the last token, like the token() of PLY
+        self.token = functools.partial(next, itertools.chain.from_iterable(self.generate()), None)
+
+    def token(self):
+        return None  # No input yet
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        tok = self.token()
+        if tok is None:
+            raise StopIteration
+        return tok
+
+    def generate(self):
+        """Lists of the tokens of the input."""
+        data = self.lexdata
+        length = self.lexlen
+        states, scan_kinds, transitions = self.tables
+        scan_regex, _, _, keywords = states["arg"]
+        initial_regex, initial_kinds, _, initial_keywords = states["INITIAL"]
+        state = self.lexstate
+        kinds = scan_kinds[state]
+        position = self.lexpos
+        lineno = self.lineno
+        new = tuple.__new__
+        tokens = []
+        append = tokens.append
+        # Tokens of the compounds
+        lparen, rparen, lbrace, rbrace = keywords["("], keywords[")"], keywords["{"], keywords["}"]
+        enter_arg, leave_arg = transitions["("], transitions[")"]
+
+        while position < length:
+            for found in scan_regex.finditer(data, position):
+                group = found.lastindex
+                kind = kinds[group]
+
+                # Most frequent kinds first
+                if kind == "TEXT":
+                    value = found[group]
+                    append(new(Token, (kind, value, lineno, found.start(group))))
+                    lineno += value.count("\n")
+                elif kind == "keyword":
+                    value = found[group]
+                    append(new(Token, (keywords[value], value, lineno, found.start(group))))
+                elif kind == "call":
+                    start, end = found.span(group)
+                    value = data[start:end - 1]
+                    append(new(Token, (keywords[value], value, lineno, start)))
+                    append(new(Token, (lparen, "(", lineno, end - 1)))
+                    state, kinds = enter_arg
+                elif kind == "close":
+                    start = found.start(group)
+                    append(new(Token, (rparen, ")", lineno, start)))
+                    append(new(Token, (lbrace, "{", lineno, start + 1)))
+                    state, kinds = leave_arg
+                    if len(tokens) >= batch_size:
+                        yield tokens
+                        tokens = []
+                        append = tokens.append
+                elif kind == "end":
+                    append(new(Token, (rbrace, "}", lineno, found.start(group))))
+                    lineno += len(found[group]) - 1
+                elif kind == "begin":
+                    value = found[group]
+                    append(new(Token, (keywords[value], value, lineno, found.start(group))))
+                    state, kinds = transitions[value]
+                    if len(tokens) >= batch_size:
+                        yield tokens
+                        tokens = []
+                        append = tokens.append
+                elif kind == "newline":
+                    lineno += len(found[group])
+                elif kind == "relex":
+                    # Lexed again as INITIAL : the rules of INITIAL matching where a rule of arg
+                    # matched are TEXT (digits, ',') or nothing (illegal '#', '"', '=')
+                    found = initial_regex.match(data, found.start(group))
+                    group = found.lastindex
+                    start, position = found.span(group)
+                    kind = initial_kinds[group]
+                    if kind == "error":
+                        if tokens:
+                            yield tokens
+                            tokens = []
+                            append = tokens.append
+                        print(f"Illegal character '{data[start]}' (line {lineno})")
+                    else:
+                        value = data[start:position]
+                        append(new(Token, (initial_keywords.get(value, kind), value, lineno, start)))
+                        lineno += value.count("\n")
+                    break
+                elif kind == "error":
+                    # Reported once the parser has read the tokens before it, like PLY does
+                    if tokens:
+                        yield tokens
+                        tokens = []
+                        append = tokens.append
+                    print(f"Illegal character '{found[group]}' (line {lineno})")
+                else:
+                    append(new(Token, (kind, found[group], lineno, found.start(group))))
+            else:
+                # Only ignored characters after the last token
+                position = length
+
+        self.lexstate = state
+        self.lexpos = position
+        self.lineno = lineno
+        yield tokens
+
+
+# Build the lexer
+lexer = FastLexer()
@@ -0,0 +1,255 @@
+"""
+Module:
+3250.1 Compilateurs
+Auteur:
+WICKI Sélien
+Date: 18.10.2026
+"""
+
+# System imports
+import os
+import pickle
+import fnmatch
+import hashlib
+import threading
+import weakref
+
+# reportlab is imported by the functions loading and registering the fonts : the names of the
+# fonts of the directory (font_files) are known without it (see the check mode of pdfCheck)
+
+# Font files of the font directory (TrueType outlines only : reportlab cannot embed CFF based .otf files)
+font_extensions = (".ttf", ".otf")
+
+# Font directory used when none is configured (set_font_dir), empty : no font directory
+font_dir_variable = "PDFY_FONT_DIR"
+
+# Default location of the on-disk metrics cache
+default_cache_dir = os.path.join(".pdfy_cache", "fonts")
+
+# Bumped when the format of the cached entries changes
+cache_format = 1
+
+# Attributes of a parsed TTFontFace that are not stored : the font data (read again from the file)
+# and the scaling function (rebuilt from unitsPerEm, it cannot be pickled)
+face_excluded_attributes = ("_ttf_data", "_pdfScale")
+
+
+class FontLibrary:
+    """
+    TrueType fonts of the font directory : the font of the file Brand-Bold.ttf is "Brand-Bold".
+
+    The fonts are registered in reportlab the first time they are used (ensure_font). The
+    metrics and glyph tables of a font file are parsed once and cached on disk, keyed by the
+    hash of the file : every later registration, in any process, loads them from the cache.
+    """
+
+    def __init__(self, font_dir=None, cache_dir=default_cache_dir):
+        self.font_dir = font_dir
+        self.cache_dir = cache_dir
+        self.lock = threading.Lock()
+        self.files = None  # font name -> path, read on first use
+        self.registered = {}  # font name -> path of the fonts registered from the directory
+        self.hashes = {}  # path -> (file state, hash of the contents of the file)
+
+    def font_files(self):
+        """Font name -> path of the font files of the directory."""
+        if self.files is None:
+            files = {}
+            if self.font_dir and os.path.isdir(self.font_dir):
+                for entry in sorted(os.listdir(self.font_dir)):
+                    name, extension = os.path.splitext(entry)
+                    if extension.lower() in font_extensions:
+                        files.setdefault(name, os.path.join(self.font_dir, entry))
+            self.files = files
+        return self.files
+
+    def file_hash(self, font_name):
+        """Hash of the contents of the font file of font_name (None : not a font of the directory), read again when the file changed."""
+        path = self.font_files().get(font_name)
+        if path is None:
+            return None
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        state = (stat.st_mtime_ns, stat.st_size)
+        cached = self.hashes.get(path)
+        if cached is None or cached[0] != state:
+            with open(path, 'rb') as f:
+                cached = self.hashes[path] = (state, hashlib.sha256(f.read()).hexdigest())
+        return cached[1]
+
+    def ensure_font(self, font_name):
+        """Register the font of the directory named font_name if needed, False if there is none (or it cannot be loaded)."""
+        if font_name in self.registered:
+            return True
+        path = self.font_files().get(font_name)
+        if path is None:
+            return False
+
+        from reportlab.pdfbase import pdfmetrics, ttfonts
+        with self.lock:
+            if font_name not in self.registered:
+                try:
+                    pdfmetrics.registerFont(self.load_font(font_name, path))
+                except (ttfonts.TTFError, OSError, ValueError) as e:
+                    print(f"Error loading font {path}: {e}")
+                    return False
+                self.registered[font_name] = path
+        return True
+
+    #############################################################################
+    #                                   Cache                                   #
+    #############################################################################
+
+    def cache_file(self, data):
+        key = hashlib.sha256(data).hexdigest()
+        return os.path.join(self.cache_dir, f"{key}.pickle")
+
+    def load_font(self, font_name, path):
+        """TTFont of a font file, its face taken from the metrics cache when the file is known."""
+        from reportlab import Version as reportlab_version
+        from reportlab.pdfbase import ttfonts
+
+        with open(path, 'rb') as f:
+            data = f.read()
+        cache_file = self.cache_file(data)
+
+        face = None
+        try:
+            with open(cache_file, 'rb') as f:
+                entry = pickle.load(f)
+            if entry.get("format") == cache_format and entry.get("reportlab") == reportlab_version:
+                face = face_from_attributes(entry["face"], data, path)
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError, KeyError, TypeError):
+            face = None  # Missing or unusable entry : parsed again and rewritten
+
+        if face is None:
+            face = ttfonts.TTFontFace(path)
+            self.save_face(cache_file, face)
+
+        return font_from_face(font_name, face)
+
+    def save_face(self, cache_file, face):
+        """Write the cache entry atomically (temporary file + rename), several processes may write it."""
+        from reportlab import Version as reportlab_version
+
+        attributes = {name: value for name, value in vars(face).items() if name not in face_excluded_attributes}
+        entry = {"format": cache_format, "reportlab": reportlab_version, "face": attributes}
+        try:
+            os.makedirs(os.path.dirname(cache_file), exist_ok=True)
+            temporary = f"{cache_file}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(temporary, 'wb') as f:
+                pickle.dump(entry, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temporary, cache_file)
+        except (OSError, pickle.PicklingError):
+            pass  # The cache is only an optimisation
+
+
+def pdf_scale(units_per_em):
+    """Scaling function of a TrueType face (see TTFontFile.extractInfo)."""
+    if units_per_em == 1000:
+        return lambda x: x
+    multiplier = 1000 / units_per_em
+    return lambda x: x * multiplier
+
+
+def face_from_attributes(attributes, data, path):
+    """TTFontFace rebuilt from its cached attributes, without parsing the font file."""
+    from reportlab.pdfbase import ttfonts
+
+    face = ttfonts.TTFontFace.__new__(ttfonts.TTFontFace)
+    face.__dict__.update(attributes)
+    face._ttf_data = data
+    face._pdfScale = pdf_scale(face.unitsPerEm)
+    face.filename = path
+    return face
+
+
+def font_from_face(font_name, face):
+    """TTFont using an already parsed face (same attributes as TTFont.__init__)."""
+    from reportlab import rl_config
+    from reportlab.pdfbase import ttfonts
+
+    font = ttfonts.TTFont.__new__(ttfonts.TTFont)
+    font.fontName = font_name
+    font.face = face
+    font.encoding = ttfonts.TTEncoding()
+    font.state = weakref.WeakKeyDictionary()
+    font._asciiReadable = rl_config.ttfAsciiReadable
+    font.shapable = not any(fnmatch.fnmatch(font_name, pattern) for pattern in getattr(ttfonts, "unShapedFontGlob", ()))
+    return font
+
+
+# Font library of the process, its directory is set by set_font_dir (or PDFY_FONT_DIR)
+library = FontLibrary(os.environ.get(font_dir_variable) or None)
+
+# Functions called (without argument) when the fonts of the directory change, to drop what was
+# measured or built with the previous fonts (the width and style caches of pdfGenerator, ...)
+font_change_callbacks = []
+
+
+def fonts_changed():
+    for callback in font_change_callbacks:
+        callback()
+
+
+def unregister_font(font_name):
+    """
+    Remove a font from reportlab's registry : registerFont keeps the font already registered
+    under a name, a font whose file changed must be removed before it is registered again.
+    """
+    from reportlab.pdfbase import pdfmetrics
+    font = pdfmetrics._fonts.pop(font_name, None)
+    face_name = getattr(getattr(font, "face", None), "name", None)
+    if face_name is not None and pdfmetrics._dynFaceNames.get(face_name) is font:
+        del pdfmetrics._dynFaceNames[face_name]
+
+
+def set_font_dir(font_dir, cache_dir=default_cache_dir):
+    """
+    Use the fonts of font_dir (None : no font directory). The directory is also exported in
+    PDFY_FONT_DIR, so that the worker processes started afterwards use it too. The fonts
+    registered from the previous directory are removed from reportlab.
+    """
+    global library
+    for font_name in library.registered:
+        unregister_font(font_name)
+    library = FontLibrary(font_dir, cache_dir)
+    if font_dir:
+        os.environ[font_dir_variable] = font_dir
+    else:
+        os.environ.pop(font_dir_variable, None)
+    fonts_changed()
+
+
+def ensure_font(font_name):
+    """Register the font font_name of the font directory if needed (see FontLibrary.ensure_font)."""
+    return library.ensure_font(font_name)
+
+
+def font_file_hash(font_name):
+    """Hash of the font file of font_name in the font directory, None for the other fonts (see FontLibrary.file_hash)."""
+    return library.file_hash(font_name)
+
+
+def registered_font_files():
+    """Paths of the font files registered from the font directory."""
+    return list(library.registered.values())
+
+
+def reload_fonts(changed_files=None):
+    """
+    Register again the fonts registered from the font directory after a change of their files
+    (changed_files -> paths of the changed font files, None : every font). The fonts of the
+    changed files are removed from reportlab first, the directory is listed again.
+    """
+    global library
+    previous = library
+    library = FontLibrary(previous.font_dir, previous.cache_dir)
+    changed_files = None if changed_files is None else set(changed_files)
+    for font_name, path in previous.registered.items():
+        if changed_files is None or path in changed_files:
+            unregister_font(font_name)
+        ensure_font(font_name)
+    fonts_changed()
@@ -1,127 +1,441 @@
-""" 
-Module: 
-3250.1 Compilateurs 
-Auteur: 
-WICKI Sélien 
-Date: 26.01.2025 
 """
+Module:
+3250.1 Compilateurs
+Auteur:
+WICKI Sélien
+Date: 26.01.2025
+"""
+
+# System imports
+import io
+import functools
+import threading
+import collections
 
 from reportlab.lib.pagesizes import A4
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+from reportlab.lib.styles import ParagraphStyle
 from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer
 from reportlab.lib import colors
+from reportlab.pdfgen.canvas import Canvas
+from reportlab.pdfbase import pdfdoc
+from reportlab.pdfbase.pdfmetrics import getAscentDescent
+from reportlab.platypus import paragraph as rl_paragraph
+from reportlab import rl_config
 
-def create_pdf(semantic_data, filename="output.pdf"):
-    # Get data
-    styles_data = semantic_data["Styles"]
-    page_config = semantic_data["PageNumberConfig"]
-    content_data = semantic_data["Content"]
+from pdfFonts import ensure_font, font_change_callbacks
 
-    # Extract the page start value (default is 1 if not specified or if error)
-    try:
-        page_number_start = int(page_config.get("#pageNumberStart", 1))
-    except ValueError:
-        page_number_start = 1
-
-    # Define styles dictionary to hold dynamic styles
-    styles = getSampleStyleSheet()
-
-    # Apply styles from semantic data
-    for style in styles_data:
-        style_name = style["#name"].strip('"')  # Sanitize style name by removing surrounding quotes
-        font = style.get("#font", "Helvetica")
-        font_size = int(style.get("#fontSize", 12))
-        font_color = style.get("#font_color", "black")
-        
-        # Create a ParagraphStyle and add it to styles
-        styles.add(ParagraphStyle(
-            name=style_name,
-            fontName=font,
-            fontSize=font_size,
-            textColor=colors.HexColor(font_color) if font_color.startswith("#") else colors.toColor(font_color),
-            leading=font_size + 2
-        ))
+# Lowered values of the analysis : typed styles and page number configuration
+from pdfSemantic import style_definition, PageNumberLayout
 
-    # Setup the PDF document
-    doc = SimpleDocTemplate(filename, pagesize=A4)
-    story = []
 
-    # Helper to add formatted text to the story
-    def add_paragraph(text, style_name):
-        sanitized_style_name = style_name.strip('"')  # Sanitize style name before using
-        story.append(Paragraph(text, styles[sanitized_style_name]))
-        story.append(Spacer(1, 12))
+# Number of stylesheets kept by build_stylesheet (least recently used ones are dropped)
+stylesheet_cache_size = 32
 
-    # Render content based on structure
-    for item in content_data:
-        item_type = item.get("type")
-        args = item.get("arguments")
-        content = item.get("content", [])
-
-        if item_type == "title":
-            style_name = args.get("#style", "defaultTitleStyle")
-            level = args.get("#level", 1)
-            title_text = " ".join(content)  # Join content for title
-            add_paragraph(f"<b>{title_text}</b>", style_name)
-        
-        elif item_type == "section":
-            style_name = args.get("#style", "defaulSectiontStyle")
-            section_content = []
-
-            for section_item in content:
-                if isinstance(section_item, str):  # Plain text
-                    section_content.append(section_item)
-                elif isinstance(section_item, dict):  # Styled text
-                    nested_instr = section_item.get("instruction")
-                    nested_content = section_item.get("content", {})
-                    for key, value in nested_content.items():
-                        if nested_instr == "$bold":
-                            section_content.append(f"<b>{value}</b>")
-                        elif nested_instr == "$italic":
-                            section_content.append(f"<i>{value}</i>")
-                        elif nested_instr == "$underlined":
-                            section_content.append(f"<u>{value}</u>")
-
-            # Add full section text with applied styles
-            add_paragraph(" ".join(section_content), style_name)
+# Words whose width is kept per font and size by PlainParagraph (the widths of a font are dropped beyond)
+max_cached_words = 100000
+
+
+@functools.lru_cache(maxsize=1024)
+def paragraph_style(definition):
+    """ParagraphStyle of a style definition, built once (the color is only parsed once)."""
+    style_name, font, font_size, font_color = definition
+    ensure_font(font)  # A font of the font directory may not be registered yet in this process
+    return ParagraphStyle(
+        name=style_name,
+        fontName=font,
+        fontSize=font_size,
+        textColor=colors.HexColor(font_color) if font_color.startswith("#") else colors.toColor(font_color),
+        leading=font_size + 2
+    )
+
+
+def add_style(styles, style):
+    """Add one style of the semantic data to the stylesheet, its style ID being its index."""
+    styles.append(paragraph_style(style_definition(style)))
+
+
+class StylesheetCache:
+    """
+    LRU of ready-made stylesheets keyed by the definitions of their styles. A stylesheet is the
+    tuple of the ParagraphStyle of each style ID of the content items.
+    Documents declaring the same styles (batch, watch and server modes) share one stylesheet.
+    """
+
+    def __init__(self, size=stylesheet_cache_size):
+        self.size = size
+        self.stylesheets = collections.OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, styles_data):
+        key = tuple(style_definition(style) for style in styles_data)
+        with self.lock:
+            styles = self.stylesheets.get(key)
+            if styles is not None:
+                self.stylesheets.move_to_end(key)
+                self.hits += 1
+                return styles
+            self.misses += 1
+
+        # Built outside the lock, two threads may build the same stylesheet
+        styles = tuple(paragraph_style(definition) for definition in key)
+
+        with self.lock:
+            self.stylesheets[key] = styles
+            while len(self.stylesheets) > self.size:
+                self.stylesheets.popitem(last=False)
+        return styles
+
+    def clear(self):
+        with self.lock:
+            self.stylesheets.clear()
+            self.hits = self.misses = 0
+
+
+stylesheet_cache = StylesheetCache()
+
+
+def build_stylesheet(styles_data):
+    """
+    Return the stylesheet of the styles of the semantic data (ParagraphStyle of each style ID).
+    The stylesheet comes from stylesheet_cache and is shared (add_style on a list for a stylesheet
+    that grows).
+    """
+    return stylesheet_cache.get(styles_data)
+
+
+#############################################################################
+#                              Plain paragraphs                             #
+#############################################################################
+
+# Width of the words already measured : (font, size) -> word -> width
+word_width_cache = {}
+
+# Style attributes that must all be off for PlainParagraph to break the lines itself. Some only
+# exist in recent reportlab versions : a style without one of them is broken by Paragraph.
+plain_style_flags = ("endDots", "wordWrap", "shaping", "hyphenationLang", "uriWasteReduce", "embeddedHyphenation")
+
+# Value of a style attribute this reportlab version does not have
+missing = object()
+
+
+def word_widths(font_name, font_size):
+    """Widths of the words already measured in a font and size (word -> width, filled by PlainParagraph)."""
+    widths = word_width_cache.get((font_name, font_size))
+    if widths is None or len(widths) > max_cached_words:
+        widths = word_width_cache[(font_name, font_size)] = {}
+    return widths
+
+
+@functools.lru_cache(maxsize=256)
+def frag_template(style, bold):
+    """Fragment reportlab's markup parser gives for a plain text (bold : in <b>) in the style, its text excepted."""
+    return Paragraph("<b>x</b>" if bold else "x", style).frags[0]
+
+
+def clear_font_caches():
+    """Drop the word widths, fragments and styles built with the previous fonts (see pdfFonts.font_change_callbacks)."""
+    word_width_cache.clear()
+    frag_template.cache_clear()
+    paragraph_style.cache_clear()
+    stylesheet_cache.clear()
+
+
+font_change_callbacks.append(clear_font_caches)
+
+
+def plain_frags(markup, style):
+    """
+    Fragments of a markup that is a plain text, in bold or not (a $section without inline
+    instructions, a $title) : the fragment the markup parser would give, without parsing it.
+    None when the markup has tags or entities (or no text), it is then parsed by Paragraph.
+    """
+    text = rl_paragraph.cleanBlockQuotedText(markup)  # Whitespace cleaned as Paragraph does
+    bold = text.startswith("<b>") and text.endswith("</b>")
+    if bold:
+        text = text[3:-4]
+    if not text.strip() or "<" in text or "&" in text or "\xad" in text:
+        return None
+    return [frag_template(style, bold).clone(text=text, link=[], us_lines=[])]
+
+
+class PlainParagraph(Paragraph):
+    """
+    Paragraph laid out without reportlab's generic machinery when it can be.
+
+    A plain text is given as its fragment (plain_frags) : the markup parser does not run. The
+    lines of a paragraph in one font (a single fragment, no hyphenation, bidi or end dots) are
+    broken as Paragraph.breakLines does, with the width of each word taken from word_widths
+    instead of being measured again. The lines, and so the drawing, are those of Paragraph ;
+    any other paragraph, or a style of a reportlab version without one of plain_style_flags, is
+    broken by Paragraph.breakLines.
+    """
+
+    def breakLines(self, width):
+        style = self.style
+        frags = self.frags
+        if len(frags) != 1 or self.bulletText or hasattr(frags[0], "cbDefn") or hasattr(frags[0], "backColor"):
+            return super().breakLines(width)
+        for flag in plain_style_flags:
+            value = getattr(style, flag, missing)
+            if value is missing or value:
+                return super().breakLines(width)
+
+        f = frags[0]
+        if hasattr(f, "text"):
+            text = rl_paragraph.strip(f.text)
+            if not text or "\xad" in text:
+                return super().breakLines(width)
+            words = rl_paragraph.split(text)
+        elif hasattr(f, "words"):  # Second part of a split paragraph
+            words = f.words
+            if any(type(word) is not str or "\xad" in word for word in words) or not any(map(rl_paragraph.strip, words)):
+                return super().breakLines(width)
+        else:  # Fragment words of a split paragraph with markup
+            return super().breakLines(width)
+
+        maxWidths = list(width) if isinstance(width, (tuple, list)) else [width]
+        maxlineno = len(maxWidths) - 1
+        font_name, font_size = f.fontName, f.fontSize
+        widths = word_widths(font_name, font_size)
+        encoding = self.encoding
+
+        self._width_max = 0
+        self.height = lineno = 0
+        self._splitLongWordCount = self._hyphenations = 0
+
+        spaceWidth = rl_paragraph.stringWidth(" ", font_name, font_size, encoding)
+        dSpaceShrink = style.spaceShrinkage * spaceWidth
+        maxWidth = maxWidths[0]
+        width_max = 0
+        lines = []
+        cLine = []
+        currentWidth = -spaceWidth  # No space before the first word
+
+        for word in words:
+            wordWidth = widths.get(word)
+            if wordWidth is None:
+                wordWidth = widths[word] = rl_paragraph.stringWidth(word, font_name, font_size, encoding)
+            newWidth = currentWidth + spaceWidth + wordWidth
+            limWidth = maxWidth + dSpaceShrink * len(cLine)
+
+            if newWidth <= limWidth or not cLine:
+                if newWidth > limWidth and style.splitLongWords and wordWidth > maxWidths[min(lineno, maxlineno)]:
+                    return super().breakLines(width)  # A word longer than the line is split by Paragraph
+                if word:
+                    cLine.append(word)
+                currentWidth = newWidth
+            else:
+                if style.splitLongWords and wordWidth > maxWidths[min(lineno, maxlineno)]:
+                    return super().breakLines(width)
+                # End of line
+                if currentWidth > width_max:
+                    width_max = currentWidth
+                lines.append((maxWidth - currentWidth, cLine))
+                cLine = [word]
+                currentWidth = wordWidth
+                lineno += 1
+                maxWidth = maxWidths[min(maxlineno, lineno)]
+
+        # The words left on the last line
+        if cLine:
+            if currentWidth > width_max:
+                width_max = currentWidth
+            lines.append((maxWidth - currentWidth, cLine))
+
+        self._width_max = width_max
+        ascent, descent = getAscentDescent(font_name, font_size)
+        return f.clone(kind=0, lines=lines, ascent=ascent, descent=descent, fontSize=font_size)
+
+
+def item_flowables(item, styles, paragraph_class=PlainParagraph):
+    """
+    Return the flowables (paragraph + spacing) of one title or section of the content : its
+    markup and its style ID come from the analysis, nothing is parsed again.
+    paragraph_class -> PlainParagraph (plain texts are not parsed, see plain_frags), Paragraph
+                       or a subclass of them (pdfParallel.PrewrappedParagraph)
+    """
+    style = styles[item["style"]]
+    frags = plain_frags(item["markup"], style) if issubclass(paragraph_class, PlainParagraph) else None
+    if frags is None:
+        return [paragraph_class(item["markup"], style), Spacer(1, 12)]
+    return [paragraph_class(item["markup"], style, frags=frags), Spacer(1, 12)]
+
+
+# Position of the page number -> coordinates of its center (default : bottom center)
+page_number_positions = {
+    "bottom-left": (50, 30),
+    "bottom-right": (A4[0] - 50, 30),
+    "bottom-center": (A4[0] / 2, 30),
+    "top-left": (50, A4[1] - 30),
+    "top-right": (A4[0] - 50, A4[1] - 30),
+    "top-center": (A4[0] / 2, A4[1] - 30),
+}
+
+
+def page_decorator(page_config):
+    """Return the onPage function drawing the page number configured in page_config."""
+    layout = PageNumberLayout(page_config)
+    ensure_font(layout.font)
+    font, font_size, start = layout.font, layout.font_size, layout.start
+    x, y = page_number_positions.get(layout.position, (A4[0] / 2, 30))
 
     # Generate and apply page number
     def add_page_number(canvas_doc, doc):
         canvas_doc.saveState()
-        font = page_config["#pageNumberFont"].strip('"')  # Sanitize font name
-        font_size = int(page_config["#pageNumberFontSize"])
-        position = page_config["#pageNumberPosition"].strip('"')  # Sanitize position
-
         canvas_doc.setFont(font, font_size)
-        
+
         # Only start numbering after the specified page start number
-        page_text = ""
-        if doc.page >= page_number_start:
-            page_text = f"Page {doc.page - (page_number_start - 1)}"
-        else:
-            page_text = ""  # Do not display page number before the start page
-        
-
-        # Determine position
-        if position == "bottom-left":
-            x, y = 50, 30
-        elif position == "bottom-right":
-            x, y = A4[0] - 50, 30
-        elif position == "bottom-center":
-            x, y = A4[0] / 2, 30
-        elif position == "top-left":
-            x, y = 50, A4[1] - 30
-        elif position == "top-right":
-            x, y = A4[0] - 50, A4[1] - 30
-        elif position == "top-center":
-            x, y = A4[0] / 2, A4[1] - 30
-        else:
-            x, y = A4[0] / 2, 30  # Default to bottom center if no match
-
-        if page_text:  # Only print page number if the text is not empty
-            canvas_doc.drawCentredString(x, y, page_text)
+        if doc.page >= start:
+            canvas_doc.drawCentredString(x, y, f"Page {doc.page - (start - 1)}")
         canvas_doc.restoreState()
 
+    return add_page_number
+
+
+class FlowableStream(list):
+    """
+    List of flowables refilled from an iterable whenever it runs empty.
+
+    reportlab's build loop consumes its story from the front (flowables[0], del flowables[0])
+    while len(flowables) is not zero. Given a FlowableStream, it pulls the flowables from a
+    generator as it lays them out : only the flowables of the pages being laid out are alive.
+    The iterable yields lists of flowables (one list per content item).
+    """
+
+    def __init__(self, iterable):
+        super().__init__()
+        self.source = iter(iterable)
+
+    def __len__(self):
+        while not list.__len__(self):
+            flowables = next(self.source, None)
+            if flowables is None:
+                return 0
+            self.extend(flowables)
+        return list.__len__(self)
+
+
+class CompactCanvas(Canvas):
+    """
+    Canvas encoding each page as soon as it is finished.
+
+    reportlab keeps the drawing operators of every page as text until the whole file is written
+    at the end of the build. Here the content stream of a finished page is compressed right
+    away (the encoding reportlab applies when it writes the file, the PDF is the same) and the
+    text is dropped : a finished page only costs its compressed bytes.
+    """
+
+    def showPage(self):
+        super().showPage()
+        encode_page_stream(self._doc.Pages.pages[-1])
+
+
+def encode_page_stream(page):
+    """Replace the text of the content stream of a compressed page by its encoded stream (see PDFPage.check_format)."""
+    if page.Contents or not page.stream or not page.compression:
+        return
+
+    filters = [pdfdoc.PDFBase85Encode, pdfdoc.PDFZCompress] if rl_config.useA85 else [pdfdoc.PDFZCompress]
+    content = page.stream
+    for encoding in reversed(filters):
+        content = encoding.encode(content)
+
+    # With its Filter entry set, the stream is written as it is
+    stream = pdfdoc.PDFStream(content=content)
+    stream.dictionary["Filter"] = pdfdoc.PDFArray([pdfdoc.PDFName(encoding.pdfname) for encoding in filters])
+    stream.__Comment__ = "page stream"
+    page.Contents = stream
+    page.stream = None
+
+
+def build_document(story, page_config, filename, invariant=False, document_class=SimpleDocTemplate, low_memory=False):
+    """
+    Lay out the flowables of the story and write the PDF.
+    filename -> path or binary file object (io.BytesIO, sys.stdout.buffer, ...) the PDF is written to
+    invariant -> reproducible output (no creation date / random document id), two builds
+                 of the same story give byte-identical files
+    document_class -> SimpleDocTemplate or a subclass of it (pdfProfile times the layout of each flowable)
+    low_memory -> the finished pages are compressed at once (CompactCanvas), same PDF
+    """
+    # Setup the PDF document
+    doc = document_class(filename, pagesize=A4, invariant=1 if invariant else 0)
+    add_page_number = page_decorator(page_config)
+
     # Build the PDF
-    doc.build(story, onFirstPage=add_page_number, onLaterPages=add_page_number)
+    canvas_class = CompactCanvas if low_memory else Canvas
+    doc.build(story, onFirstPage=add_page_number, onLaterPages=add_page_number, canvasmaker=canvas_class)
+
+
+def create_pdf(semantic_data, filename=None, invariant=False, low_memory=False, document_class=SimpleDocTemplate):
+    """
+    Generate the PDF of the analysed data.
+
+    filename -> path or binary file object the PDF is written to,
+                None : the PDF is rendered in memory and returned as bytes
+
+    low_memory -> the flowables of a content item are only built when the layout reaches it and
+                  dropped once laid out, the finished pages are kept compressed (CompactCanvas).
+                  The memory used by the layout no longer grows with the number of items. The
+                  PDF is the same.
+
+    document_class -> SimpleDocTemplate or a subclass of it (see build_document)
+    """
+    # Get data
+    styles_data = semantic_data["Styles"]
+    page_config = semantic_data["PageNumberConfig"]
+    content_data = semantic_data["Content"]
+
+    styles = build_stylesheet(styles_data)
+
+    # Render content based on structure
+    if low_memory:
+        story = FlowableStream(item_flowables(item, styles) for item in content_data)
+    else:
+        story = []
+        for item in content_data:
+            story.extend(item_flowables(item, styles))
+
+    output = io.BytesIO() if filename is None else filename
+    build_document(story, page_config, output, invariant, document_class, low_memory)
+    if filename is None:
+        return output.getvalue()
+
+
+def create_pdf_stream(semantic_state, content_items, filename=None, invariant=False):
+    """
+    Generate the PDF while the content items are produced (pipeline with the streaming front end).
+
+    semantic_state -> object giving the declarations read so far (a SemanticAnalyzer) :
+                      its styles list may grow and its page number configuration be set while
+                      content_items is consumed, both are read when they are needed
+    content_items -> iterable of analysed content items, consumed lazily
+    filename -> path or binary file object, None : the PDF is returned as bytes
+    The finished pages are kept compressed (CompactCanvas).
+    """
+    # The stylesheet grows with the styles declared in the stream : not a shared one
+    styles = []
+
+    def flowables():
+        for item in content_items:
+            # Styles declared since the previous item
+            while len(styles) < len(semantic_state.styles):
+                add_style(styles, semantic_state.styles[len(styles)])
+            yield item_flowables(item, styles)
+
+    # The page number configuration is read on every page : it is known once the first item is
+    # read, and only lowered again when it changed
+    decorator = {}
+
+    def add_page_number(canvas_doc, doc):
+        page_config = semantic_state.page_number_config()
+        if decorator.get("config") is not page_config:
+            decorator["config"], decorator["draw"] = page_config, page_decorator(page_config)
+        decorator["draw"](canvas_doc, doc)
 
+    output = io.BytesIO() if filename is None else filename
+    doc = SimpleDocTemplate(output, pagesize=A4, invariant=1 if invariant else 0)
+    doc.build(FlowableStream(flowables()), onFirstPage=add_page_number, onLaterPages=add_page_number, canvasmaker=CompactCanvas)
+    if filename is None:
+        return output.getvalue()
@@ -0,0 +1,356 @@
+"""
+Module:
+3250.1 Compilateurs
+Auteur:
+WICKI Sélien
+Date: 18.10.2026
+"""
+
+# System imports
+import io
+import os
+import pickle
+import hashlib
+import contextlib
+from concurrent.futures import ProcessPoolExecutor
+
+from pdfAst import InstructionKind
+from default import include_arguments
+
+# Default location of the on-disk parse cache of the included files
+default_cache_dir = os.path.join(".pdfy_cache", "include")
+
+# Bumped when the format of the cached entries changes
+cache_format = 1
+
+# Source files of the parse : the cached parse of a file is only used by the same lexer and parser
+parser_modules = ("pdfLexer.py", "pdfParser.py", "pdfAst.py")
+
+# The files to parse at one depth of the include graph are parsed by worker processes when there
+# are at least this many of them and this many bytes (starting workers costs more than small parses)
+parallel_min_files = 4
+parallel_min_size = 256 * 1024
+
+
+class IncludedFile:
+    """
+    Parse of an included file : the state of the file when it was read (modification time, size,
+    hash of its contents), its instructions (None on a syntax error) and the messages printed by
+    the lexer and the parser.
+    """
+    __slots__ = ("mtime", "size", "digest", "instructions", "messages")
+
+    def __init__(self, mtime, size, digest, instructions, messages):
+        self.mtime = mtime
+        self.size = size
+        self.digest = digest
+        self.instructions = instructions
+        self.messages = messages
+
+
+class Resolution:
+    """
+    Document with its $include instructions resolved (see IncludeResolver.resolve).
+
+    instructions -> top-level instructions, those of the included files in place of the $include
+    files -> real path of the file of each instruction (None : a document without file), None when
+             the document includes nothing
+    errors -> error messages of the inclusion (arguments, missing files, syntax errors, cycles)
+    error_origins -> (file, line) of the $include of each error
+    messages -> (file, message) printed by the lexer and the parser of the included files
+    graph -> including file -> the files it includes, in order
+    dependencies -> included file -> hash of its contents (None : missing file)
+    """
+    __slots__ = ("instructions", "files", "errors", "error_origins", "messages", "graph", "dependencies")
+
+    def __init__(self, instructions, files=None, errors=None, error_origins=None, messages=None, graph=None,
+                 dependencies=None):
+        self.instructions = instructions
+        self.files = files
+        self.errors = errors or []
+        self.error_origins = error_origins or []
+        self.messages = messages or []
+        self.graph = graph or {}
+        self.dependencies = dependencies or {}
+
+
+def display_name(path):
+    """Path of a file as shown in the messages (relative to the current directory)."""
+    relative = os.path.relpath(path)
+    return path if relative.startswith("..") else relative
+
+
+def parse_source(compiler, data):
+    """(instructions or None, messages printed by the lexer and the parser) of the contents of a file."""
+    with contextlib.redirect_stdout(io.StringIO()) as output:
+        instructions = compiler.parse(data.decode("utf-8"))
+    return instructions or None, output.getvalue().splitlines()
+
+
+#############################################################################
+#                                   Workers                                 #
+#############################################################################
+
+# Set once per worker process by init_worker, reused for every file of the worker
+_worker_compiler = None
+
+
+def init_worker(lexer_backend):
+    global _worker_compiler
+    from pdfCompiler import Compiler
+    _worker_compiler = Compiler(lexer_backend=lexer_backend)
+
+
+def parse_job(data):
+    return parse_source(_worker_compiler, data)
+
+
+#############################################################################
+#                                   Resolver                                #
+#############################################################################
+
+class IncludeResolver:
+    """
+    Resolution of the $include(#file="...") instructions of a document.
+
+    The include graph is read one depth at a time from the document : the new files of a depth
+    are parsed (in worker processes when there are many, see parallel_min_files), then the files
+    they include form the next depth. Every file is parsed once per build, whatever the number of
+    $include naming it. The instructions are then expanded depth first, an $include of a file
+    that is being expanded (a cycle) is an error and is skipped.
+
+    The parse of every file is kept, in memory and on disk (cache_dir, persist=False : memory
+    only), with the modification time, size and hash of the file : a file whose modification
+    time and size did not change is not read again, a file whose contents did not change is not
+    parsed again. Changing one chapter of a manual parses only that chapter.
+
+    A path is relative to the directory of the file containing the $include (the base directory
+    for the document itself).
+    """
+
+    def __init__(self, compiler, cache_dir=default_cache_dir, persist=True, workers=None):
+        self.compiler = compiler
+        self.cache_dir = cache_dir
+        self.persist = persist
+        self.workers = workers or os.cpu_count()
+        self.files = {}  # Real path -> IncludedFile
+
+        # Statistics of the last resolution : files parsed, and taken from the cache
+        self.stats = {"parsed": 0, "reused": 0}
+
+    #############################################################################
+    #                                   Cache                                   #
+    #############################################################################
+
+    def cache_file(self, path):
+        name = hashlib.sha256(path.encode("utf-8")).hexdigest()[:32]
+        return os.path.join(self.cache_dir, name + ".pickle")
+
+    def cached(self, path):
+        """Last parse of the file, from memory or from the disk, None if it was never parsed."""
+        included = self.files.get(path)
+        if included is not None or not self.persist:
+            return included
+
+        from pdfOutputCache import file_hash
+        try:
+            with open(self.cache_file(path), 'rb') as f:
+                entry = pickle.load(f)
+            if entry.get("format") == cache_format and entry.get("parser") == file_hash(parser_modules) and entry.get("path") == path:
+                included = entry["file"]
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError, KeyError, TypeError):
+            included = None  # Missing or unusable entry : parsed again and rewritten
+        if included is not None:
+            self.files[path] = included
+        return included
+
+    def save(self, path, included):
+        """Keep the parse in memory and write it atomically (temporary file + rename)."""
+        self.files[path] = included
+        if not self.persist:
+            return
+
+        from pdfOutputCache import file_hash
+        cache_file = self.cache_file(path)
+        entry = {"format": cache_format, "parser": file_hash(parser_modules), "path": path, "file": included}
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            temporary = f"{cache_file}.{os.getpid()}.tmp"
+            with open(temporary, 'wb') as f:
+                pickle.dump(entry, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temporary, cache_file)
+        except (OSError, pickle.PicklingError):
+            pass  # The cache is only an optimisation
+
+    def digest(self, path):
+        """Hash of the contents of a file (taken from the cache when the file did not change), None if it cannot be read."""
+        try:
+            stat = os.stat(path)
+            included = self.cached(path)
+            if included is not None and (included.mtime, included.size) == (stat.st_mtime_ns, stat.st_size):
+                return included.digest
+            with open(path, 'rb') as f:
+                return hashlib.sha256(f.read()).hexdigest()
+        except OSError:
+            return None
+
+    def changed(self, dependencies):
+        """True when an included file changed since its hash was taken (dependencies of a Resolution)."""
+        return any(self.digest(path) != digest for path, digest in dependencies.items())
+
+    #############################################################################
+    #                                   Parse                                   #
+    #############################################################################
+
+    def parse_files(self, paths):
+        """IncludedFile of each path (None when it cannot be read), only the changed files are parsed."""
+        results = {}
+        pending = []  # (path, stat, data, digest) of the files to parse
+
+        for path in paths:
+            try:
+                stat = os.stat(path)
+                included = self.cached(path)
+                if included is not None and (included.mtime, included.size) == (stat.st_mtime_ns, stat.st_size):
+                    results[path] = included
+                    self.stats["reused"] += 1
+                    continue
+                with open(path, 'rb') as f:
+                    data = f.read()
+            except OSError:
+                results[path] = None
+                continue
+
+            digest = hashlib.sha256(data).hexdigest()
+            if included is not None and included.digest == digest:  # Touched, not changed
+                included.mtime, included.size = stat.st_mtime_ns, stat.st_size
+                self.save(path, included)
+                results[path] = included
+                self.stats["reused"] += 1
+                continue
+            pending.append((path, stat, data, digest))
+
+        contents = [data for _, _, data, _ in pending]
+        if self.workers > 1 and len(pending) >= parallel_min_files and sum(map(len, contents)) >= parallel_min_size:
+            with ProcessPoolExecutor(max_workers=min(self.workers, len(pending)), initializer=init_worker,
+                                     initargs=(self.compiler.lexer_backend,)) as executor:
+                parses = list(executor.map(parse_job, contents))
+        else:
+            parses = [parse_source(self.compiler, data) for data in contents]
+
+        for (path, stat, _, digest), (instructions, messages) in zip(pending, parses):
+            included = IncludedFile(stat.st_mtime_ns, stat.st_size, digest, instructions, messages)
+            self.save(path, included)
+            results[path] = included
+            self.stats["parsed"] += 1
+
+        return results
+
+    #############################################################################
+    #                                  Resolve                                  #
+    #############################################################################
+
+    def include_path(self, instruction, directory):
+        """(real path of the file of an $include instruction, None) or (None, error message) when its arguments are wrong."""
+        arguments = instruction.argument_dict()
+        if not arguments.keys() <= include_arguments:
+            return None, f"Error: $include instruction does not allow the arguments {arguments}."
+        if "#file" not in arguments:
+            return None, "Error: $include instruction is missing the mandatory #file argument."
+        return os.path.realpath(os.path.join(directory, arguments["#file"].strip('"'))), None
+
+    def resolve(self, parsed_data, source_file=None, base_dir=None):
+        """
+        Resolution (see Resolution) of the $include instructions of a parsed document.
+        source_file -> file of the document (its directory is the base directory, and an
+                       $include of it is a cycle), base_dir -> base directory without a file
+        """
+        if not any(instruction.kind is InstructionKind.INCLUDE for instruction in parsed_data):
+            return Resolution(parsed_data)
+
+        self.stats = {"parsed": 0, "reused": 0}
+        root = os.path.realpath(source_file) if source_file else None
+        directory = os.path.dirname(root) if root else os.path.abspath(base_dir or os.curdir)
+
+        errors = []
+        error_origins = []
+
+        def error(message, file, instruction):
+            errors.append(message)
+            error_origins.append((file, instruction.line))
+
+        paths = {}  # id of an $include instruction -> real path of its file
+        graph = {}
+        parsed = {root: parsed_data}
+        first_include = {}  # Included file -> (file, $include instruction) naming it first
+        reported = set()
+
+        # Include graph, one depth at a time
+        level = [(root, directory)]
+        while level:
+            new_files = []
+            for file, file_directory in level:
+                graph[file] = []
+                for instruction in parsed[file]:
+                    if instruction.kind is not InstructionKind.INCLUDE:
+                        continue
+                    path, message = self.include_path(instruction, file_directory)
+                    if path is None:
+                        error(message, file, instruction)
+                        continue
+                    paths[id(instruction)] = path
+                    graph[file].append(path)
+                    if path not in parsed and path not in new_files:
+                        new_files.append(path)
+                        first_include[path] = (file, instruction)
+
+            level = []
+            for path, included in self.parse_files(new_files).items():
+                parsed[path] = None
+                if included is None:
+                    error(f"Error: The included file {display_name(path)} does not exist or cannot be read.", *first_include[path])
+                elif included.instructions is None:
+                    error(f"Error: Syntax error, the included file {display_name(path)} could not be parsed.", *first_include[path])
+                else:
+                    parsed[path] = included.instructions
+                    level.append((path, os.path.dirname(path)))
+
+        # Expansion, depth first : the files being expanded form the include chain of a cycle
+        instructions = []
+        files = []
+        chain = [root]
+
+        def expand(file):
+            for instruction in parsed[file]:
+                if instruction.kind is not InstructionKind.INCLUDE:
+                    instructions.append(instruction)
+                    files.append(file)
+                    continue
+                path = paths.get(id(instruction))
+                if path is None or parsed.get(path) is None:
+                    continue  # Error already reported
+                if path in chain:
+                    cycle = chain[chain.index(path):] + [path]
+                    message = f"Error: $include cycle: {' -> '.join(display_name(item) for item in cycle)}."
+                    if message not in reported:
+                        reported.add(message)
+                        error(message, file, instruction)
+                    continue
+                chain.append(path)
+                expand(path)
+                chain.pop()
+
+        expand(root)
+
+        # Every file named by an $include, a missing one too (None) : creating it changes the document
+        messages = []
+        dependencies = {}
+        for path in parsed:
+            if path is None or path == root:
+                continue
+            included = self.files.get(path)
+            if included is not None:
+                messages.extend((path, message) for message in included.messages)
+            dependencies[path] = included.digest if included is not None else None
+
+        return Resolution(instructions, files, errors, error_origins, messages, graph, dependencies)
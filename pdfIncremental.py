@@ -0,0 +1,309 @@
+"""
+Module:
+3250.1 Compilateurs
+Auteur:
+WICKI Sélien
+Date: 18.10.2026
+"""
+
+# System imports
+import io
+import os
+import contextlib
+import json
+import pickle
+import hashlib
+
+from pdfCompiler import Compiler, parser_errors, syntax_errors
+from pdfSemantic import SemanticAnalyzer, numberize_doc_titles, style_definition
+from pdfFonts import font_file_hash
+from pdfAst import InstructionKind, Node, shift_lines
+from pdfStream import iter_instruction_sources
+
+# Default location of the on-disk cache
+default_cache_dir = ".pdfy_cache"
+
+# Bumped when the format of the cached entries changes
+cache_format = 4
+
+# Top-level instructions that change the analysis of the instructions after them
+declaration_instructions = frozenset([InstructionKind.STYLE, InstructionKind.PAGE_NUMBER, InstructionKind.NUMBERIZE_TITLE])
+
+
+def hashable_data(value):
+    """JSON version of the nodes of the syntax tree, without their spans (moving an instruction keeps its hash)."""
+    if isinstance(value, Node):
+        return value.to_data()
+    return repr(value)
+
+
+def content_hash(*parts):
+    """Hash of JSON serializable parts (parsed instructions, analysed items, ...)."""
+    data = json.dumps(parts, sort_keys=True, ensure_ascii=False, default=hashable_data)
+    return hashlib.sha256(data.encode("utf-8")).hexdigest()
+
+
+class IncrementalCompiler:
+    """
+    Compiler reusing the results of the previous compilation of the same document.
+
+    Every top-level instruction gets a content hash, combined with the hash of the declarations
+    ($style, $pageNumber, $numberizeTitle) written before it, since those decide how it is analysed.
+    The cache of a document stores, per hash :
+    - the semantic result of the instruction (analysed item, errors and warnings)
+    - the flowables built for the analysed item (keyed by the item, the style it uses, the
+      contents of the font file of the style, for a font of the font directory, and the version
+      of reportlab)
+    Only the changed instructions are analysed again and only their flowables are rebuilt.
+
+    The PDF is built with the invariant setting of the compiler, as Compiler.render does : with
+    Compiler(invariant=True), an incremental build is byte-identical to a full build of the same
+    source.
+
+    The page layout itself still runs over the whole story : reportlab cannot resume a document
+    template in the middle of a document, so the pages before the first change are laid out again
+    (from the cached flowables, without parsing their markup again).
+    """
+
+    def __init__(self, cache_dir=default_cache_dir, compiler=None, persist=True, reuse_parse=False):
+        self.cache_dir = cache_dir
+        self.compiler = compiler if compiler is not None else Compiler()
+
+        # The cache of the last compilation of each output file stays in memory : a long-running
+        # process (watch mode) does not load it again. persist=False never writes it to disk.
+        self.persist = persist
+        self.memory_caches = {}
+
+        # reuse_parse=True : the top-level instructions unchanged since the previous compilation are
+        # not parsed again (see parse). Only worth it in a long-running process : the first parse is
+        # a little slower than a parse of the whole source.
+        self.reuse_parse = reuse_parse
+        self.parse_cache = {}  # (indentation, source) of a top-level instruction -> (instructions, first line)
+
+        # Statistics of the last compilation
+        self.stats = {}
+
+        # Files included by the last compiled document (see pdfInclude)
+        self.included_files = []
+
+    #############################################################################
+    #                                   Cache                                   #
+    #############################################################################
+
+    def cache_file(self, output_file):
+        """One cache file per document, named after the output file."""
+        name = hashlib.sha256(os.path.abspath(output_file).encode("utf-8")).hexdigest()[:32]
+        return os.path.join(self.cache_dir, "incremental", name + ".pickle")
+
+    def load_cache(self, output_file):
+        if output_file in self.memory_caches:
+            return self.memory_caches[output_file]
+        try:
+            with open(self.cache_file(output_file), 'rb') as f:
+                cache = pickle.load(f)
+            if cache.get("format") == cache_format:
+                return cache
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+            pass
+        return {"format": cache_format, "semantic": {}, "flowables": {}}
+
+    def save_cache(self, output_file, cache):
+        """Keep the cache in memory and write it atomically (temporary file + rename)."""
+        self.memory_caches[output_file] = cache
+        if not self.persist:
+            return
+        path = self.cache_file(output_file)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temporary = f"{path}.{os.getpid()}.tmp"
+        with open(temporary, 'wb') as f:
+            pickle.dump(cache, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temporary, path)
+
+    #############################################################################
+    #                                    Parse                                  #
+    #############################################################################
+
+    def parse(self, input_string):
+        """
+        Parse the source, reusing the parse of the top-level instructions unchanged since the
+        previous parse (moved instructions get their lines shifted). Same result as Compiler.parse :
+        a source with a syntax error is parsed again as a whole.
+        """
+        if not self.reuse_parse:
+            return self.compiler.parse(input_string)
+
+        parse_cache = {}
+        parsed_data = []
+        position = 0
+
+        # The messages of the lexer are only printed once the source is known to parse
+        with contextlib.redirect_stdout(io.StringIO()) as messages:
+            for source, first_line in iter_instruction_sources(io.StringIO(input_string)):
+                start = input_string.index(source, position)
+                position = start + len(source)
+                # Parsed after as many spaces as there are characters before it on its line : same columns
+                indentation = start - input_string.rfind("\n", 0, start) - 1
+                key = (indentation, source)
+
+                cached = self.parse_cache.get(key)
+                if cached is None or key in parse_cache:  # New, or a second copy in the document
+                    instructions = self.compiler.parse(" " * indentation + source, first_line)
+                    if not instructions:
+                        parsed_data = None
+                        break
+                else:
+                    instructions, line = cached
+                    if line != first_line:
+                        shift_lines(instructions, first_line - line)
+
+                parse_cache[key] = (instructions, first_line)
+                parsed_data.extend(instructions)
+
+        if parsed_data is None:
+            self.parse_cache = {}
+            return self.compiler.parse(input_string)
+
+        print(messages.getvalue(), end="")
+        self.parse_cache = parse_cache
+        return parsed_data
+
+    #############################################################################
+    #                                   Semantic                                #
+    #############################################################################
+
+    def analyze(self, parsed_data, cache, new_cache):
+        """
+        Semantic analysis reusing the cached result of the unchanged instructions.
+        Returns the same values as semantical_analysis.
+
+        One SemanticAnalyzer runs over the declarations in order : it holds the context of the
+        instructions after them. Only $style, $pageNumber and $numberizeTitle change this context,
+        a changed instruction is analysed in it (analyze_instruction) and only adds its item and
+        its messages : the analysis costs the declarations plus the changed instructions.
+        """
+        analyzer = SemanticAnalyzer()
+        declarations_key = content_hash()
+        doc_content = []
+
+        for instruction in parsed_data:
+            if instruction.kind in declaration_instructions:
+                analyzer.analyze_instruction(instruction)
+                declarations_key = content_hash(declarations_key, instruction)
+                continue
+
+            key = content_hash(declarations_key, instruction)
+            entry = cache["semantic"].get(key)
+
+            if entry is None:
+                self.stats["analysed"] += 1
+                errors_start, warnings_start = len(analyzer.error_messages), len(analyzer.warning_messages)
+                item = analyzer.analyze_instruction(instruction)
+                # The items are stored pickled : loading them gives a fresh copy faster than a deepcopy
+                items = pickle.dumps([item] if item is not None else [], protocol=pickle.HIGHEST_PROTOCOL)
+                entry = (items, analyzer.error_messages[errors_start:], analyzer.warning_messages[warnings_start:])
+            else:
+                self.stats["reused"] += 1
+                _, errors, warnings = entry
+                analyzer.error_messages.extend(errors)
+                analyzer.warning_messages.extend(warnings)
+
+            new_cache["semantic"][key] = entry
+            doc_content.extend(pickle.loads(entry[0]))
+
+        if analyzer.is_title_numberized:
+            numberize_doc_titles(doc_content, analyzer.numberize_titles)
+
+        return (analyzer.styles, analyzer.page_number_config(), analyzer.numberize_titles, doc_content,
+                analyzer.error_messages, analyzer.warning_messages)
+
+    #############################################################################
+    #                                   Layout                                  #
+    #############################################################################
+
+    def build_story(self, styles_data, doc_content, cache, new_cache):
+        """
+        Story of the document, reusing the cached flowables of the unchanged items.
+        The paragraphs are cached with their lines broken for the frame width (see PrewrappedParagraph) :
+        the layout of an unchanged paragraph does not measure its words again.
+        """
+        from reportlab import Version as reportlab_version
+        from pdfGenerator import build_stylesheet, item_flowables
+        from pdfParallel import PrewrappedParagraph, frame_width
+
+        styles = None
+        width = None
+        # By style ID : a new version of the font file of a style changes the widths of its words,
+        # another version of reportlab the flowables themselves
+        style_keys = [content_hash(style, font_file_hash(style_definition(style)[1]), reportlab_version) for style in styles_data]
+        story = []
+
+        for item in doc_content:
+            key = content_hash(item, style_keys[item["style"]])
+            flowables = cache["flowables"].get(key)
+
+            if flowables is None:
+                self.stats["built"] += 1
+                if styles is None:
+                    styles = build_stylesheet(styles_data)
+                    width = frame_width()
+                item_list = item_flowables(item, styles, paragraph_class=PrewrappedParagraph)
+                for flowable in item_list:
+                    if isinstance(flowable, PrewrappedParagraph):
+                        flowable.prewrap(width)
+                flowables = pickle.dumps(item_list, protocol=pickle.HIGHEST_PROTOCOL)
+            else:
+                self.stats["flowables_reused"] += 1
+
+            new_cache["flowables"][key] = flowables
+            # Unpickled for every build : reportlab modifies the flowables while laying them out
+            story.extend(pickle.loads(flowables))
+
+        return story
+
+    #############################################################################
+    #                                   Compile                                 #
+    #############################################################################
+
+    def compile(self, input_string, output_file, source_file=None):
+        """
+        Compile the source to output_file, reusing what did not change since the previous
+        compilation of output_file. source_file is the file of the source (directory of its
+        $include paths). Returns the (error_messages, warning_messages).
+        """
+        from pdfGenerator import build_document
+
+        self.stats = {"analysed": 0, "reused": 0, "built": 0, "flowables_reused": 0}
+
+        # The messages of the lexer and the parser are errors too (see pdfCompiler.parser_errors)
+        with contextlib.redirect_stdout(io.StringIO()) as parser_output:
+            parsed_data = self.parse(input_string)
+            # The included files are parsed again only when they changed (parse cache of the resolver)
+            resolution = self.compiler.resolve_includes(parsed_data, source_file) if parsed_data else None
+        print(parser_output.getvalue(), end="")
+        if resolution is None:
+            return syntax_errors(parser_output.getvalue()), []
+        self.included_files = list(resolution.dependencies)
+
+        cache = self.load_cache(output_file)
+        # Only the entries of the current version are kept : the cache does not grow with the edits
+        new_cache = {"format": cache_format, "semantic": {}, "flowables": {}}
+
+        styles, page_number, _, doc_content, error_messages, warning_messages = self.analyze(resolution.instructions, cache, new_cache)
+        error_messages = resolution.errors + error_messages
+
+        if self.compiler.print_errors:
+            for message in error_messages + warning_messages:
+                print()
+                print(message)
+                print()
+        # Already printed by the lexer and the parser
+        error_messages = parser_errors(parser_output.getvalue()) + error_messages
+
+        if error_messages and self.compiler.strict:
+            return error_messages, warning_messages
+
+        story = self.build_story(styles, doc_content, cache, new_cache)
+        build_document(story, page_number, output_file, invariant=self.compiler.invariant)
+
+        self.save_cache(output_file, new_cache)
+        return error_messages, warning_messages
@@ -0,0 +1,202 @@
+"""
+Module:
+3250.1 Compilateurs
+Auteur:
+WICKI Sélien
+Date: 18.10.2026
+"""
+
+# System imports
+import os
+import gc
+import json
+import zlib
+import struct
+import pickle
+import hashlib
+
+# The version of the compiler and of its environment, shared with the output cache (nothing imports reportlab)
+from pdfOutputCache import file_hash, reportlab_version, font_dir_state, normalize_source
+
+# Default location of the IR cache and its default maximum size (bytes)
+default_cache_dir = os.path.join(".pdfy_cache", "ir")
+default_max_size = 64 * 1024 * 1024
+
+# Bumped when the format of the cached entries changes
+cache_format = 2
+
+# Source files of the front end (lexer, parser, semantic analysis) : the version of the IR is the hash of their contents
+front_end_modules = ("pdfLexer.py", "pdfParser.py", "pdfAst.py", "pdfSemantic.py", "pdfFonts.py", "pdfInclude.py", "default.py")
+
+# Header of an entry : magic, format, CRC32 and length of the payload (the pickled IR)
+entry_magic = b"PDFYIR"
+entry_header = struct.Struct("<6sHII")
+
+# Errors of a payload that is not a valid entry (truncated, overwritten, written by another version)
+entry_errors = (ValueError, struct.error, pickle.UnpicklingError, EOFError, AttributeError, ImportError,
+                IndexError, KeyError, TypeError)
+
+
+def ir_key(input_string, include_dir=None):
+    """
+    Key of the IR of a source : hash of the normalized source, of the front end version (its
+    source files and default.py), of the reportlab version and of the font directory (the
+    font checks depend on both). include_dir -> directory of the $include paths of the source
+    (the files included are checked by IrCache.load).
+    """
+    parts = {
+        "format": cache_format,
+        "include_dir": include_dir,
+        "front_end": file_hash(front_end_modules),
+        "reportlab": reportlab_version(),
+        "fonts": font_dir_state(),
+    }
+    digest = hashlib.sha256(json.dumps(parts, sort_keys=True).encode("utf-8"))
+    digest.update(normalize_source(input_string).encode("utf-8"))
+    return digest.hexdigest()
+
+
+def unpickle(payload):
+    """
+    Unpickle an IR without the garbage collector : the many nodes created at once would start
+    several collections that find nothing to free.
+    """
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        return pickle.loads(payload)
+    finally:
+        if enabled:
+            gc.enable()
+
+
+class IrCache:
+    """
+    Persistent cache of the analysed IR of the sources : the result of semantical_analysis
+    (styles, page number configuration, title numbering, doc_content, errors and warnings), the
+    messages printed by the lexer and the parser and the hash of the files the source includes.
+    A source rendered again, with other output options or to another file, is not lexed, parsed
+    and analysed again.
+
+    An entry (<key>.ir) is a header (magic, format, CRC32 and length of the payload) followed by
+    the pickled IR, written atomically (temporary file + rename). An entry that is truncated,
+    corrupt or of another format is reported in stats, removed and rebuilt by the compiler. An
+    outdated entry (compiler changed) is never used : the compiler version is part of the key. An
+    entry whose included files changed is outdated too (see load).
+
+    The modification time of an entry is its last use : when the entries take more than max_size
+    bytes, the least recently used ones are removed.
+    """
+
+    def __init__(self, cache_dir=default_cache_dir, max_size=default_max_size):
+        self.cache_dir = cache_dir
+        self.max_size = max_size
+        self.stats = {"hits": 0, "misses": 0, "corrupt": 0, "outdated": 0, "stores": 0, "evictions": 0}
+
+    def entry_file(self, key):
+        return os.path.join(self.cache_dir, key + ".ir")
+
+    #############################################################################
+    #                                  Lookup                                   #
+    #############################################################################
+
+    def load(self, key, changed=None):
+        """
+        IR stored for key (see store), None when it is not cached or its entry is not valid.
+        changed -> function telling if the included files (file -> hash) of an entry changed since
+                   it was stored, such an entry is outdated
+        """
+        path = self.entry_file(key)
+        try:
+            with open(path, 'rb') as f:
+                data = f.read()
+        except OSError:
+            self.stats["misses"] += 1
+            return None
+
+        try:
+            magic, entry_format, checksum, length = entry_header.unpack_from(data)
+            payload = memoryview(data)[entry_header.size:]
+            if magic != entry_magic or entry_format != cache_format:
+                raise ValueError("Not an IR cache entry of this format")
+            if len(payload) != length or zlib.crc32(payload) != checksum:
+                raise ValueError("Corrupt IR cache entry")
+            entry = unpickle(payload)
+            if entry["key"] != key:
+                raise ValueError("IR cache entry of another source")
+        except entry_errors:
+            self.stats["corrupt"] += 1
+            self.stats["misses"] += 1
+            self.remove(key)
+            return None
+
+        try:
+            os.utime(path)  # Used now (LRU)
+        except OSError:
+            pass
+        if entry["dependencies"] and changed is not None and changed(entry["dependencies"]):
+            self.stats["outdated"] += 1
+            self.stats["misses"] += 1
+            return None
+        self.stats["hits"] += 1
+        return entry["ir"]
+
+    def store(self, key, ir, dependencies=None):
+        """Add the IR of a source to the cache, dependencies -> included file -> hash of its contents."""
+        payload = pickle.dumps({"key": key, "ir": ir, "dependencies": dependencies or {}}, protocol=pickle.HIGHEST_PROTOCOL)
+        path = self.entry_file(key)
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            temporary = f"{path}.{os.getpid()}.{id(self)}.tmp"
+            with open(temporary, 'wb') as f:
+                f.write(entry_header.pack(entry_magic, cache_format, zlib.crc32(payload), len(payload)))
+                f.write(payload)
+            os.replace(temporary, path)
+        except OSError:
+            return  # The cache is only an optimisation
+
+        self.stats["stores"] += 1
+        self.evict()
+
+    def remove(self, key):
+        try:
+            os.remove(self.entry_file(key))
+        except OSError:
+            pass
+
+    #############################################################################
+    #                                 Eviction                                  #
+    #############################################################################
+
+    def entries(self):
+        """(last use, size, key) of the entries of the cache."""
+        entries = []
+        try:
+            names = os.listdir(self.cache_dir)
+        except OSError:
+            return entries
+        for name in names:
+            if not name.endswith(".ir"):
+                continue
+            try:
+                stat = os.stat(os.path.join(self.cache_dir, name))
+            except OSError:
+                continue  # Removed by another process
+            entries.append((stat.st_mtime_ns, stat.st_size, name[:-len(".ir")]))
+        return entries
+
+    def evict(self):
+        """Remove the least recently used entries until the cache fits in max_size bytes."""
+        entries = sorted(self.entries())
+        total = sum(size for _, size, _ in entries)
+        for _, size, key in entries:
+            if total <= self.max_size:
+                break
+            self.remove(key)
+            total -= size
+            self.stats["evictions"] += 1
+
+    def clear(self):
+        """Remove every entry of the cache."""
+        for _, _, key in self.entries():
+            self.remove(key)
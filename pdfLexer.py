@@ -6,8 +6,15 @@ WICKI Sélien
 Date: 26.01.2025 
 """
 
+# System imports
+import sys
+import hashlib
+
 import ply.lex as lex
 
+# Name of the precomputed lexer table module (generated by build_tables.py)
+lextab_module = "pdflextab"
+
 # Tokens
 tokens = (
 
@@ -27,6 +34,9 @@ tokens = (
     "TITLE",
     "SECTION", 
 
+    # Token for the inclusion of another source file
+    "INCLUDE",
+
     # Tokens for argument parsing
     "ARG_NAME",
     "ARG_STYLE",
@@ -40,6 +50,7 @@ tokens = (
     "ARG_PAGE_NUMBER_FONT_COLOR",
     "ARG_PAGE_NUMBER_START",
     "ARG_NUMBERIZE_TITLE_START",
+    "ARG_FILE",
 
     # Tokens for argument values
     "NUMBER",
@@ -109,6 +120,10 @@ def t_UNDERLINED(t):
     r"\$underlined"
     return t
 
+def t_INCLUDE(t):
+    r"\$include"
+    return t
+
 # Rules for argument tokens
 def t_arg_ARG_NAME(t):
     r"\#name"
@@ -158,6 +173,10 @@ def t_arg_ARG_NUMBERIZE_TITLE_START(t):
     r"\#numberizeTitleStart"
     return t
 
+def t_arg_ARG_FILE(t):
+    r"\#file"
+    return t
+
 def t_arg_STRING(t):
     r'"[^"]*"'  # Matches anything between double quotes
     return t
@@ -177,6 +196,7 @@ def t_arg_EQUALS(t):
 # Rule for  content
 def t_TEXT(t):
     r"[a-zA-Z0-9\s\.\,\!\?\-\é\è\ê\ë\à\ç\â\ä\î\ï\ô\ö\ù\û\ü\'\;\_]+"    
+    t.lexer.lineno += t.value.count("\n")  # Text can span several lines
     return t
 
 # State handler
@@ -200,9 +220,41 @@ def t_RBRACE(t):
 
 # Error handling rule
 def t_error(t):
-    print(f"Illegal character '{t.value[0]}'")
+    print(f"Illegal character '{t.value[0]}' (line {t.lexer.lineno})")
     t.lexer.skip(1)
 
 
+def lexer_signature():
+    """
+    Signature of the lexer specification (tokens, states and the regex of every rule).
+    Stored in the precomputed table, a change of any rule makes the table out of date.
+    """
+    module_dict = globals()
+    rules = []
+    for name in sorted(module_dict):
+        if name.startswith("t_"):
+            rule = module_dict[name]
+            rules.append(f"{name}:{rule.__doc__ if callable(rule) else rule}")
+
+    specification = "\n".join([repr(tokens), repr(states)] + rules)
+    return hashlib.md5(specification.encode("utf-8")).hexdigest()
+
+
+def build_lexer():
+    """
+    Build the lexer from the precomputed table when it matches the current rules
+    (no validation and no regex assembly), otherwise build it from the rules.
+    Nothing is ever written to disk here : the table is generated by build_tables.py.
+    """
+    this_module = sys.modules[__name__]
+    try:
+        table = __import__(lextab_module)
+        if getattr(table, "_lexsignature", None) == lexer_signature():
+            return lex.lex(module=this_module, optimize=1, lextab=lextab_module)
+    except ImportError:
+        pass
+    return lex.lex(module=this_module)
+
+
 # Build the lexer
-lexer = lex.lex()
\ No newline at end of file
+lexer = build_lexer()
\ No newline at end of file
@@ -0,0 +1,297 @@
+"""
+Module:
+3250.1 Compilateurs
+Auteur:
+WICKI Sélien
+Date: 18.10.2026
+"""
+
+# System imports
+import os
+import json
+import shutil
+import struct
+import hashlib
+import functools
+import importlib.metadata
+
+try:
+    import fcntl  # Lock of the counters file, not available on Windows
+except ImportError:
+    fcntl = None
+
+# Nothing here imports reportlab (nor the modules of the pipeline) : a cache hit only reads files
+
+# Default location of the output cache and its default maximum size (bytes)
+default_cache_dir = os.path.join(".pdfy_cache", "output")
+default_max_size = 256 * 1024 * 1024
+
+# Bumped when the format of the cached entries changes
+cache_format = 1
+
+# Source files of the compiler : the compiler version is the hash of their contents
+compiler_modules = ("pdfLexer.py", "pdfFastLexer.py", "pdfParser.py", "pdfAst.py", "pdfInclude.py", "pdfSemantic.py",
+                    "pdfCompiler.py", "pdfGenerator.py", "pdfParallel.py", "pdfFonts.py")
+defaults_module = "default.py"
+
+# File of the hit and miss counters of every process : two unsigned 64 bits integers
+counters_file = "counters"
+counters_format = struct.Struct("<QQ")
+counter_names = ("hits", "misses")
+
+# Font directory of pdfFonts (the fonts of the directory change the PDF)
+font_dir_variable = "PDFY_FONT_DIR"
+
+
+@functools.lru_cache(maxsize=None)
+def file_hash(file_names):
+    """Hash of the contents of source files of the compiler (read once per process)."""
+    digest = hashlib.sha256()
+    directory = os.path.dirname(os.path.abspath(__file__))
+    for file_name in file_names:
+        with open(os.path.join(directory, file_name), 'rb') as f:
+            digest.update(f.read())
+    return digest.hexdigest()
+
+
+@functools.lru_cache(maxsize=None)
+def reportlab_version():
+    """Version of the installed reportlab, read from its metadata (reportlab itself is not imported)."""
+    try:
+        return importlib.metadata.version("reportlab")
+    except importlib.metadata.PackageNotFoundError:
+        return None
+
+
+def font_dir_state():
+    """Font directory and the name, size and modification time of its files."""
+    font_dir = os.environ.get(font_dir_variable)
+    if not font_dir or not os.path.isdir(font_dir):
+        return None
+    files = sorted((entry.name, entry.stat().st_size, entry.stat().st_mtime_ns) for entry in os.scandir(font_dir) if entry.is_file())
+    return [os.path.abspath(font_dir), files]
+
+
+def normalize_source(input_string):
+    """Source with its line endings normalized and without a byte order mark (same PDF, same key)."""
+    return input_string.lstrip("\ufeff").replace("\r\n", "\n").replace("\r", "\n")
+
+
+def cache_key(input_string, strict=False, invariant=False):
+    """
+    Key of the output of a compilation : hash of the normalized source, of the compiler version
+    (its source files), of the defaults of default.py, of the reportlab version, of the font
+    directory and of the configuration changing the output (strict, invariant).
+    """
+    parts = {
+        "format": cache_format,
+        "compiler": file_hash(compiler_modules),
+        "defaults": file_hash((defaults_module,)),
+        "reportlab": reportlab_version(),
+        "fonts": font_dir_state(),
+        "strict": strict,
+        "invariant": invariant,
+    }
+    digest = hashlib.sha256(json.dumps(parts, sort_keys=True).encode("utf-8"))
+    digest.update(normalize_source(input_string).encode("utf-8"))
+    return digest.hexdigest()
+
+
+def is_path(output):
+    """True for a file name, False for a file object."""
+    return isinstance(output, (str, os.PathLike))
+
+
+def print_messages(error_messages, warning_messages):
+    """Print the messages of a cached compilation as the semantic analysis prints them."""
+    for message in error_messages + warning_messages:
+        print()
+        print(message)
+        print()
+
+
+class OutputCache:
+    """
+    Content-addressed cache of the PDFs of the compilations, shared by the processes using the
+    same directory.
+
+    An entry is the PDF (<key>.pdf) and the messages of its compilation (<key>.json), the key
+    being cache_key of the source. Both files are written atomically (temporary file + rename),
+    the messages last : an entry without them is not complete and is not used. The modification
+    time of the PDF is the last use of the entry : when the entries take more than max_size
+    bytes, the least recently used ones are removed.
+
+    Statistics : stats counts the hits, misses, stores and evictions of this instance, the
+    hits and misses of every process are also counted in the directory, in a file of fixed size
+    (see count and statistics).
+    """
+
+    def __init__(self, cache_dir=default_cache_dir, max_size=default_max_size):
+        self.cache_dir = cache_dir
+        self.max_size = max_size
+        self.stats = {"hits": 0, "misses": 0, "stores": 0, "evictions": 0}
+
+    def entry_files(self, key):
+        path = os.path.join(self.cache_dir, key)
+        return path + ".pdf", path + ".json"
+
+    #############################################################################
+    #                                  Lookup                                   #
+    #############################################################################
+
+    def fetch(self, key, output_file):
+        """
+        Copy the cached PDF of key to output_file (path or binary file object) and return the
+        (error_messages, warning_messages) of its compilation, None when the entry is not cached.
+        """
+        pdf_file, messages_file = self.entry_files(key)
+        data = None
+        try:
+            with open(messages_file, 'r', encoding="utf-8") as f:
+                entry = json.load(f)
+            if entry.get("format") != cache_format:
+                raise ValueError("Old cache entry")
+            if is_path(output_file):
+                shutil.copyfile(pdf_file, output_file)
+            else:
+                # Read whole before writing anything : a file object cannot be written again after a miss
+                with open(pdf_file, 'rb') as f:
+                    data = f.read()
+            os.utime(pdf_file)  # Used now (LRU)
+        except (OSError, ValueError):
+            # Missing, incomplete or evicted meanwhile
+            self.count("misses")
+            return None
+
+        if data is not None:
+            output_file.write(data)
+        self.count("hits")
+        return entry["errors"], entry["warnings"]
+
+    def store(self, key, pdf, error_messages, warning_messages):
+        """Add a PDF (path of the PDF written, or its bytes) and the messages of its compilation to the cache."""
+        pdf_file, messages_file = self.entry_files(key)
+        entry = {"format": cache_format, "errors": error_messages, "warnings": warning_messages}
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            temporary = self.temporary_file(pdf_file)
+            if is_path(pdf):
+                shutil.copyfile(pdf, temporary)
+            else:
+                with open(temporary, 'wb') as f:
+                    f.write(pdf)
+            os.replace(temporary, pdf_file)
+
+            temporary = self.temporary_file(messages_file)
+            with open(temporary, 'w', encoding="utf-8") as f:
+                json.dump(entry, f)
+            os.replace(temporary, messages_file)
+        except OSError:
+            return  # The cache is only an optimisation
+
+        self.stats["stores"] += 1
+        self.evict()
+
+    def temporary_file(self, path):
+        return f"{path}.{os.getpid()}.{id(self)}.tmp"
+
+    #############################################################################
+    #                                 Eviction                                  #
+    #############################################################################
+
+    def entries(self):
+        """(last use, size, key) of the complete entries of the cache."""
+        entries = []
+        try:
+            names = os.listdir(self.cache_dir)
+        except OSError:
+            return entries
+        for name in names:
+            if not name.endswith(".json"):
+                continue
+            key = name[:-len(".json")]
+            pdf_file, messages_file = self.entry_files(key)
+            try:
+                pdf_stat = os.stat(pdf_file)
+                size = pdf_stat.st_size + os.path.getsize(messages_file)
+            except OSError:
+                continue  # Removed by another process
+            entries.append((pdf_stat.st_mtime_ns, size, key))
+        return entries
+
+    def evict(self):
+        """Remove the least recently used entries until the cache fits in max_size bytes."""
+        entries = sorted(self.entries())
+        total = sum(size for _, size, _ in entries)
+        for _, size, key in entries:
+            if total <= self.max_size:
+                break
+            # The messages first : the entry is not complete anymore for the other processes
+            for path in reversed(self.entry_files(key)):
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+            total -= size
+            self.stats["evictions"] += 1
+
+    def clear(self):
+        """Remove every entry and the statistics of the cache."""
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
+
+    #############################################################################
+    #                                Statistics                                 #
+    #############################################################################
+
+    def count(self, name):
+        """
+        Count a hit or a miss, in stats and in the counters file. The file holds the two counters
+        (counters_format) and is updated under an exclusive lock, so that the processes sharing the
+        directory do not lose each other's counts. Without fcntl (Windows), two processes counting
+        at the same time may lose a count.
+        """
+        self.stats[name] += 1
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            fd = os.open(os.path.join(self.cache_dir, counters_file), os.O_RDWR | os.O_CREAT, 0o644)
+            with open(fd, 'r+b') as f:
+                if fcntl is not None:
+                    fcntl.flock(f, fcntl.LOCK_EX)  # Released when the file is closed
+                counters = list(read_counters(f))
+                counters[counter_names.index(name)] += 1
+                f.seek(0)
+                f.write(counters_format.pack(*counters))
+        except OSError:
+            pass
+
+    def statistics(self):
+        """Hits and misses of every process, number of entries and size of the cache."""
+        try:
+            with open(os.path.join(self.cache_dir, counters_file), 'rb') as f:
+                counters = dict(zip(counter_names, read_counters(f)))
+        except OSError:
+            counters = dict.fromkeys(counter_names, 0)
+        lookups = counters["hits"] + counters["misses"]
+        entries = self.entries()
+        return {
+            **counters,
+            "hit_rate": counters["hits"] / lookups if lookups else 0.0,
+            "entries": len(entries),
+            "size": sum(size for _, size, _ in entries),
+            "max_size": self.max_size,
+        }
+
+
+def read_counters(f):
+    """Hit and miss counters of an open counters file (0, 0 for a new or truncated file)."""
+    data = f.read(counters_format.size)
+    if len(data) < counters_format.size:
+        return 0, 0
+    return counters_format.unpack(data)
+
+
+def format_statistics(statistics):
+    return (
+        f"Output cache: {statistics['hits']} hits, {statistics['misses']} misses ({statistics['hit_rate']:.0%} hit rate), "
+        f"{statistics['entries']} entries, {statistics['size'] / 1024:.0f} KiB / {statistics['max_size'] / 1024:.0f} KiB"
+    )
@@ -0,0 +1,136 @@
+"""
+Module:
+3250.1 Compilateurs
+Auteur:
+WICKI Sélien
+Date: 18.10.2026
+"""
+
+# System imports
+import io
+import os
+import itertools
+from concurrent.futures import ProcessPoolExecutor
+
+from reportlab.lib.pagesizes import A4
+from reportlab.platypus import SimpleDocTemplate
+from reportlab.platypus.frames import Frame
+
+from pdfGenerator import build_stylesheet, item_flowables, build_document, create_pdf, FlowableStream, PlainParagraph
+
+# Minimum number of content items sent to a worker at once (a segment is at least one $title and what follows it)
+min_segment_items = 32
+
+
+class PrewrappedParagraph(PlainParagraph):
+    """
+    Paragraph whose lines were broken in a worker process (prewrap).
+
+    Breaking the lines (breakLines, the measure of every word) is most of the layout time. A
+    worker breaks the lines of the paragraph for the width of the frame, the layout in the main
+    process then finds them in prewrapped instead of computing them again. Another width breaks
+    the lines as usual, as do the parts of a split paragraph (new paragraphs).
+    """
+    prewrapped = None  # (widths, lines) computed by prewrap
+
+    def prewrap(self, width):
+        self.wrap(width, 0x7fffffff)
+        self.prewrapped = (self._wrapWidths, self.blPara)
+        # Back to the state of a paragraph never laid out
+        del self.blPara, self._wrapWidths, self.width, self.height
+
+    def breakLines(self, width):
+        if self.prewrapped is not None and self.prewrapped[0] == width:
+            return self.prewrapped[1]
+        return super().breakLines(width)
+
+
+def frame_width():
+    """Width available to the paragraphs in the frame of the pages of build_document."""
+    doc = SimpleDocTemplate(io.BytesIO(), pagesize=A4)
+    return Frame(doc.leftMargin, doc.bottomMargin, doc.width, doc.height)._getAvailableWidth()
+
+
+def split_segments(content, min_items=min_segment_items):
+    """
+    Split the content items at the $title boundaries : each segment starts with a title (except
+    the first one) and holds at least min_items items (small segments are merged with the next ones).
+    """
+    segments = []
+    segment = []
+    for item in content:
+        if item.get("type") == "title" and len(segment) >= min_items:
+            segments.append(segment)
+            segment = []
+        segment.append(item)
+    if segment:
+        segments.append(segment)
+    return segments
+
+
+#############################################################################
+#                                   Worker                                  #
+#############################################################################
+
+# Set once per worker process by init_worker
+_worker_styles = None
+_worker_width = None
+
+
+def init_worker(styles_data, width):
+    """Build the stylesheet of the document once per worker process."""
+    global _worker_styles, _worker_width
+    _worker_styles = build_stylesheet(styles_data)
+    _worker_width = width
+
+
+def prewrap_segment(segment):
+    """Flowables of each item of the segment, the lines of the paragraphs broken for the frame width."""
+    flowables = []
+    for item in segment:
+        item_list = item_flowables(item, _worker_styles, paragraph_class=PrewrappedParagraph)
+        for flowable in item_list:
+            if isinstance(flowable, PrewrappedParagraph):
+                flowable.prewrap(_worker_width)
+        flowables.append(item_list)
+    return flowables
+
+
+#############################################################################
+#                                   Render                                  #
+#############################################################################
+
+def create_pdf_parallel(semantic_data, filename=None, invariant=False, workers=None, low_memory=False,
+                        document_class=SimpleDocTemplate):
+    """
+    Generate the PDF of the analysed data with the paragraphs built and their lines broken in a
+    process pool (workers processes, default : number of CPUs). filename is a path or a binary
+    file object, None : the PDF is returned as bytes (as with create_pdf). document_class : see
+    build_document.
+
+    The content is split into segments at the $title boundaries (split_segments), the workers
+    prepare the segments in order while the main process lays out the pages as the segments come
+    back. Placing the paragraphs on the pages, the page breaks and the page numbers stay in one
+    serial build : the PDF is byte-identical to the one of create_pdf.
+
+    The main process still unpickles the prepared paragraphs and lays them out : about 60 % of
+    the serial time (benchmarks/parallel_render.py), so the wall time is at best about 1.7 times
+    shorter. With a single CPU, the workers would compete with the layout : the PDF is built by
+    create_pdf.
+    """
+    if (os.cpu_count() or 1) < 2:
+        return create_pdf(semantic_data, filename, invariant, low_memory, document_class)
+
+    styles_data = semantic_data["Styles"]
+    page_config = semantic_data["PageNumberConfig"]
+    segments = split_segments(semantic_data["Content"])
+
+    workers = workers if workers is not None else os.cpu_count()
+    output = io.BytesIO() if filename is None else filename
+    with ProcessPoolExecutor(max_workers=workers, initializer=init_worker, initargs=(styles_data, frame_width())) as executor:
+        # map hands the segments back in order, the layout starts with the first one
+        prepared = executor.map(prewrap_segment, segments)
+        story = FlowableStream(itertools.chain.from_iterable(prepared))
+        build_document(story, page_config, output, invariant, document_class, low_memory)
+    if filename is None:
+        return output.getvalue()
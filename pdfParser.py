@@ -6,12 +6,56 @@ WICKI Sélien
 Date: 26.01.2025 
 """
 
+# System imports
+import re
+from bisect import bisect_left
+
 # Importing yacc
 import ply.yacc as yacc
 
+# Name of the precomputed parser table module (generated by build_tables.py)
+parsetab_module = "pdfparsetab"
+
 # Import the tokens from the lexer
 from pdfLexer import tokens
 
+# Syntax tree nodes
+from pdfAst import Instruction, Argument, Text, Inline, InstructionKind, ArgumentName, inline_kinds
+
+
+def newline_offsets(lexer):
+    """
+    Sorted positions of the newlines of the input of the lexer, computed once per input (a rfind
+    per token would make the parse of a long line quadratic).
+    """
+    if getattr(lexer, "newlines_of", None) is not lexer.lexdata:
+        lexer.newlines = [found.start() for found in re.finditer("\n", lexer.lexdata)]
+        lexer.newlines_of = lexer.lexdata
+    return lexer.newlines
+
+
+def position(p, n):
+    """(line, column) of the n-th symbol of the production (a token)."""
+    lexpos = p.lexpos(n)
+    newlines = newline_offsets(p.lexer)
+    before = bisect_left(newlines, lexpos)  # Number of newlines before the token
+    return p.lineno(n), lexpos - (newlines[before - 1] if before else -1)
+
+
+def end_position(p, n):
+    """(line, column) of the last character of the n-th symbol of the production (a token)."""
+    line, column = position(p, n)
+    value = p[n]
+    newlines = value.count("\n")
+    if newlines:
+        return line + newlines, len(value) - value.rfind("\n") - 1
+    return line, column + len(value) - 1
+
+
+def text_node(p, n):
+    """Text node of the n-th symbol of the production (a TEXT token)."""
+    return Text(p[n], *(position(p, n) + end_position(p, n)))
+
 
 
 # Grammar Rules
@@ -19,12 +63,20 @@ def p_document(p):
     """document : instructions"""
     p[0] = p[1]
 
+# The list rules are left recursive and append in place : building a list of n elements is O(n)
+# (a right recursive rule or a list concatenation per reduction would make it O(n^2)).
+# The reduction actions must not do any I/O.
+
 def p_instructions(p):
     """
-    instructions :    instruction instructions
+    instructions :    instructions instruction
                     | instruction
     """
-    p[0] = [p[1]] if len(p) == 2 else [p[1]] + p[2]
+    if len(p) == 3:
+        p[1].append(p[2])
+        p[0] = p[1]
+    else:
+        p[0] = [p[1]]
 
 def p_instruction(p):
     """             
@@ -39,23 +91,30 @@ def p_instruction(p):
                     | PAGE_NUMBER LPAREN arguments RPAREN
                     | NUMBERIZE_TITLE LPAREN arguments RPAREN
                     | NUMBERIZE_TITLE LPAREN RPAREN
+                    | INCLUDE LPAREN arguments RPAREN
     """
-    if len(p) == 8:  # Instruction with arguments and content
-        p[0] = {"instruction": p[1], "arguments": p[3], "content": p[6]}
+    kind = InstructionKind(p[1])
+    span = position(p, 1) + end_position(p, len(p) - 1)
+
+    if kind in inline_kinds:  # $bold(){...}, $italic(){...}, $underlined(){...}
+        p[0] = Inline(kind, p[5], *span)
+    elif len(p) == 8:  # Instruction with arguments and content
+        p[0] = Instruction(kind, p[3], p[6], *span)
     elif len(p) == 7:  # Instruction without arguments but with content
-        p[0] = {"instruction": p[1], "content": p[5]}
+        p[0] = Instruction(kind, [], p[5], *span)
     elif len(p) == 5:  # Instruction with arguments but without content
-        p[0] = {"instruction": p[1], "arguments": p[3]}
+        p[0] = Instruction(kind, p[3], None, *span)
     else:  # Instruction  without arguments and without content
-        p[0] = {"instruction": p[1]}
+        p[0] = Instruction(kind, [], None, *span)
 
 def p_arguments(p):
     """arguments : arguments COMMA argument
                  | argument"""
     if len(p) == 4:  # Handle multiple arguments
-        p[0] = {**p[1], **p[3]}
-    else:  # Single argument
+        p[1].append(p[3])
         p[0] = p[1]
+    else:  # Single argument
+        p[0] = [p[1]]
 
 def p_argument(p):
     """argument :     ARG_NAME EQUALS STRING
@@ -70,35 +129,32 @@ def p_argument(p):
                     | ARG_PAGE_NUMBER_FONT_COLOR EQUALS STRING
                     | ARG_PAGE_NUMBER_START EQUALS NUMBER
                     | ARG_NUMBERIZE_TITLE_START EQUALS NUMBER
+                    | ARG_FILE EQUALS STRING
     """
-    p[0] = {p[1]: p[3]}
+    p[0] = Argument(ArgumentName(p[1]), p[3], *(position(p, 1) + end_position(p, 3)))
 
 def p_content(p):
     """content :      content TEXT
                     | TEXT
                     | content instruction
                     | instruction"""
-    print(p)
-
-    if len(p) == 3:  # Handle multiple content parts
-        if isinstance(p[2], str):  # TEXT
-            p[0] = p[1] + [p[2]] if isinstance(p[1], list) else [p[1], p[2]]
-        else:  # instruction
-            p[0] = p[1] + [p[2]] if isinstance(p[1], list) else [p[1], p[2]]
+    if len(p) == 3:  # Handle multiple content parts (TEXT or instruction)
+        p[1].append(text_node(p, 2) if p.slice[2].type == "TEXT" else p[2])
+        p[0] = p[1]
     else:  # Single TEXT or instruction
-        p[0] = [p[1]]
+        p[0] = [text_node(p, 1) if p.slice[1].type == "TEXT" else p[1]]
 
 def p_bold_content(p):
     """bold_content : TEXT"""
-    p[0] = {"bold": p[1]}
+    p[0] = p[1]
 
 def p_italic_content(p):
     """italic_content : TEXT"""
-    p[0] = {"italic": p[1]}
+    p[0] = p[1]
 
 def p_underlined_content(p):
     """underlined_content : TEXT"""
-    p[0] = {"underlined": p[1]}
+    p[0] = p[1]
 
 def p_error(p):
     if p:
@@ -107,5 +163,8 @@ def p_error(p):
         print("Syntax error at EOF")
 
 # Build the parser
-parser = yacc.yacc()
+# The LALR tables are loaded from the precomputed table module. yacc compares the grammar
+# signature stored in it with the current grammar and rebuilds the tables in memory if they
+# differ. No table or debug file (parser.out) is written at runtime : see build_tables.py.
+parser = yacc.yacc(tabmodule=parsetab_module, debug=False, write_tables=False)
 
@@ -0,0 +1,217 @@
+"""
+Module:
+3250.1 Compilateurs
+Auteur:
+WICKI Sélien
+Date: 18.10.2026
+"""
+
+# System imports
+import io
+import json
+import time
+import cProfile
+import contextlib
+import tracemalloc
+
+from pdfCompiler import Compiler
+from pdfAst import node_count, text_of
+
+# Stages of a compilation, in order (see Compiler.stage)
+# lexer is a tokenization of its own : parser.parse lexes the source again while parsing
+stages = ["lexer", "output_cache", "ir_cache", "parser.parse", "semantical_analysis", "create_pdf"]
+
+# Length of the ranking of the slowest instructions
+default_top = 10
+
+
+class StageTimer:
+    """
+    Timer of a profiled Compiler (Compiler.timer) : wall time, CPU time and (memory=True,
+    tracemalloc running) peak memory of each stage, the time of a stage run several times is
+    summed. It also keeps the instructions and the content items of the analysis (analysed) and,
+    with layout=True, the layout time of each content item (document_class).
+    """
+
+    def __init__(self, memory=False, layout=False):
+        self.memory = memory
+        self.layout = layout
+        self.stages = {}
+        self.instructions = None  # Resolved top-level instructions, None : not analysed (cached IR or PDF)
+        self.items = []
+        self.layout_times = []  # Layout time of each content item, in the order of the content
+
+    @contextlib.contextmanager
+    def stage(self, name):
+        if self.memory:
+            tracemalloc.reset_peak()
+            base = tracemalloc.get_traced_memory()[0]
+        wall = time.perf_counter()
+        cpu = time.process_time()
+        yield
+        record = self.stages.setdefault(name, {"wall": 0.0, "cpu": 0.0})
+        record["wall"] += time.perf_counter() - wall
+        record["cpu"] += time.process_time() - cpu
+        if self.memory:
+            record["peak_memory"] = max(record.get("peak_memory", 0), tracemalloc.get_traced_memory()[1] - base)
+
+    def analysed(self, instructions, items):
+        self.instructions = instructions
+        self.items = items
+
+    def document_class(self):
+        """Document class of the layout (see build_document) : timed_document_class with layout=True."""
+        from reportlab.platypus import SimpleDocTemplate
+        return timed_document_class(self.layout_times) if self.layout else SimpleDocTemplate
+
+
+def timed_document_class(layout_times):
+    """
+    SimpleDocTemplate adding the layout time of each flowable to layout_times[item index].
+    The flowables of a content item end with its Spacer (see item_flowables) : the parts of a
+    split paragraph are laid out before it and go to the same item, the item index moves on once
+    the Spacer left the story (a Spacer that does not fit is put back and laid out on the next page).
+    This holds whatever builds the story : create_pdf (also with low_memory) or create_pdf_parallel.
+    """
+    from reportlab.platypus import SimpleDocTemplate, Spacer
+
+    class TimedDocTemplate(SimpleDocTemplate):
+        current_item = 0
+
+        def handle_flowable(self, flowables):
+            flowable = flowables[0]
+            start = time.perf_counter()
+            super().handle_flowable(flowables)
+            if len(layout_times) <= self.current_item:
+                layout_times.append(0.0)
+            layout_times[self.current_item] += time.perf_counter() - start
+            if isinstance(flowable, Spacer) and (not len(flowables) or flowables[0] is not flowable):
+                self.current_item += 1
+
+    return TimedDocTemplate
+
+
+def timed_compile(compiler, timer, input_string, output_file, source_file=None):
+    """Compiler.compile with each stage timed by timer. Returns the (error_messages, warning_messages)."""
+    compiler.timer = timer
+    try:
+        return compiler.compile(input_string, output_file, source_file)
+    finally:
+        compiler.timer = None
+
+
+def profile_compile(input_string, output_file, compiler=None, memory=True, cprofile_file=None, top=default_top,
+                    source_file=None):
+    """
+    Compile input_string to output_file and return the profile of the compilation (JSON serializable dict) :
+    stages -> {stage: {"wall", "cpu", "peak_memory"}} (seconds, bytes)
+    tokens, nodes, instructions -> number of tokens, of AST nodes and of top-level instructions
+    slowest_instructions -> the `top` content instructions with the longest layout time in create_pdf
+    errors, warnings -> messages of the compilation
+    source_file -> file of the source (directory of its $include paths)
+
+    The compilation is the one of Compiler.compile with the configuration of the compiler (output
+    and IR caches, low_memory, render_workers), its stages timed in place (see Compiler.stage). A
+    stage answered by a cache does not run : a PDF found in the output cache only has the
+    output_cache stage, no counts and no ranking.
+
+    The times are measured on a first compilation (under cProfile when cprofile_file is given, its
+    statistics are dumped there for pstats). The peak memory of the stages is measured on a second
+    compilation with tracemalloc, which slows the code down (memory=False skips it) : it runs
+    without the caches, its PDF is rendered in memory and dropped.
+    """
+    compiler = compiler if compiler is not None else Compiler()
+
+    timer = StageTimer(layout=True)
+    profiler = cProfile.Profile() if cprofile_file else None
+    if profiler:
+        profiler.enable()
+    try:
+        # The messages of the lexer are printed by the parse
+        with timer.stage("lexer"), contextlib.redirect_stdout(io.StringIO()):
+            tokens = len(compiler.tokenize(input_string))
+        error_messages, warning_messages = timed_compile(compiler, timer, input_string, output_file, source_file)
+    finally:
+        if profiler:
+            profiler.disable()
+            profiler.dump_stats(cprofile_file)
+
+    if memory:
+        tracing = tracemalloc.is_tracing()
+        if not tracing:
+            tracemalloc.start()
+        memory_timer = StageTimer(memory=True)
+        # Messages are only printed once, the caches would answer the second compilation
+        saved = compiler.print_errors, compiler.output_cache, compiler.ir_cache
+        compiler.print_errors, compiler.output_cache, compiler.ir_cache = False, None, None
+        try:
+            with contextlib.redirect_stdout(io.StringIO()):  # Messages of the lexer and the parser
+                with memory_timer.stage("lexer"):
+                    compiler.tokenize(input_string)
+                # Rendered in memory : the PDF is only written once to output_file (the standard output for -)
+                timed_compile(compiler, memory_timer, input_string, io.BytesIO(), source_file)
+        finally:
+            compiler.print_errors, compiler.output_cache, compiler.ir_cache = saved
+            if not tracing:
+                tracemalloc.stop()
+        for name, record in timer.stages.items():
+            if name in memory_timer.stages:
+                record["peak_memory"] = memory_timer.stages[name]["peak_memory"]
+
+    # Instruction of each content item (the item keeps the content of its instruction)
+    instructions = {id(instruction.content): instruction for instruction in timer.instructions or []}
+    ranking = sorted(range(len(timer.layout_times)), key=lambda index: timer.layout_times[index], reverse=True)[:top]
+    slowest = []
+    for index in ranking:
+        if index >= len(timer.items) or id(timer.items[index]["content"]) not in instructions:
+            continue  # Items of a cached IR : their instructions are unknown
+        item = timer.items[index]
+        instruction = instructions[id(item["content"])]
+        slowest.append({
+            "instruction": instruction.kind.value,
+            "line": instruction.line,
+            "layout_time": timer.layout_times[index],
+            "text": " ".join(text_of(item["content"]).split())[:60],
+        })
+
+    return {
+        "stages": timer.stages,
+        "tokens": tokens,
+        "nodes": node_count(timer.instructions) if timer.instructions is not None else 0,
+        "instructions": len(timer.instructions) if timer.instructions is not None else 0,
+        "slowest_instructions": slowest,
+        "errors": error_messages,
+        "warnings": warning_messages,
+        "cprofile": cprofile_file,
+    }
+
+
+def format_profile(profile, output_format="text"):
+    """Profile of profile_compile as text (table) or as JSON."""
+    if output_format == "json":
+        return json.dumps(profile, indent=2)
+
+    lines = [
+        "Profile:",
+        f"  {profile['tokens']} tokens, {profile['nodes']} AST nodes, {profile['instructions']} top-level instructions",
+        "",
+        f"  {'stage':<20} {'wall (s)':>10} {'cpu (s)':>10} {'peak memory (KiB)':>18}",
+    ]
+    for name in stages:
+        record = profile["stages"].get(name)
+        if record is None:
+            continue
+        peak = f"{record['peak_memory'] / 1024:.0f}" if "peak_memory" in record else "-"
+        lines.append(f"  {name:<20} {record['wall']:>10.4f} {record['cpu']:>10.4f} {peak:>18}")
+    lines.append("  (lexer is a tokenization of its own, parser.parse includes the lexing)")
+
+    if profile["slowest_instructions"]:
+        lines += ["", "  Slowest instructions (layout time in create_pdf):"]
+        for rank, entry in enumerate(profile["slowest_instructions"], 1):
+            lines.append(
+                f"  {rank:>3}. line {entry['line']:<6} {entry['instruction']:<8} {entry['layout_time']:>8.4f} s  {entry['text']!r}"
+            )
+
+    if profile["cprofile"]:
+        lines += ["", f"  cProfile statistics written to {profile['cprofile']} (python -m pstats {profile['cprofile']})"]
+    return "\n".join(lines)
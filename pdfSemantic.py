@@ -8,8 +8,8 @@ Date: 26.01.2025
 
 
 # For font check : https://docs.reportlab.com/reportlab/userguide/ch3_fonts/
-from reportlab.pdfbase import pdfmetrics
-from reportlab.lib import colors
+# reportlab (pdfmetrics, colors) is imported on the first font or color lookup, or never when the
+# names come from the snapshot of pdfnametab (see use_name_snapshot)
 
 # import the allowed arguments
 from default import style_arguments, page_number_arguments, section_arguments, title_arguments, numberize_title_arguments
@@ -17,37 +17,118 @@ from default import style_arguments, page_number_arguments, section_arguments, t
 #import the default values
 from default import default_section_style, default_title_style, default_page_number, default_title, default_section, default_font, default_color, default_font_size, default_page_number_position, default_numberize_title
 
-# Import the nested instructions for the section
-from default import section_nested_instructions
-
 # Import the allowed page number positions
 from default import allowed_page_nb_positions
 
 # Import the range for the arguments
 from default import font_size_range, title_level_range
 
+# TrueType fonts of the font directory
+import pdfFonts
+from pdfFonts import ensure_font
 
-# For errors 
-def check_allows_arguments(instruction, allowed_arguments):
-    for arg in instruction["arguments"]:
-        if arg not in allowed_arguments:
-            return False
-    return True
+# Syntax tree nodes
+from pdfAst import InstructionKind, Text, inline_kinds, text_of
+
+
+#############################################################################
+#                             Validation indexes                            #
+#############################################################################
+
+class FontIndex:
+    """
+    Set of the font names known to reportlab (standard fonts and registered fonts), for the font checks.
+    Built on the first lookup and built again when fonts have been registered since : pdfmetrics
+    keeps the registered fonts in a dict, its size tells if the set is outdated. refresh() forces
+    a new build (after pdfmetrics._reset() for example), invalidate() a new build on the next
+    lookup (after a change of the font directory, see pdfFonts.font_change_callbacks).
+
+    With use_snapshot() the names are the standard fonts of the snapshot and the fonts of the font
+    directory : reportlab is not imported, the fonts registered at run time are not seen.
+    """
+
+    def __init__(self):
+        self.names = frozenset()
+        self.registered = -1  # Number of registered fonts when the set was built
+        self.pdfmetrics = None  # reportlab.pdfbase.pdfmetrics, None until the first lookup (or with the snapshot)
+        self.snapshot = False
+
+    def use_snapshot(self):
+        self.snapshot = True
+        self.refresh()
+
+    def refresh(self):
+        if self.snapshot:
+            from pdfnametab import standard_fonts
+            self.names = frozenset(standard_fonts).union(pdfFonts.library.font_files())
+            return
+        if self.pdfmetrics is None:
+            from reportlab.pdfbase import pdfmetrics
+            self.pdfmetrics = pdfmetrics
+        self.names = frozenset(self.pdfmetrics.getRegisteredFontNames()).union(self.pdfmetrics.standardFonts)
+        self.registered = len(self.pdfmetrics._fonts)
+
+    def invalidate(self):
+        if self.snapshot:
+            self.refresh()
+        else:
+            self.registered = -1
+
+    def __contains__(self, font_name):
+        if not self.snapshot and (self.pdfmetrics is None or len(self.pdfmetrics._fonts) != self.registered):
+            self.refresh()
+        return font_name in self.names
+
+
+class ColorIndex:
+    """Set of the named colors of reportlab (reportlab.lib.colors, or the snapshot), built on the first lookup."""
+
+    def __init__(self):
+        self.names = None
+        self.snapshot = False
+
+    def use_snapshot(self):
+        self.snapshot = True
+        self.names = None
+
+    def __contains__(self, color):
+        if self.names is None:
+            if self.snapshot:
+                from pdfnametab import named_colors
+                self.names = frozenset(named_colors)
+            else:
+                from reportlab.lib import colors
+                self.names = frozenset(colors.getAllNamedColors())
+        return color in self.names
+
+
+# Lookup indexes, built once per process
+font_index = FontIndex()
+color_index = ColorIndex()
+pdfFonts.font_change_callbacks.append(font_index.invalidate)
+
+
+def use_name_snapshot():
+    """
+    Check the fonts and colors against the names of the snapshot pdfnametab (generated by
+    build_tables.py) instead of reportlab : the analysis never imports reportlab.
+    """
+    font_index.use_snapshot()
+    color_index.use_snapshot()
+
+
+# For errors
+def check_allows_arguments(arguments, allowed_arguments):
+    return arguments.keys() <= allowed_arguments
 
 #For Warnings
 def check_font(font_name):
-    try:
-        if font_name in pdfmetrics.getRegisteredFontNames():
-            return True  # Font is registered
-        else:
-            return False  # Font is not registered
-    except Exception as e:
-        print(f"Error checking font {font_name}: {e}")
-        return False
-    
+    # Standard or registered font, else a TrueType font of the font directory (registered on first use)
+    font_name = font_name.strip('"')
+    return font_name in font_index or ensure_font(font_name)
+
 def check_color(color):
-    available_colors = colors.getAllNamedColors()
-    return color in available_colors
+    return color in color_index
 
 
 def check_out_of_range(value, lower, upper):
@@ -59,9 +140,188 @@ def check_out_of_range(value, lower, upper):
             return False
 
 
+def check_font_size(value):
+    return check_out_of_range(value, font_size_range[0], font_size_range[1])
+
+def check_title_level(value):
+    return check_out_of_range(value, title_level_range[0], title_level_range[1])
+
+def check_page_number_position(position):
+    return position.strip('"') in allowed_page_nb_positions
+
+
+#############################################################################
+#                              Validation rules                             #
+#############################################################################
+
+class ArgumentCheck:
+    """
+    Warning check of an argument value : if check(value) is false, the message is reported
+    (formatted with the instruction keyword, the value and the default) and the default value is used.
+    """
+    __slots__ = ("check", "message", "default")
+
+    def __init__(self, check, message, default):
+        self.check = check
+        self.message = message
+        self.default = default
+
+
+# Warning checks of the arguments of each instruction (argument -> ArgumentCheck), in the order of the messages
+style_checks = {
+    "#font": ArgumentCheck(check_font, "Warning: In {instruction}, {value} does not exist. Using default font {default}.", default_font),
+    "#font_color": ArgumentCheck(check_color, "Warning: In {instruction}, {value} does not exist. Using default color {default}.", default_color),
+    "#fontSize": ArgumentCheck(check_font_size, "Warning: In {instruction}, {value} is out of range. Using default font size {default}.", default_font_size),
+}
+
+page_number_checks = {
+    "#pageNumberFont": ArgumentCheck(check_font, "Warning: Font {value} for $pageNumber does not exist. Using default font {default}.", default_font),
+    "#pageNumberPosition": ArgumentCheck(check_page_number_position, "Warning: The specified position {value} for $pageNumber is not allowed. Using default position '{default}'.", default_page_number_position),
+    "#pageNumberFontSize": ArgumentCheck(check_font_size, "Warning: The specified font size {value} for $pageNumber is out of range. Using default font size {default}.", default_page_number["#pageNumberFontSize"]),
+}
+
+title_checks = {
+    "#level": ArgumentCheck(check_title_level, "Warning: The specified title level {value} is out of range.", default_title["#level"]),
+}
+
+numberize_title_checks = {
+    "#numberizeTitleStart": ArgumentCheck(check_title_level, "Warning: The specified title level {value} is out of range.", default_title["#level"]),
+}
 
-def semantical_analysis(parsed_code, print_errors=False):
+
+class InstructionRule:
+    """
+    Validation of a kind of instruction : its allowed arguments (None for an instruction without
+    arguments), the warning checks of its arguments and its analysis (a SemanticAnalyzer method
+    called with the instruction and its arguments once the arguments are allowed).
     """
+    __slots__ = ("allowed_arguments", "argument_checks", "analyze")
+
+    def __init__(self, allowed_arguments, argument_checks, analyze):
+        self.allowed_arguments = allowed_arguments
+        self.argument_checks = argument_checks
+        self.analyze = analyze
+
+
+# Registry of the validation rules : InstructionKind -> InstructionRule
+instruction_rules = {}
+
+
+def instruction_rule(kinds, allowed_arguments=None, argument_checks=None):
+    """Decorator registering a SemanticAnalyzer method as the analysis of the instructions of the given kinds."""
+    def register(analyze):
+        for kind in kinds:
+            instruction_rules[kind] = InstructionRule(allowed_arguments, argument_checks or {}, analyze)
+        return analyze
+    return register
+
+
+
+#############################################################################
+#                                   Lowering                                #
+#############################################################################
+
+# The analysis hands the generator values it only looks up : every content item carries the
+# integer ID of its style (index in the styles of the analysis) and its paragraph markup, the
+# styles and the page number configuration are lowered to typed values once per document.
+
+# Markup of the inline instructions
+inline_tags = {InstructionKind.BOLD: "b", InstructionKind.ITALIC: "i", InstructionKind.UNDERLINED: "u"}
+
+
+def section_markup(content):
+    """Paragraph markup of the content of a $section : the texts, the inline instructions as <b>, <i> and <u> tags."""
+    parts = []
+    for item in content:
+        if isinstance(item, Text):  # Plain text
+            parts.append(item.value)
+        elif item.kind in inline_tags:  # Styled text (other instructions are errors of the analysis)
+            tag = inline_tags[item.kind]
+            parts.append(f"<{tag}>{item.text}</{tag}>")
+    return " ".join(parts)
+
+
+def title_markup(content):
+    """Paragraph markup of the content of a $title : its texts in bold."""
+    return "<b>" + " ".join(item.value for item in content if isinstance(item, Text)) + "</b>"
+
+
+def style_definition(style):
+    """Typed definition of a style of the analysis : (name, font, size, color)."""
+    return (
+        style["#name"].strip('"'),  # Sanitize style name by removing surrounding quotes
+        style.get("#font", "Helvetica").strip('"'),
+        int(style.get("#fontSize", 12)),
+        style.get("#font_color", "black"),
+    )
+
+
+class PageNumberLayout:
+    """Typed page number configuration : position, font and font size of the number, first numbered page."""
+    __slots__ = ("position", "font", "font_size", "start")
+
+    def __init__(self, page_config):
+        self.position = page_config["#pageNumberPosition"].strip('"')  # Sanitize position
+        self.font = page_config["#pageNumberFont"].strip('"')  # Sanitize font name
+        self.font_size = int(page_config["#pageNumberFontSize"])
+        # Page start value (default is 1 if not specified or if error)
+        try:
+            self.start = int(page_config.get("#pageNumberStart", 1))
+        except ValueError:
+            self.start = 1
+
+
+class TitleNumbering:
+    """Add the numbers to the titles one at a time, from the #numberizeTitleStart value and based on the #level of the title."""
+
+    def __init__(self, numberize_titles):
+        try:
+            self.start_title_level = int(numberize_titles["#numberizeTitleStart"])
+        except ValueError:
+            self.start_title_level = default_numberize_title["#numberizeTitleStart"]
+
+        self.titles_levels = [ 1 for i in range(title_level_range[0], title_level_range[1] + 1)]
+
+    def number(self, item):
+        try:
+            title_level = int(item["arguments"]["#level"])
+        except ValueError:
+            title_level = default_title["#level"]
+
+        if title_level < self.start_title_level:
+            return
+
+        title_number = '.'.join(str(self.titles_levels[i]) for i in range(self.start_title_level - 1, title_level))
+
+        # Add number prefix to the title content
+        title_text = f"{title_number}. {text_of(item['content'])}"
+
+        # Update the title content to include the number prefix
+        item['content'] = [Text(title_text, *item['content'][0].span())] if item['content'] else [Text(title_text)]
+        item['markup'] = title_markup(item['content'])
+
+        # Increment the title number for the current level
+        self.titles_levels[title_level - 1] += 1
+
+        # Reset lower levels to ensure correct numbering for further nested titles
+        for i in range(title_level, len(self.titles_levels)):
+            self.titles_levels[i] = 1
+
+
+def numberize_doc_titles(doc_content, numberize_titles):
+    """Add the numbers to the titles of doc_content (see TitleNumbering)."""
+    numbering = TitleNumbering(numberize_titles)
+    for item in doc_content:
+        if item["type"] == "title":
+            numbering.number(item)
+
+
+
+class SemanticAnalyzer:
+    """
+    Semantic analysis of a document, one top-level instruction at a time.
+    The state (styles, page number, title numbering, messages) carries from one instruction to the next.
+
     Rules for the semantical analysis:
 
     $style arguments :
@@ -85,382 +345,303 @@ def semantical_analysis(parsed_code, print_errors=False):
     #style 
     #level
 
+    $include arguments :
+    #file -> Mendatory (replaced by the instructions of the file before the analysis, see pdfInclude)
+
     $bold, $italic, $underlined have no arguments !
     $stlye and $pageNumber have no content (no braces) !
 
     I want the styles to be stored in a list of dict
     I want the pageNumber to be defined in a dict
-    I want the content ($section and $title) to be in a list (chronological) of dict (arguments)
+    I want the content ($section and $title) to be in a list (chronological) of dict (arguments),
+    each one with the ID of its style and its markup for the generator (see Lowering)
 
     The page number can only be called once ! An example of a code that does not work (Error : $pageNumber called multiple times)
     $pageNumber(#pageNumberPosition="bottom-left",#pageNumberFont="Times New Roman",#pageNumberFontSize=10)
     $pageNumber(#pageNumberFont="Times New Roman")
     """
 
-    # Store the results
-    styles = [default_section_style, default_title_style]
-    page_number = {}
-    numberize_titles = {}
-    doc_content = []
-
-    # For the rule that the name of the syle is unique !
-    unique_style_names = set()
-    unique_style_names.add(default_section_style["#name"])
-    unique_style_names.add(default_title_style["#name"]) 
-
-    # To collect error messages
-    error_messages = []      
-    warning_messages = []
+    def __init__(self):
+        # Store the results
+        self.styles = [default_section_style, default_title_style]
+        self.page_number = {}
+        self.numberize_titles = {}
+
+        # For the rule that the name of the syle is unique !
+        self.unique_style_names = set()
+        self.unique_style_names.add(default_section_style["#name"])
+        self.unique_style_names.add(default_title_style["#name"])
+
+        # Style name -> style ID (index in styles) of the content items
+        self.style_ids = {style["#name"]: style_id for style_id, style in enumerate(self.styles)}
+
+        # To collect error messages
+        self.error_messages = []
+        self.warning_messages = []
+
+        # Check page called once
+        self.page_number_called = False
+
+        # Numberize title
+        self.is_title_numberized = False
+
+    def page_number_config(self):
+        """Page number configuration declared so far (default configuration if none)."""
+        if len(self.page_number) == 0:
+            return default_page_number
+        return self.page_number
+
+    def print_messages(self):
+        # Print out any error messages
+        if self.error_messages:
+            for error in self.error_messages:
+                print()
+                print(error)
+                print()
+
+        if self.warning_messages:
+            for warning in self.warning_messages:
+                print()
+                print(warning)
+                print()
 
-    # Check page called once 
-    page_number_called = False
+    def analyze_instruction(self, instruction):
+        """
+        Analyse one top-level instruction (Instruction or Inline node).
+        Returns the content item ($section or $title) it adds to the document, None otherwise.
+        The rule of the instruction is looked up in instruction_rules.
+        """
+        rule = instruction_rules.get(instruction.kind)
+        if rule is None:
+            self.error_messages.append(f"Error: Undefined instruction {instruction.kind.value}.")
+            return None
+
+        if rule.allowed_arguments is None:
+            return rule.analyze(self, instruction, None)
 
-    # Numberize title 
-    is_title_numberized = False
+        arguments = instruction.argument_dict()
 
-    # Analysing parsed data
-    for instruction in parsed_code:
+        # Check if the arguments are allowed
+        if not check_allows_arguments(arguments, rule.allowed_arguments):
+            self.error_messages.append(
+                f"Error: {instruction.kind.value} instruction does not allow the arguments {arguments}."
+            )
+            return None
 
-        #############################################################################
-        #                                   Style                                   #
-        ############################################################################# 
+        return rule.analyze(self, instruction, arguments)
 
-        if instruction["instruction"] == "$style":
+    def check_arguments(self, instruction, arguments):
+        """Warning checks of the arguments (see ArgumentCheck), a value failing its check is replaced by its default."""
+        for name, argument_check in instruction_rules[instruction.kind].argument_checks.items():
+            if name in arguments and not argument_check.check(arguments[name]):
+                self.warning_messages.append(argument_check.message.format(
+                    instruction=instruction.kind.value, value=arguments[name], default=argument_check.default
+                ))
+                arguments[name] = argument_check.default
 
-            #ERRORS 
-
-            # Check if the arguments are allowed
-            if not check_allows_arguments(instruction, style_arguments):
-                error_messages.append(
-                    f"Error: $style instruction does not allow the arguments {instruction['arguments']}."
-                )
-                continue
+    #############################################################################
+    #                                   Style                                   #
+    #############################################################################
 
-            # $style must have "#name" argument
-            if "#name" not in instruction["arguments"]:
-                error_messages.append(
-                    "Error: $style instruction is missing the mandatory #name argument."
-                )
-                continue  # Skip further processing for invalid $style
+    @instruction_rule([InstructionKind.STYLE], style_arguments, style_checks)
+    def analyze_style(self, instruction, arguments):
 
-            style_name = instruction["arguments"]["#name"]
+        #ERRORS
 
-            # Check for duplicate #name values
-            if style_name in unique_style_names:
-                error_messages.append(
-                    f"Error: The #name value {style_name} is the same for two different styles. The style names must be unique."
-                )
-                continue  # Skip adding this style to the list
+        # $style must have "#name" argument
+        if "#name" not in arguments:
+            self.error_messages.append(
+                "Error: $style instruction is missing the mandatory #name argument."
+            )
+            return None  # Skip further processing for invalid $style
 
-            # Add the style name to the set
-            unique_style_names.add(style_name)
+        style_name = arguments["#name"]
 
+        # Check for duplicate #name values
+        if style_name in self.unique_style_names:
+            self.error_messages.append(
+                f"Error: The #name value {style_name} is the same for two different styles. The style names must be unique."
+            )
+            return None  # Skip adding this style to the list
 
-            #WARNINGS
+        # Add the style name to the set
+        self.unique_style_names.add(style_name)
 
-            # Check if specified font exists
-            if "#font" in instruction["arguments"]:
-                if not check_font(instruction["arguments"]["#font"]):
-                    warning_messages.append(
-                        f"Warning: In {instruction['instruction']}, {instruction['arguments']['#font']} does not exist. Using default font {default_font}."
-                    )
-                    instruction["arguments"]["#font"] = default_font
 
-            # Check if specified color exists
-            if "#font_color" in instruction["arguments"]:
-                if not check_color(instruction["arguments"]["#font_color"]):
-                    warning_messages.append(
-                        f"Warning: In {instruction['instruction']}, {instruction['arguments']['#font_color']} does not exist. Using default color {default_color}."
-                    )
-                    instruction["arguments"]["#font_color"] = default_color
+        #WARNINGS
+        self.check_arguments(instruction, arguments)
 
-            # Check if the font size is in the range
-            if "#fontSize" in instruction["arguments"]:
-                if not check_out_of_range(instruction["arguments"]["#fontSize"], font_size_range[0], font_size_range[1]):
-                    warning_messages.append(
-                        f"Warning: In {instruction['instruction']}, {instruction['arguments']['#fontSize']} is out of range. Using default font size {default_section_style['#fontSize']}."
-                    )
-                    instruction["arguments"]["#fontSize"] = default_font_size
 
+        # For the mergiing of two dicts (Assign default values):
+        # https://www.freecodecamp.org/news/python-merge-dictionaries-merging-two-dicts-in-python/
 
-            # For the mergiing of two dicts (Assign default values):
-            # https://www.freecodecamp.org/news/python-merge-dictionaries-merging-two-dicts-in-python/
+        # Assign default values
+        args = {**default_section_style, **arguments}
+        args["#name"] = style_name
+        self.style_ids[style_name] = len(self.styles)
+        self.styles.append(args)
+        return None
 
-            # Assign default values
-            args = {**default_section_style, **instruction["arguments"]}
-            args["#name"] = style_name
-            styles.append(args)
+    #############################################################################
+    #                                   PageNumber                              #
+    #############################################################################
+
+    @instruction_rule([InstructionKind.PAGE_NUMBER], page_number_arguments, page_number_checks)
+    def analyze_page_number(self, instruction, arguments):
 
+        #ERRORS
 
+        # Only one $pageNumber instruction !
+        if self.page_number_called:
+            self.error_messages.append(
+                "Error: $pageNumber can only be called once."
+            )
+            return None
 
+        self.page_number_called = True
 
 
-        #############################################################################
-        #                                   PageNumber                              #
-        #############################################################################
+        #WARNINGS
+        self.check_arguments(instruction, arguments)
 
-        elif instruction["instruction"] == "$pageNumber":
 
-            #ERRORS
+        # Assign default values (if arguments not provided)
+        args = {**default_page_number, **arguments}  # Merge defaults with provided values
+        self.page_number = args
+        return None
 
-            # Check if the arguments are allowed
-            if not check_allows_arguments(instruction, page_number_arguments):
-                error_messages.append(
-                    f"Error: $style instruction does not allow the arguments {instruction['arguments']}."
-                )
-                continue
+    #############################################################################
+    #                                   Section                                 #
+    #############################################################################
 
-            # Only one $pageNumber instruction !
-            if page_number_called:
-                error_messages.append(
-                    "Error: $pageNumber can only be called once."
-                )
-                continue
-            
-            page_number_called = True
+    @instruction_rule([InstructionKind.SECTION], section_arguments)
+    def analyze_section(self, instruction, arguments):
 
+        #ERRORS
 
-            #WARNINGS
+        # Check that the specified style exists
+        if "#style" in arguments and arguments["#style"] not in self.unique_style_names:
+            self.error_messages.append(
+                f"Error: The #style '{arguments['#style']}' specified in $section does not exist."
+            )
+            return None
 
-            # Check if the specified font exists; fall back to the default font if it doesn't
-            if "#pageNumberFont" in instruction["arguments"]:
-                if not check_font(instruction["arguments"]["#pageNumberFont"]):
-                    warning_messages.append(
-                        f"Warning: Font {instruction["arguments"]['#pageNumberFont']} for $pageNumber does not exist. Using default font {default_font}."
-                    )
-                    instruction["arguments"]["#pageNumberFont"] = default_font
+        for section_content in instruction.content:
 
-            # Check if the specified position is allowed
-            if "#pageNumberPosition" in args and args["#pageNumberPosition"] not in allowed_page_nb_positions:
-                warning_messages.append(
-                    f"Warning: The specified position {args['#pageNumberPosition']} for $pageNumber is not allowed. Using default position 'bottom-left'."
-                )
-                page_number["#pageNumberPosition"] = default_page_number_position
-
-            # Check if the font size is in the range
-            if "#pageNumberFontSize" in args:
-                if not check_out_of_range(args["#pageNumberFontSize"], font_size_range[0], font_size_range[1]):
-                    warning_messages.append(
-                        f"Warning: The specified font size {args['#pageNumberFontSize']} for $pageNumber is out of range. Using default font size {default_page_number['#pageNumberFontSize']}."
-                    )
-                    page_number["#pageNumberFontSize"] = default_page_number["#pageNumberFontSize"]
-
-
-            # Assign default values (if arguments not provided)
-            args = {**default_page_number, **instruction["arguments"]}  # Merge defaults with provided values
-            page_number = args
-
-
-
-
-
-        #############################################################################
-        #                                   Section                                 #
-        #############################################################################
-
-        elif instruction["instruction"] == "$section":
-
-            #ERRORS
-
-            # Check if the arguments are allowed
-            if not check_allows_arguments(instruction, section_arguments):
-                error_messages.append(
-                    f"Error: $section instruction does not allow the arguments {instruction['arguments']}."
-                )
+            # Plain text -> Should be alrigth
+            if isinstance(section_content, Text):
                 continue
 
-            # Check that the specified style exists
-            if "#style" in args and args["#style"] not in unique_style_names:
-                error_messages.append(
-                    f"Error: The #style '{args['#style']}' specified in $section does not exist."
+            # Check that the section only contains $bold, $italic, $underlined, and regular text (no $title, $section allowed)
+            if section_content.kind not in inline_kinds:
+                self.error_messages.append(
+                    f"Error: {section_content.kind.value} is not allowed inside a $section."
                 )
-                continue
-
-            for section_content in instruction.get("content", []):
-                
-                # Check that the section only contains $bold, $italic, $underlined, and regular text (no $title, $section allowed)
-                if isinstance(section_content, dict):
-                    if section_content.get("instruction") not in section_nested_instructions:
-                        error_messages.append(
-                            f"Error: {section_content['instruction']} is not allowed inside a $section."
-                        )
-                elif isinstance(section_content, str):  # Plain text -> Should be alrigth
-                    continue
-
-                # Check $bold, $italic, and $underlined have no arguments and non-empty content
-                if isinstance(section_content, dict) and section_content.get("instruction") in section_nested_instructions:
-                    if "arguments" in section_content and section_content["arguments"]:
-                        error_messages.append(
-                            f"Error: {section_content['instruction']} should not have any arguments."
-                        )
-                        continue
-                    elif not section_content.get("content"):
-                        error_messages.append(
-                            f"Error: {section_content['instruction']} has empty content."
-                        )
-                        continue
-
-
-            # Assign default values (if arguments not provided)
-            args = {**default_section, **instruction["arguments"]}
-            doc_content.append({"type": "section", "arguments": args, "content": instruction["content"]})
-        
-
 
+            # Check $bold, $italic, and $underlined have non-empty content (the grammar does not allow arguments)
+            elif not section_content.text:
+                self.error_messages.append(
+                    f"Error: {section_content.kind.value} has empty content."
+                )
 
 
+        # Assign default values (if arguments not provided)
+        args = {**default_section, **arguments}
+        return {"type": "section", "arguments": args, "content": instruction.content,
+                "style": self.style_ids[args["#style"]], "markup": section_markup(instruction.content)}
 
+    #############################################################################
+    #                                   Title                                   #
+    #############################################################################
 
+    @instruction_rule([InstructionKind.TITLE], title_arguments, title_checks)
+    def analyze_title(self, instruction, arguments):
 
-        #############################################################################
-        #                                   Title                                   #
-        #############################################################################
-        
-        elif instruction["instruction"] == "$title":
+        #ERRORS
 
-            #ERRORS
+        # Check that the #style exists if specified
+        if "#style" in arguments:
+            style_name = arguments["#style"]
+            if style_name not in self.unique_style_names:
+                self.error_messages.append(
+                    f"Error: The referenced #style '{style_name}' in $title does not exist."
+                )
+                return None
 
-            # Check if the arguments are allowed
-            if not check_allows_arguments(instruction, title_arguments):
-                error_messages.append(
-                    f"Error: $title instruction does not allow the arguments {instruction['arguments']}."
+        # Check that $title content does not contain nested instructions
+        for title_content in instruction.content:
+            if not isinstance(title_content, Text):
+                self.error_messages.append(
+                    f"Error: Nested instruction '{title_content.kind.value}' is not allowed inside a $title."
                 )
-                continue
-            
-            # Check that the #style exists if specified
-            if "#style" in instruction["arguments"]:
-                style_name = instruction["arguments"]["#style"]
-                if style_name not in unique_style_names:
-                    error_messages.append(
-                        f"Error: The referenced #style '{style_name}' in $title does not exist."
-                    )
-                    continue
 
-            # Check that $title content does not contain nested instructions
-            for title_content in instruction.get("content", []):
-                if isinstance(title_content, dict):
-                    error_messages.append(
-                        f"Error: Nested instruction '{title_content['instruction']}' is not allowed inside a $title."
-                    )
-                    continue
-            
 
-            #WARNINGS
+        #WARNINGS
+        self.check_arguments(instruction, arguments)
 
-            # Check if the title level is in the range
-            if "#level" in instruction["arguments"]:
-                if not check_out_of_range(instruction["arguments"]["#level"], title_level_range[0], title_level_range[1]):
-                    warning_messages.append(
-                        f"Warning: The specified title level {instruction['arguments']['#level']} is out of range."
-                    )
-                    instruction["arguments"]["#level"] = default_title["#level"]
-            
-            # Assign default values (if arguments not provided)
-            args = {**default_title, **instruction["arguments"]}  # Apply default if not provided
-            doc_content.append({"type": "title", "arguments": args, "content": instruction["content"]})
-        
-           
+        # Assign default values (if arguments not provided)
+        args = {**default_title, **arguments}  # Apply default if not provided
+        return {"type": "title", "arguments": args, "content": instruction.content,
+                "style": self.style_ids[args["#style"]], "markup": title_markup(instruction.content)}
 
+    #############################################################################
+    #                          Bolt, Italic, Underlined                         #
+    #############################################################################
 
+    @instruction_rule(inline_kinds)
+    def analyze_inline(self, instruction, arguments):
+        self.error_messages.append(f"Error: {instruction.kind.value} can only be declared inside a section")
+        return None
 
+    #############################################################################
+    #                                   Include                                 #
+    #############################################################################
 
-        #############################################################################
-        #                          Bolt, Italic, Underlined                         #
-        #############################################################################
+    @instruction_rule([InstructionKind.INCLUDE])
+    def analyze_include(self, instruction, arguments):
+        # The compiler replaces the top-level $include by the included instructions before the analysis (see pdfInclude)
+        self.error_messages.append("Error: $include can only be used at the top level of a compiled document.")
+        return None
 
-        elif instruction["instruction"] in section_nested_instructions:
-            error_messages.append(f"Error: {section_content['instruction']} can only be declared inside a section")
+    #############################################################################
+    #                               Numberize Title                             #
+    #############################################################################
 
+    @instruction_rule([InstructionKind.NUMBERIZE_TITLE], numberize_title_arguments, numberize_title_checks)
+    def analyze_numberize_title(self, instruction, arguments):
 
+        #WARNINGS
+        self.check_arguments(instruction, arguments)
 
+        # Assign default values (if arguments not provided)
+        args = {**default_numberize_title, **arguments}  # Apply default if not provided
+        self.numberize_titles = args
 
+        self.is_title_numberized = True
+        return None
 
 
-        
-        #############################################################################
-        #                               Numberize Title                             #
-        #############################################################################
+def semantical_analysis(parsed_code, print_errors=False, number_titles=True):
+    """
+    Semantic analysis of a whole parsed document (see SemanticAnalyzer for the rules).
 
-        elif instruction["instruction"] == "$numberizeTitle":
+    number_titles=False leaves the titles unnumbered even if $numberizeTitle is called
+    (numberize_doc_titles can then be applied on the final content).
+    """
+    analyzer = SemanticAnalyzer()
+    doc_content = []
 
-            #ERRORS
+    # Analysing parsed data
+    for instruction in parsed_code:
+        item = analyzer.analyze_instruction(instruction)
+        if item is not None:
+            doc_content.append(item)
 
-            # Check if the arguments are allowed
-            if not check_allows_arguments(instruction, numberize_title_arguments):
-                error_messages.append(f"Error: $numberizeTitle instruction does not allow the arguments {instruction['arguments']}.")
-                continue
-            
-            #WARNINGS
-
-            # Check if the numberizeTitleStart is in the range
-            if "#numberizeTitleStart" in instruction["arguments"]:
-                if not check_out_of_range(instruction["arguments"]["#numberizeTitleStart"], title_level_range[0], title_level_range[1]):
-                    warning_messages.append(
-                        f"Warning: The specified title level {instruction['arguments']['#numberizeTitleStart']} is out of range."
-                    )
-                    instruction["arguments"]["#numberizeTitleStart"] = default_title["#level"]
-
-            # Assign default values (if arguments not provided)
-            args = {**default_numberize_title, **instruction["arguments"]}  # Apply default if not provided    
-            numberize_titles = args
-
-            is_title_numberized = True
-        
-        else:
-            error_messages.append(f"Error: Undefined instruction {instruction['instruction']}.")
+    # If numberize_title is set add numbers to the titles from the #numberizeTitleStart value and based on the #level of the title
+    if analyzer.is_title_numberized and number_titles:
+        numberize_doc_titles(doc_content, analyzer.numberize_titles)
 
+    if print_errors:
+        analyzer.print_messages()
 
-    # If numberize_title is set add numbers to the titles from the #numberizeTitleStart value and based on the #level of the title
-    if is_title_numberized:
-        try:
-            start_title_level = int(numberize_titles["#numberizeTitleStart"])
-        except ValueError:
-            start_title_level = default_numberize_title["#numberizeTitleStart"]
-
-        titles_levels = [ 1 for i in range(title_level_range[0], title_level_range[1] + 1)]
-        for item in doc_content:
-            if item["type"] == "title":
-                
-                try:
-                    title_level = int(item["arguments"]["#level"])
-                except ValueError:
-                    title_level = default_title["#level"]
-
-                if title_level < start_title_level:
-                    continue
-
-                title_number = '.'.join(str(titles_levels[i]) for i in range(start_title_level - 1, title_level)) 
-                
-                # Add number prefix to the title content
-                title_text = f"{title_number}. {''.join(item['content'])}"
-
-                # Update the title content to include the number prefix
-                item['content'] = [title_text]
-
-                # Increment the title number for the current level
-                titles_levels[title_level - 1] += 1
-
-                # Reset lower levels to ensure correct numbering for further nested titles
-                for i in range(title_level, len(titles_levels)):
-                    titles_levels[i] = 1
-                
-                
-
-    # Print out any error messages and exit
-    if error_messages and print_errors:
-        for error in error_messages:
-            print()
-            print(error)
-            print()
-         
-
-    if warning_messages and print_errors:
-        for warning in warning_messages:
-            print()
-            print(warning) 
-            print()
-
-    if len(page_number) == 0:
-        page_number = default_page_number
-
-    return styles, page_number, numberize_titles, doc_content, error_messages, warning_messages
+    return analyzer.styles, analyzer.page_number_config(), analyzer.numberize_titles, doc_content, analyzer.error_messages, analyzer.warning_messages
@@ -0,0 +1,343 @@
+"""
+Module:
+3250.1 Compilateurs
+Auteur:
+WICKI Sélien
+Date: 18.10.2026
+"""
+
+# System imports
+import os
+import json
+import time
+import asyncio
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from urllib.parse import urlsplit
+
+# Default address of the server
+default_host = "127.0.0.1"
+default_port = 8631
+
+# Requests waiting for a worker beyond the ones being compiled (more : 503), compile timeout (seconds)
+default_queue_size = 64
+default_timeout = 30.0
+
+# Largest accepted source (bytes) and largest request head (request line + headers)
+max_body_size = 16 * 1024 * 1024
+max_head_size = 16 * 1024
+
+reasons = {
+    200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed", 411: "Length Required",
+    413: "Payload Too Large", 422: "Unprocessable Entity", 500: "Internal Server Error",
+    503: "Service Unavailable", 504: "Gateway Timeout",
+}
+
+
+#############################################################################
+#                                   Worker                                  #
+#############################################################################
+
+# Set once per worker process by init_worker, reused for every request of the worker
+_worker_compiler = None
+
+
+def init_worker(strict=False, output_cache=None):
+    """Build the compiler (lexer/parser tables) and import reportlab once per worker process."""
+    global _worker_compiler
+
+    from pdfCompiler import Compiler
+    import pdfGenerator  # noqa: F401 (warm reportlab before the first request)
+
+    # The sources come from the clients : an $include must not read the files of the server
+    _worker_compiler = Compiler(strict=strict, output_cache=output_cache, includes=False)
+
+
+def warm_up():
+    """Task run once by every worker before the server accepts requests."""
+    time.sleep(0.05)  # Keeps the worker busy : the other warm up tasks go to the other workers
+    return os.getpid()
+
+
+def compile_request(source):
+    """(pdf bytes or None, error_messages, warning_messages) of a source."""
+    return _worker_compiler.compile_bytes(source)
+
+
+#############################################################################
+#                                   Server                                  #
+#############################################################################
+
+class CompileServer:
+    """
+    HTTP compile service : an asyncio front end handing the sources to a pool of worker processes
+    that keep the lexer/parser tables and reportlab loaded.
+
+    POST /compile -> the body is the source (UTF-8), the answer is the PDF (200, application/pdf,
+                     X-Pdfy-Errors / X-Pdfy-Warnings : number of messages) or the messages as JSON
+                     when no PDF could be generated (422)
+    GET /health -> state of the server as JSON (workers, admitted requests, counters), its status
+                   is "degraded" while the pool is rebuilt after a worker crash
+
+    Admission control : at most workers + queue_size requests are admitted at once (being compiled
+    or waiting for a worker), the others are answered 503 at once with a Retry-After header. A
+    compilation taking more than `timeout` seconds is answered 504. Its worker cannot be
+    interrupted : the request stays admitted until the worker is done with it, so a burst of slow
+    documents still fills the queue and turns new requests away.
+
+    A worker that crashes breaks the whole pool (BrokenProcessPool) : its requests are answered
+    500 and the pool is replaced by a new one, warmed before the server reports "ok" again.
+    """
+
+    def __init__(self, workers=None, queue_size=default_queue_size, timeout=default_timeout, strict=False,
+                 output_cache=None):
+        self.workers = workers or os.cpu_count()
+        self.queue_size = queue_size
+        self.timeout = timeout
+        self.strict = strict
+        self.output_cache = output_cache
+
+        self.executor = None
+        self.server = None
+        self.started = None
+        self.warming = None  # Warm up of the pool replacing a broken one, None once it is done
+
+        self.admitted = 0  # Requests being compiled or waiting for a worker
+        # compiled -> 200, invalid -> 422, rejected -> 503, timeouts -> 504, failed -> 500 (worker crashed),
+        # restarts -> pools replaced after a crash
+        self.stats = {"compiled": 0, "invalid": 0, "rejected": 0, "timeouts": 0, "failed": 0, "restarts": 0}
+
+    #############################################################################
+    #                                  Lifecycle                                #
+    #############################################################################
+
+    async def start(self, host=default_host, port=default_port, unix_socket=None):
+        """Start the workers (warm), then listen on host:port or on the unix socket."""
+        self.executor = self.new_executor()
+        await self.warm_up(self.executor)
+
+        if unix_socket:
+            self.server = await asyncio.start_unix_server(self.handle_connection, path=unix_socket, limit=max_head_size)
+        else:
+            self.server = await asyncio.start_server(self.handle_connection, host, port, limit=max_head_size)
+        self.started = time.monotonic()
+        return self.server
+
+    def addresses(self):
+        return [listening.getsockname() for listening in self.server.sockets]
+
+    async def serve_forever(self):
+        async with self.server:
+            await self.server.serve_forever()
+
+    async def close(self):
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+        if self.warming is not None:
+            self.warming.cancel()
+        if self.executor is not None:
+            self.executor.shutdown(wait=True, cancel_futures=True)
+
+    #############################################################################
+    #                                    Pool                                   #
+    #############################################################################
+
+    def new_executor(self):
+        return ProcessPoolExecutor(max_workers=self.workers, initializer=init_worker, initargs=(self.strict, self.output_cache))
+
+    async def warm_up(self, executor):
+        """Start every worker of the pool and load the compiler in it."""
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(*(loop.run_in_executor(executor, warm_up) for _ in range(self.workers)))
+
+    def restart_pool(self, broken):
+        """Replace the broken pool by a new one (once, whatever the number of requests it failed)."""
+        if self.executor is not broken:
+            return  # Already replaced
+        self.stats["restarts"] += 1
+        broken.shutdown(wait=False, cancel_futures=True)
+        self.executor = self.new_executor()
+        self.warming = asyncio.ensure_future(self.warm_up_replacement(self.executor))
+
+    async def warm_up_replacement(self, executor):
+        try:
+            await self.warm_up(executor)
+        except BrokenProcessPool:
+            self.restart_pool(executor)  # Broken again : the next pool reports the state
+            return
+        if self.executor is executor:
+            self.warming = None
+
+    #############################################################################
+    #                                    HTTP                                   #
+    #############################################################################
+
+    async def handle_connection(self, reader, writer):
+        """Answer the requests of a connection (HTTP/1.1 keep-alive) until it is closed."""
+        try:
+            while True:
+                request = await self.read_request(reader, writer)
+                if request is None:
+                    break
+                if isinstance(request, int):  # Malformed request : answered, then the connection is closed
+                    await self.send(writer, request, {"error": reasons[request]}, keep_alive=False)
+                    break
+
+                method, path, version, headers, body = request
+                status, payload, extra_headers = await self.route(method, path, body)
+                # HTTP/1.1 connections are kept open unless the client closes them, HTTP/1.0 ones on request
+                connection = headers.get("connection", "").lower()
+                keep_alive = connection != "close" if version == "HTTP/1.1" else connection == "keep-alive"
+                await self.send(writer, status, payload, extra_headers, keep_alive)
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def read_request(self, reader, writer):
+        """
+        (method, path, version, headers, body), None at the end of the connection, an HTTP status for a bad request.
+        A client sending "Expect: 100-continue" waits for the 100 Continue answer before sending the body.
+        """
+        try:
+            head = await reader.readuntil(b"\r\n\r\n")
+        except asyncio.IncompleteReadError as e:
+            return None if not e.partial.strip() else 400
+        except asyncio.LimitOverrunError:
+            return 400
+
+        lines = head.decode("latin-1").split("\r\n")
+        parts = lines[0].split(" ")
+        if len(parts) != 3 or not parts[2].startswith("HTTP/1."):
+            return 400
+        method, target, version = parts
+
+        headers = {}
+        for line in lines[1:]:
+            if line:
+                name, _, value = line.partition(":")
+                headers[name.strip().lower()] = value.strip()
+
+        body = b""
+        if method == "POST":
+            if "content-length" not in headers:
+                return 411  # Chunked bodies are not supported
+            try:
+                length = int(headers["content-length"])
+            except ValueError:
+                return 400
+            if length > max_body_size:
+                return 413
+            if headers.get("expect", "").lower() == "100-continue" and version == "HTTP/1.1":
+                writer.write(b"HTTP/1.1 100 Continue\r\n\r\n")
+                await writer.drain()
+            body = await reader.readexactly(length)
+
+        return method, urlsplit(target).path, version, headers, body
+
+    async def send(self, writer, status, payload, extra_headers=None, keep_alive=True):
+        """Write a response, payload being the PDF (bytes) or a JSON serializable value."""
+        if isinstance(payload, bytes):
+            content_type, body = "application/pdf", payload
+        else:
+            content_type, body = "application/json", json.dumps(payload).encode("utf-8")
+
+        head = [f"HTTP/1.1 {status} {reasons[status]}", f"Content-Type: {content_type}", f"Content-Length: {len(body)}"]
+        head += [f"{name}: {value}" for name, value in (extra_headers or {}).items()]
+        head.append(f"Connection: {'keep-alive' if keep_alive else 'close'}")
+        writer.write(("\r\n".join(head) + "\r\n\r\n").encode("latin-1") + body)
+        await writer.drain()
+
+    async def route(self, method, path, body):
+        """(status, payload, headers) of a request."""
+        if path == "/health":
+            if method != "GET":
+                return 405, {"error": "Use GET"}, {"Allow": "GET"}
+            return 200, self.health(), {}
+        if path == "/compile":
+            if method != "POST":
+                return 405, {"error": "Use POST with the source as body"}, {"Allow": "POST"}
+            return await self.compile(body)
+        return 404, {"error": f"Unknown path {path}, use POST /compile or GET /health"}, {}
+
+    #############################################################################
+    #                                  Compile                                  #
+    #############################################################################
+
+    async def compile(self, body):
+        try:
+            source = body.decode("utf-8")
+        except UnicodeDecodeError:
+            return 400, {"error": "The source must be UTF-8"}, {}
+
+        # Admission control : no unbounded queue in front of the workers
+        if self.admitted >= self.workers + self.queue_size:
+            self.stats["rejected"] += 1
+            return 503, {"error": "Too many requests, retry later"}, {"Retry-After": "1"}
+
+        executor = self.executor
+        try:
+            future = asyncio.get_running_loop().run_in_executor(executor, compile_request, source)
+        except BrokenProcessPool as e:  # Broken by a crash whose requests are not answered yet
+            self.restart_pool(executor)
+            self.stats["failed"] += 1
+            return 500, {"error": f"{type(e).__name__}: {e}"}, {}
+        self.admitted += 1
+        # Released when the worker is done, even after a timeout
+        future.add_done_callback(self.release)
+
+        try:
+            pdf, error_messages, warning_messages = await asyncio.wait_for(asyncio.shield(future), self.timeout)
+        except asyncio.TimeoutError:
+            self.stats["timeouts"] += 1
+            return 504, {"error": f"Compilation longer than {self.timeout} s"}, {}
+        except Exception as e:  # Worker crashed
+            if isinstance(e, BrokenProcessPool):
+                self.restart_pool(executor)
+            self.stats["failed"] += 1
+            return 500, {"error": f"{type(e).__name__}: {e}"}, {}
+
+        if pdf is None:
+            self.stats["invalid"] += 1
+            return 422, {"errors": error_messages, "warnings": warning_messages}, {}
+
+        self.stats["compiled"] += 1
+        return 200, pdf, {"X-Pdfy-Errors": len(error_messages), "X-Pdfy-Warnings": len(warning_messages)}
+
+    def release(self, future):
+        self.admitted -= 1
+        if not future.cancelled():
+            future.exception()  # Retrieved : no "exception never retrieved" warning after a timeout
+
+    def health(self):
+        return {
+            "status": "ok" if self.warming is None else "degraded",
+            "workers": self.workers,
+            "queue_size": self.queue_size,
+            "admitted": self.admitted,
+            "timeout": self.timeout,
+            "uptime": time.monotonic() - self.started,
+            **self.stats,
+        }
+
+
+def serve(host=default_host, port=default_port, unix_socket=None, **options):
+    """Run a CompileServer until Ctrl+C (options : see CompileServer)."""
+    compile_server = CompileServer(**options)
+
+    async def main():
+        await compile_server.start(host, port, unix_socket)
+        print(f"Serving on {', '.join(map(str, compile_server.addresses()))} with {compile_server.workers} workers "
+              f"(POST /compile, GET /health, Ctrl+C to stop)", flush=True)
+        try:
+            await compile_server.serve_forever()
+        finally:
+            await compile_server.close()
+
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        print("\nServer stopped")
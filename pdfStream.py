@@ -0,0 +1,206 @@
+"""
+Module:
+3250.1 Compilateurs
+Auteur:
+WICKI Sélien
+Date: 18.10.2026
+"""
+
+# System imports
+import io
+import re
+import contextlib
+
+from pdfCompiler import Compiler, parser_errors
+from pdfSemantic import SemanticAnalyzer, TitleNumbering
+from pdfAst import InstructionKind
+
+# Size of the blocks read from the input
+default_chunk_size = 1 << 16
+
+# Characters changing the nesting of the source : arguments, content, strings
+structure_characters = re.compile(r'[(){}"]')
+non_blank = re.compile(r'\S')
+
+
+def iter_instruction_sources(stream, chunk_size=default_chunk_size):
+    """
+    Cut the source read from a text file handle into its top-level instructions.
+
+    Yields (source, first_line) pairs, source being the text of one top-level instruction
+    ($style(...), $section(...){...}, ...) and first_line its line number in the file.
+    The input is read by blocks of chunk_size characters : only the block being scanned and
+    the instruction being cut are in memory. Text between instructions is kept with the next
+    instruction, so that the parser reports it.
+    """
+    buffer = ""
+    buffer_line = 1  # Line number of buffer[0]
+    position = 0
+
+    start = None  # Start of the current instruction in buffer
+    depth = 0  # Depth of braces
+    in_arguments = False
+    in_string = False
+    arguments_closed = False  # ')' of the instruction seen at depth 0, waiting to know if a '{' follows
+    end_of_file = False
+
+    def cut(end):
+        nonlocal buffer, buffer_line, position, start
+        source = buffer[start:end]
+        first_line = buffer_line + buffer.count("\n", 0, start)
+        buffer_line += buffer.count("\n", 0, end)
+        buffer = buffer[end:]
+        position -= end
+        start = None
+        return source, first_line
+
+    while True:
+        if position >= len(buffer):
+            if end_of_file:
+                break
+            block = stream.read(chunk_size)
+            if not block:
+                end_of_file = True
+            else:
+                if start is None:
+                    # Nothing to keep before the new block
+                    buffer_line += buffer.count("\n")
+                    buffer = ""
+                    position = 0
+                buffer += block
+            continue
+
+        # Skip blanks between two instructions
+        if start is None or arguments_closed:
+            match = non_blank.search(buffer, position)
+            if match is None:
+                position = len(buffer)
+                continue
+            position = match.start()
+
+            if arguments_closed:
+                arguments_closed = False
+                if buffer[position] != "{":
+                    yield cut(position)
+                    continue
+            else:
+                start = position
+
+        match = structure_characters.search(buffer, position)
+        if match is None:
+            position = len(buffer)
+            continue
+
+        character = match.group()
+        position = match.end()
+
+        if in_string:
+            if character == '"':
+                in_string = False
+        elif character == '"':
+            in_string = in_arguments
+        elif character == "(":
+            in_arguments = True
+        elif character == ")":
+            in_arguments = False
+            if depth == 0:
+                arguments_closed = True
+        elif character == "{":
+            depth += 1
+        elif character == "}":
+            depth -= 1
+            if depth <= 0:
+                depth = 0
+                yield cut(position)
+
+    # End of the input : the rest (last instruction or unterminated text) goes to the parser
+    if start is not None and buffer[start:].strip():
+        yield cut(len(buffer))
+
+
+def iter_instructions(stream, compiler=None, error_messages=None, chunk_size=default_chunk_size, source_file=None,
+                      parser_messages=None):
+    """
+    Parse the input one top-level instruction at a time, yields the parsed instructions.
+    A syntax error only drops the instruction containing it, its message is added to error_messages.
+    The messages of the lexer and the parser are printed and added to parser_messages as errors
+    (see pdfCompiler.parser_errors).
+    An $include yields the instructions of the included file (parsed as a whole, see pdfInclude),
+    its path is relative to the directory of source_file.
+    """
+    compiler = compiler if compiler is not None else Compiler()
+
+    for source, first_line in iter_instruction_sources(stream, chunk_size):
+        with contextlib.redirect_stdout(io.StringIO()) as parser_output:
+            parsed_data = compiler.parse(source, first_line)
+        report_parser_output(parser_output, parser_messages)
+        if not parsed_data:
+            if error_messages is not None:
+                error_messages.append(f"Error: Syntax error in the instruction starting at line {first_line}.")
+            continue
+        for instruction in parsed_data:
+            if instruction.kind is not InstructionKind.INCLUDE:
+                yield instruction
+                continue
+            with contextlib.redirect_stdout(io.StringIO()) as parser_output:
+                resolution = compiler.resolve_includes([instruction], source_file)
+            report_parser_output(parser_output, parser_messages)
+            if error_messages is not None:
+                error_messages.extend(resolution.errors)
+            yield from resolution.instructions
+
+
+def report_parser_output(parser_output, parser_messages):
+    """Print the messages of the lexer and the parser, and add them to parser_messages."""
+    print(parser_output.getvalue(), end="")
+    if parser_messages is not None:
+        parser_messages.extend(parser_errors(parser_output.getvalue()))
+
+
+def iter_analyzed(instructions, analyzer):
+    """
+    Semantic analysis as a pipeline : yields the analysed content items ($section, $title) one
+    at a time, the declarations update the state of the analyzer.
+
+    Title numbering applies to the titles written after $numberizeTitle (a stream cannot go back
+    to number the titles already produced).
+    """
+    numbering = None
+    for instruction in instructions:
+        item = analyzer.analyze_instruction(instruction)
+
+        if analyzer.is_title_numberized and numbering is None:
+            numbering = TitleNumbering(analyzer.numberize_titles)
+
+        if item is not None:
+            if numbering is not None and item["type"] == "title":
+                numbering.number(item)
+            yield item
+
+
+def compile_stream(input_file, output_file, compiler=None, chunk_size=default_chunk_size):
+    """
+    Compile input_file to output_file in bounded memory : the source is read by blocks, each
+    top-level instruction is parsed, analysed and laid out before the next one is read.
+    input_file -> path or text file object (sys.stdin), output_file -> path or binary file object
+    Returns the (error_messages, warning_messages) of the compilation.
+
+    Unlike Compiler.compile, the PDF is always generated (errors are only known at the end).
+    """
+    from pdfGenerator import create_pdf_stream
+
+    compiler = compiler if compiler is not None else Compiler()
+    analyzer = SemanticAnalyzer()
+    parser_messages = []  # Printed by the parser as they come
+
+    from_file = not hasattr(input_file, "read")
+    source = open(input_file, 'r') if from_file else contextlib.nullcontext(input_file)
+    with source as f:
+        instructions = iter_instructions(f, compiler, analyzer.error_messages, chunk_size, input_file if from_file else None,
+                                         parser_messages)
+        create_pdf_stream(analyzer, iter_analyzed(instructions, analyzer), output_file, compiler.invariant)
+
+    if compiler.print_errors:
+        analyzer.print_messages()
+
+    return parser_messages + analyzer.error_messages, analyzer.warning_messages
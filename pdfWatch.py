@@ -0,0 +1,143 @@
+"""
+Module:
+3250.1 Compilateurs
+Auteur:
+WICKI Sélien
+Date: 18.10.2026
+"""
+
+# System imports
+import os
+import time
+import threading
+
+from pdfCompiler import Compiler
+from pdfIncremental import IncrementalCompiler
+import pdfFonts
+
+# Time between two checks of the watched files and quiet time after a change before rebuilding (seconds)
+default_interval = 0.1
+default_debounce = 0.2
+
+
+def file_state(path):
+    """(modification time, size) of a file, None when it does not exist (an editor replacing it)."""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+class Watcher:
+    """
+    Rebuild the PDF of a source file each time the source (or a file it includes, or a font file
+    it uses) is saved.
+
+    The process stays warm between the builds : lexer and parser tables, reportlab, stylesheets
+    and fonts are loaded once. Every build is an incremental compilation (see IncrementalCompiler)
+    whose cache stays in memory : only the changed top-level instructions are parsed, analysed and
+    built again, the unchanged paragraphs keep their broken lines.
+
+    The files are polled every `interval` seconds. A change starts a rebuild once the files have
+    not changed for `debounce` seconds, so a burst of saves gives one build.
+    """
+
+    def __init__(self, input_file, output_file, compiler=None, interval=default_interval, debounce=default_debounce,
+                 cache_dir=None):
+        self.input_file = input_file
+        self.output_file = output_file
+        self.interval = interval
+        self.debounce = debounce
+
+        compiler = compiler if compiler is not None else Compiler(print_errors=True)
+        options = {"cache_dir": cache_dir} if cache_dir is not None else {}
+        # The first build starts from the cache of --incremental, the later ones from memory
+        self.incremental = IncrementalCompiler(compiler=compiler, persist=False, reuse_parse=True, **options)
+
+        self.stop_event = threading.Event()
+        self.builds = []  # (build time, time to fresh PDF, errors, warnings) of each build
+
+    def dependencies(self):
+        """Files of the document : the source, the files it includes and the font files it uses."""
+        return [self.input_file] + self.incremental.included_files + pdfFonts.registered_font_files()
+
+    def snapshot(self):
+        return {path: file_state(path) for path in self.dependencies()}
+
+    #############################################################################
+    #                                   Build                                   #
+    #############################################################################
+
+    def build(self, changed=()):
+        """
+        Compile the source and report the build. changed -> files changed since the previous
+        build, the time to fresh PDF is measured from the last of their modification times.
+        """
+        saved = max((state[0] for state in (file_state(path) for path in changed) if state), default=None)
+        font_files = set(pdfFonts.registered_font_files()).intersection(changed)
+        if font_files:
+            pdfFonts.reload_fonts(font_files)
+
+        start = time.perf_counter()
+        try:
+            with open(self.input_file, 'r') as f:
+                input_string = f.read()
+            error_messages, warning_messages = self.incremental.compile(input_string, self.output_file, self.input_file)
+        except Exception as e:  # The watch goes on, the next save may fix it
+            print(f"Build failed: {type(e).__name__}: {e}")
+            return
+        elapsed = time.perf_counter() - start
+
+        fresh = time.time() - saved / 1e9 if saved is not None else None
+        self.builds.append((elapsed, fresh, len(error_messages), len(warning_messages)))
+
+        stats = self.incremental.stats
+        report = f"[{time.strftime('%H:%M:%S')}] {self.output_file} built in {elapsed:.3f} s"
+        if fresh is not None:
+            report += f", fresh PDF {fresh:.3f} s after the save"
+        report += f" ({stats['analysed']} instructions analysed, {stats['reused']} reused, {stats['built']} items laid out from scratch"
+        report += f", {len(error_messages)} errors, {len(warning_messages)} warnings)"
+        print(report, flush=True)
+
+    #############################################################################
+    #                                   Watch                                   #
+    #############################################################################
+
+    def run(self):
+        """Build once, then rebuild after each change until stop() (or Ctrl+C)."""
+        print(f"Watching {self.input_file} (Ctrl+C to stop)", flush=True)
+        self.build()
+        built = self.snapshot()
+        current = built
+        changed_at = None
+
+        try:
+            while not self.stop_event.wait(self.interval):
+                state = self.snapshot()
+                if state != current:
+                    current = state
+                    changed_at = time.monotonic()  # Debounce : wait for the end of the burst
+                    continue
+
+                if changed_at is not None and time.monotonic() - changed_at >= self.debounce:
+                    if current.get(self.input_file) is None:
+                        continue  # Source removed, wait for it to come back
+                    changed = [path for path in set(current) | set(built) if current.get(path) != built.get(path)]
+                    changed_at = None
+                    built = current
+                    self.build(changed)
+                    # New dependencies of the build (fonts) are watched from their state after it,
+                    # a file saved during the build is still seen as changed
+                    built = current = {path: built.get(path, state) for path, state in self.snapshot().items()}
+        except KeyboardInterrupt:
+            print()
+        print("Watch stopped")
+
+    def stop(self):
+        self.stop_event.set()
+
+
+def watch(input_file, output_file, compiler=None, **options):
+    """Watch input_file and rebuild output_file after each save (see Watcher)."""
+    Watcher(input_file, output_file, compiler, **options).run()
@@ -0,0 +1,11 @@
+# pdflextab.py. This file automatically created by PLY (version 3.11). Don't edit!
+_tabversion   = '3.10'
+_lextokens    = set(('ARG_FILE', 'ARG_FONT', 'ARG_FONT_COLOR', 'ARG_FONT_SIZE', 'ARG_LEVEL', 'ARG_NAME', 'ARG_NUMBERIZE_TITLE_START', 'ARG_PAGE_NUMBER_FONT', 'ARG_PAGE_NUMBER_FONT_COLOR', 'ARG_PAGE_NUMBER_FONT_SIZE', 'ARG_PAGE_NUMBER_POSITION', 'ARG_PAGE_NUMBER_START', 'ARG_STYLE', 'BOLD', 'COMMA', 'EQUALS', 'INCLUDE', 'ITALIC', 'LBRACE', 'LPAREN', 'NUMBER', 'NUMBERIZE_TITLE', 'PAGE_NUMBER', 'RBRACE', 'RPAREN', 'SECTION', 'STRING', 'STYLE', 'TEXT', 'TITLE', 'UNDERLINED'))
+_lexreflags   = 64
+_lexliterals  = ''
+_lexstateinfo = {'INITIAL': 'inclusive', 'arg': 'inclusive'}
+_lexstatere   = {'INITIAL': [("(?P<t_newline>\\n+)|(?P<t_STYLE>\\$style)|(?P<t_PAGE_NUMBER>\\$pageNumber)|(?P<t_NUMBERIZE_TITLE>\\$numberizeTitle)|(?P<t_TITLE>\\$title)|(?P<t_SECTION>\\$section)|(?P<t_BOLD>\\$bold)|(?P<t_ITALIC>\\$italic)|(?P<t_UNDERLINED>\\$underlined)|(?P<t_INCLUDE>\\$include)|(?P<t_TEXT>[a-zA-Z0-9\\s\\.\\,\\!\\?\\-\\é\\è\\ê\\ë\\à\\ç\\â\\ä\\î\\ï\\ô\\ö\\ù\\û\\ü\\'\\;\\_]+)|(?P<t_LPAREN>\\()|(?P<t_RPAREN>\\))|(?P<t_LBRACE>\\{)|(?P<t_RBRACE>\\})", [None, ('t_newline', 'newline'), ('t_STYLE', 'STYLE'), ('t_PAGE_NUMBER', 'PAGE_NUMBER'), ('t_NUMBERIZE_TITLE', 'NUMBERIZE_TITLE'), ('t_TITLE', 'TITLE'), ('t_SECTION', 'SECTION'), ('t_BOLD', 'BOLD'), ('t_ITALIC', 'ITALIC'), ('t_UNDERLINED', 'UNDERLINED'), ('t_INCLUDE', 'INCLUDE'), ('t_TEXT', 'TEXT'), ('t_LPAREN', 'LPAREN'), ('t_RPAREN', 'RPAREN'), ('t_LBRACE', 'LBRACE'), ('t_RBRACE', 'RBRACE')])], 'arg': [('(?P<t_arg_ARG_NAME>\\#name)|(?P<t_arg_ARG_STYLE>\\#style)|(?P<t_arg_ARG_FONT_SIZE>\\#fontSize)|(?P<t_arg_ARG_FONT>\\#font)|(?P<t_arg_ARG_FONT_COLOR>\\#fontColor)|(?P<t_arg_ARG_LEVEL>\\#level)|(?P<t_arg_ARG_PAGE_NUMBER_POSITION>\\#pageNumberPosition)|(?P<t_arg_ARG_PAGE_NUMBER_FONT_SIZE>\\#pageNumberFontSize)|(?P<t_arg_ARG_PAGE_NUMBER_FONT>\\#pageNumberFont)|(?P<t_arg_ARG_PAGE_NUMBER_FONT_COLOR>\\#pageNumberFontColor)|(?P<t_arg_ARG_PAGE_NUMBER_START>\\#pageNumberStart)|(?P<t_arg_ARG_NUMBERIZE_TITLE_START>\\#numberizeTitleStart)|(?P<t_arg_ARG_FILE>\\#file)|(?P<t_arg_STRING>"[^"]*")|(?P<t_arg_NUMBER>[0-9][0-9]*)|(?P<t_arg_COMMA>,)|(?P<t_arg_EQUALS>=)', [None, ('t_arg_ARG_NAME', 'ARG_NAME'), ('t_arg_ARG_STYLE', 'ARG_STYLE'), ('t_arg_ARG_FONT_SIZE', 'ARG_FONT_SIZE'), ('t_arg_ARG_FONT', 'ARG_FONT'), ('t_arg_ARG_FONT_COLOR', 'ARG_FONT_COLOR'), ('t_arg_ARG_LEVEL', 'ARG_LEVEL'), ('t_arg_ARG_PAGE_NUMBER_POSITION', 'ARG_PAGE_NUMBER_POSITION'), ('t_arg_ARG_PAGE_NUMBER_FONT_SIZE', 'ARG_PAGE_NUMBER_FONT_SIZE'), ('t_arg_ARG_PAGE_NUMBER_FONT', 'ARG_PAGE_NUMBER_FONT'), ('t_arg_ARG_PAGE_NUMBER_FONT_COLOR', 'ARG_PAGE_NUMBER_FONT_COLOR'), ('t_arg_ARG_PAGE_NUMBER_START', 'ARG_PAGE_NUMBER_START'), ('t_arg_ARG_NUMBERIZE_TITLE_START', 'ARG_NUMBERIZE_TITLE_START'), ('t_arg_ARG_FILE', 'ARG_FILE'), ('t_arg_STRING', 'STRING'), ('t_arg_NUMBER', 'NUMBER'), ('t_arg_COMMA', 'COMMA'), ('t_arg_EQUALS', 'EQUALS')]), ("(?P<t_newline>\\n+)|(?P<t_STYLE>\\$style)|(?P<t_PAGE_NUMBER>\\$pageNumber)|(?P<t_NUMBERIZE_TITLE>\\$numberizeTitle)|(?P<t_TITLE>\\$title)|(?P<t_SECTION>\\$section)|(?P<t_BOLD>\\$bold)|(?P<t_ITALIC>\\$italic)|(?P<t_UNDERLINED>\\$underlined)|(?P<t_INCLUDE>\\$include)|(?P<t_TEXT>[a-zA-Z0-9\\s\\.\\,\\!\\?\\-\\é\\è\\ê\\ë\\à\\ç\\â\\ä\\î\\ï\\ô\\ö\\ù\\û\\ü\\'\\;\\_]+)|(?P<t_LPAREN>\\()|(?P<t_RPAREN>\\))|(?P<t_LBRACE>\\{)|(?P<t_RBRACE>\\})", [None, ('t_newline', 'newline'), ('t_STYLE', 'STYLE'), ('t_PAGE_NUMBER', 'PAGE_NUMBER'), ('t_NUMBERIZE_TITLE', 'NUMBERIZE_TITLE'), ('t_TITLE', 'TITLE'), ('t_SECTION', 'SECTION'), ('t_BOLD', 'BOLD'), ('t_ITALIC', 'ITALIC'), ('t_UNDERLINED', 'UNDERLINED'), ('t_INCLUDE', 'INCLUDE'), ('t_TEXT', 'TEXT'), ('t_LPAREN', 'LPAREN'), ('t_RPAREN', 'RPAREN'), ('t_LBRACE', 'LBRACE'), ('t_RBRACE', 'RBRACE')])]}
+_lexstateignore = {'INITIAL': ' \t', 'arg': ' \t'}
+_lexstateerrorf = {'INITIAL': 't_error', 'arg': 't_error'}
+_lexstateeoff = {}
+_lexsignature = 'af3f1816f5af8039338fcce5e05b2f5b'
@@ -0,0 +1,67 @@
+
+# pdfparsetab.py
+# This file is automatically generated. Do not edit.
+# pylint: disable=W,C,R
+_tabversion = '3.10'
+
+_lr_method = 'LALR'
+
+_lr_signature = 'ARG_FILE ARG_FONT ARG_FONT_COLOR ARG_FONT_SIZE ARG_LEVEL ARG_NAME ARG_NUMBERIZE_TITLE_START ARG_PAGE_NUMBER_FONT ARG_PAGE_NUMBER_FONT_COLOR ARG_PAGE_NUMBER_FONT_SIZE ARG_PAGE_NUMBER_POSITION ARG_PAGE_NUMBER_START ARG_STYLE BOLD COMMA EQUALS INCLUDE ITALIC LBRACE LPAREN NUMBER NUMBERIZE_TITLE PAGE_NUMBER RBRACE RPAREN SECTION STRING STYLE TEXT TITLE UNDERLINEDdocument : instructions\n    instructions :    instructions instruction\n                    | instruction\n                 \n    instruction :     TITLE LPAREN arguments RPAREN LBRACE content RBRACE\n                    | TITLE LPAREN RPAREN LBRACE content RBRACE\n                    | SECTION LPAREN arguments RPAREN LBRACE content RBRACE\n                    | SECTION LPAREN RPAREN LBRACE content RBRACE\n                    | BOLD LPAREN RPAREN LBRACE bold_content RBRACE\n                    | ITALIC LPAREN RPAREN LBRACE italic_content RBRACE\n                    | UNDERLINED LPAREN RPAREN LBRACE underlined_content RBRACE\n                    | STYLE LPAREN arguments RPAREN \n                    | PAGE_NUMBER LPAREN arguments RPAREN\n                    | NUMBERIZE_TITLE LPAREN arguments RPAREN\n                    | NUMBERIZE_TITLE LPAREN RPAREN\n                    | INCLUDE LPAREN arguments RPAREN\n    arguments : arguments COMMA argument\n                 | argumentargument :     ARG_NAME EQUALS STRING\n                    | ARG_STYLE EQUALS STRING\n                    | ARG_FONT_SIZE EQUALS NUMBER\n                    | ARG_FONT EQUALS STRING\n                    | ARG_FONT_COLOR EQUALS STRING\n                    | ARG_LEVEL EQUALS NUMBER\n                    | ARG_PAGE_NUMBER_POSITION EQUALS STRING\n                    | ARG_PAGE_NUMBER_FONT_SIZE EQUALS NUMBER\n                    | ARG_PAGE_NUMBER_FONT EQUALS STRING\n                    | ARG_PAGE_NUMBER_FONT_COLOR EQUALS STRING\n                    | ARG_PAGE_NUMBER_START EQUALS NUMBER\n                    | ARG_NUMBERIZE_TITLE_START EQUALS NUMBER\n                    | ARG_FILE EQUALS STRING\n    content :      content TEXT\n                    | TEXT\n                    | content instruction\n                    | instructionbold_content : TEXTitalic_content : TEXTunderlined_content : TEXT'
+    
+_lr_action_items = {'TITLE':([0,2,3,13,47,51,66,70,71,72,73,74,76,77,78,92,93,100,101,102,103,104,105,106,107,108,109,110,],[4,4,-3,-2,-14,4,4,-11,-12,-13,-15,4,4,-32,-34,4,4,4,-5,-31,-33,4,-7,-8,-9,-10,-4,-6,]),'SECTION':([0,2,3,13,47,51,66,70,71,72,73,74,76,77,78,92,93,100,101,102,103,104,105,106,107,108,109,110,],[5,5,-3,-2,-14,5,5,-11,-12,-13,-15,5,5,-32,-34,5,5,5,-5,-31,-33,5,-7,-8,-9,-10,-4,-6,]),'BOLD':([0,2,3,13,47,51,66,70,71,72,73,74,76,77,78,92,93,100,101,102,103,104,105,106,107,108,109,110,],[6,6,-3,-2,-14,6,6,-11,-12,-13,-15,6,6,-32,-34,6,6,6,-5,-31,-33,6,-7,-8,-9,-10,-4,-6,]),'ITALIC':([0,2,3,13,47,51,66,70,71,72,73,74,76,77,78,92,93,100,101,102,103,104,105,106,107,108,109,110,],[7,7,-3,-2,-14,7,7,-11,-12,-13,-15,7,7,-32,-34,7,7,7,-5,-31,-33,7,-7,-8,-9,-10,-4,-6,]),'UNDERLINED':([0,2,3,13,47,51,66,70,71,72,73,74,76,77,78,92,93,100,101,102,103,104,105,106,107,108,109,110,],[8,8,-3,-2,-14,8,8,-11,-12,-13,-15,8,8,-32,-34,8,8,8,-5,-31,-33,8,-7,-8,-9,-10,-4,-6,]),'STYLE':([0,2,3,13,47,51,66,70,71,72,73,74,76,77,78,92,93,100,101,102,103,104,105,106,107,108,109,110,],[9,9,-3,-2,-14,9,9,-11,-12,-13,-15,9,9,-32,-34,9,9,9,-5,-31,-33,9,-7,-8,-9,-10,-4,-6,]),'PAGE_NUMBER':([0,2,3,13,47,51,66,70,71,72,73,74,76,77,78,92,93,100,101,102,103,104,105,106,107,108,109,110,],[10,10,-3,-2,-14,10,10,-11,-12,-13,-15,10,10,-32,-34,10,10,10,-5,-31,-33,10,-7,-8,-9,-10,-4,-6,]),'NUMBERIZE_TITLE':([0,2,3,13,47,51,66,70,71,72,73,74,76,77,78,92,93,100,101,102,103,104,105,106,107,108,109,110,],[11,11,-3,-2,-14,11,11,-11,-12,-13,-15,11,11,-32,-34,11,11,11,-5,-31,-33,11,-7,-8,-9,-10,-4,-6,]),'INCLUDE':([0,2,3,13,47,51,66,70,71,72,73,74,76,77,78,92,93,100,101,102,103,104,105,106,107,108,109,110,],[12,12,-3,-2,-14,12,12,-11,-12,-13,-15,12,12,-32,-34,12,12,12,-5,-31,-33,12,-7,-8,-9,-10,-4,-6,]),'$end':([1,2,3,13,47,70,71,72,73,101,105,106,107,108,109,110,],[0,-1,-3,-2,-14,-11,-12,-13,-15,-5,-7,-8,-9,-10,-4,-6,]),'LPAREN':([4,5,6,7,8,9,10,11,12,],[14,15,16,17,18,19,20,21,22,]),'RPAREN':([14,15,16,17,18,21,23,25,39,44,45,46,48,75,79,80,81,82,83,84,85,86,87,88,89,90,91,],[24,40,41,42,43,47,49,-17,65,70,71,72,73,-16,-18,-19,-20,-21,-22,-23,-24,-25,-26,-27,-28,-29,-30,]),'ARG_NAME':([14,15,19,20,21,22,50,],[26,26,26,26,26,26,26,]),'ARG_STYLE':([14,15,19,20,21,22,50,],[27,27,27,27,27,27,27,]),'ARG_FONT_SIZE':([14,15,19,20,21,22,50,],[28,28,28,28,28,28,28,]),'ARG_FONT':([14,15,19,20,21,22,50,],[29,29,29,29,29,29,29,]),'ARG_FONT_COLOR':([14,15,19,20,21,22,50,],[30,30,30,30,30,30,30,]),'ARG_LEVEL':([14,15,19,20,21,22,50,],[31,31,31,31,31,31,31,]),'ARG_PAGE_NUMBER_POSITION':([14,15,19,20,21,22,50,],[32,32,32,32,32,32,32,]),'ARG_PAGE_NUMBER_FONT_SIZE':([14,15,19,20,21,22,50,],[33,33,33,33,33,33,33,]),'ARG_PAGE_NUMBER_FONT':([14,15,19,20,21,22,50,],[34,34,34,34,34,34,34,]),'ARG_PAGE_NUMBER_FONT_COLOR':([14,15,19,20,21,22,50,],[35,35,35,35,35,35,35,]),'ARG_PAGE_NUMBER_START':([14,15,19,20,21,22,50,],[36,36,36,36,36,36,36,]),'ARG_NUMBERIZE_TITLE_START':([14,15,19,20,21,22,50,],[37,37,37,37,37,37,37,]),'ARG_FILE':([14,15,19,20,21,22,50,],[38,38,38,38,38,38,38,]),'COMMA':([23,25,39,44,45,46,48,75,79,80,81,82,83,84,85,86,87,88,89,90,91,],[50,-17,50,50,50,50,50,-16,-18,-19,-20,-21,-22,-23,-24,-25,-26,-27,-28,-29,-30,]),'LBRACE':([24,40,41,42,43,49,65,],[51,66,67,68,69,74,92,]),'EQUALS':([26,27,28,29,30,31,32,33,34,35,36,37,38,],[52,53,54,55,56,57,58,59,60,61,62,63,64,]),'RBRACE':([47,70,71,72,73,76,77,78,93,94,95,96,97,98,99,100,101,102,103,104,105,106,107,108,109,110,],[-14,-11,-12,-13,-15,101,-32,-34,105,106,-35,107,-36,108,-37,109,-5,-31,-33,110,-7,-8,-9,-10,-4,-6,]),'TEXT':([47,51,66,67,68,69,70,71,72,73,74,76,77,78,92,93,100,101,102,103,104,105,106,107,108,109,110,],[-14,77,77,95,97,99,-11,-12,-13,-15,77,102,-32,-34,77,102,102,-5,-31,-33,102,-7,-8,-9,-10,-4,-6,]),'STRING':([52,53,55,56,58,60,61,64,],[79,80,82,83,85,87,88,91,]),'NUMBER':([54,57,59,62,63,],[81,84,86,89,90,]),}
+
+_lr_action = {}
+for _k, _v in _lr_action_items.items():
+   for _x,_y in zip(_v[0],_v[1]):
+      if not _x in _lr_action:  _lr_action[_x] = {}
+      _lr_action[_x][_k] = _y
+del _lr_action_items
+
+_lr_goto_items = {'document':([0,],[1,]),'instructions':([0,],[2,]),'instruction':([0,2,51,66,74,76,92,93,100,104,],[3,13,78,78,78,103,78,103,103,103,]),'arguments':([14,15,19,20,21,22,],[23,39,44,45,46,48,]),'argument':([14,15,19,20,21,22,50,],[25,25,25,25,25,25,75,]),'content':([51,66,74,92,],[76,93,100,104,]),'bold_content':([67,],[94,]),'italic_content':([68,],[96,]),'underlined_content':([69,],[98,]),}
+
+_lr_goto = {}
+for _k, _v in _lr_goto_items.items():
+   for _x, _y in zip(_v[0], _v[1]):
+       if not _x in _lr_goto: _lr_goto[_x] = {}
+       _lr_goto[_x][_k] = _y
+del _lr_goto_items
+_lr_productions = [
+  ("S' -> document","S'",1,None,None,None),
+  ('document -> instructions','document',1,'p_document','pdfParser.py',46),
+  ('instructions -> instructions instruction','instructions',2,'p_instructions','pdfParser.py',55),
+  ('instructions -> instruction','instructions',1,'p_instructions','pdfParser.py',56),
+  ('instruction -> TITLE LPAREN arguments RPAREN LBRACE content RBRACE','instruction',7,'p_instruction','pdfParser.py',66),
+  ('instruction -> TITLE LPAREN RPAREN LBRACE content RBRACE','instruction',6,'p_instruction','pdfParser.py',67),
+  ('instruction -> SECTION LPAREN arguments RPAREN LBRACE content RBRACE','instruction',7,'p_instruction','pdfParser.py',68),
+  ('instruction -> SECTION LPAREN RPAREN LBRACE content RBRACE','instruction',6,'p_instruction','pdfParser.py',69),
+  ('instruction -> BOLD LPAREN RPAREN LBRACE bold_content RBRACE','instruction',6,'p_instruction','pdfParser.py',70),
+  ('instruction -> ITALIC LPAREN RPAREN LBRACE italic_content RBRACE','instruction',6,'p_instruction','pdfParser.py',71),
+  ('instruction -> UNDERLINED LPAREN RPAREN LBRACE underlined_content RBRACE','instruction',6,'p_instruction','pdfParser.py',72),
+  ('instruction -> STYLE LPAREN arguments RPAREN','instruction',4,'p_instruction','pdfParser.py',73),
+  ('instruction -> PAGE_NUMBER LPAREN arguments RPAREN','instruction',4,'p_instruction','pdfParser.py',74),
+  ('instruction -> NUMBERIZE_TITLE LPAREN arguments RPAREN','instruction',4,'p_instruction','pdfParser.py',75),
+  ('instruction -> NUMBERIZE_TITLE LPAREN RPAREN','instruction',3,'p_instruction','pdfParser.py',76),
+  ('instruction -> INCLUDE LPAREN arguments RPAREN','instruction',4,'p_instruction','pdfParser.py',77),
+  ('arguments -> arguments COMMA argument','arguments',3,'p_arguments','pdfParser.py',94),
+  ('arguments -> argument','arguments',1,'p_arguments','pdfParser.py',95),
+  ('argument -> ARG_NAME EQUALS STRING','argument',3,'p_argument','pdfParser.py',103),
+  ('argument -> ARG_STYLE EQUALS STRING','argument',3,'p_argument','pdfParser.py',104),
+  ('argument -> ARG_FONT_SIZE EQUALS NUMBER','argument',3,'p_argument','pdfParser.py',105),
+  ('argument -> ARG_FONT EQUALS STRING','argument',3,'p_argument','pdfParser.py',106),
+  ('argument -> ARG_FONT_COLOR EQUALS STRING','argument',3,'p_argument','pdfParser.py',107),
+  ('argument -> ARG_LEVEL EQUALS NUMBER','argument',3,'p_argument','pdfParser.py',108),
+  ('argument -> ARG_PAGE_NUMBER_POSITION EQUALS STRING','argument',3,'p_argument','pdfParser.py',109),
+  ('argument -> ARG_PAGE_NUMBER_FONT_SIZE EQUALS NUMBER','argument',3,'p_argument','pdfParser.py',110),
+  ('argument -> ARG_PAGE_NUMBER_FONT EQUALS STRING','argument',3,'p_argument','pdfParser.py',111),
+  ('argument -> ARG_PAGE_NUMBER_FONT_COLOR EQUALS STRING','argument',3,'p_argument','pdfParser.py',112),
+  ('argument -> ARG_PAGE_NUMBER_START EQUALS NUMBER','argument',3,'p_argument','pdfParser.py',113),
+  ('argument -> ARG_NUMBERIZE_TITLE_START EQUALS NUMBER','argument',3,'p_argument','pdfParser.py',114),
+  ('argument -> ARG_FILE EQUALS STRING','argument',3,'p_argument','pdfParser.py',115),
+  ('content -> content TEXT','content',2,'p_content','pdfParser.py',120),
+  ('content -> TEXT','content',1,'p_content','pdfParser.py',121),
+  ('content -> content instruction','content',2,'p_content','pdfParser.py',122),
+  ('content -> instruction','content',1,'p_content','pdfParser.py',123),
+  ('bold_content -> TEXT','bold_content',1,'p_bold_content','pdfParser.py',131),
+  ('italic_content -> TEXT','italic_content',1,'p_italic_content','pdfParser.py',135),
+  ('underlined_content -> TEXT','underlined_content',1,'p_underlined_content','pdfParser.py',139),
+]
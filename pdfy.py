@@ -7,47 +7,273 @@ Date: 26.01.2025
 """
 
 # System imports
+import os
 import sys
+import contextlib
 
-# Import the lexer and parser
-from pdfLexer import lexer
-from pdfParser import parser
-from pdfSemantic import semantical_analysis
-from pdfGenerator import create_pdf
+# Import the compiler (owns its lexer and parser)
+from pdfCompiler import Compiler, lexer_backends, default_lexer_backend
 
-# For Generating the tree
-from generate_ast import generate_tree_image
+
+# Options printing debugging infos instead of compiling
+debug_options = ["-l", "-p", "-s"]
 
 
 # Helper functions for printing the infos 
 def print_help():
     print("Usage: python pdfy.py <input_file> <output_file> -[l/p/s]")
+    print("  <input_file> / <output_file>: - reads the source from stdin / writes the PDF to stdout (messages go to stderr)")
     print("Options:")
     print("  -l: Print the tokens")
-    print("  -p: Parse the input")
+    print("  -p: Parse the input, print the outline of the syntax tree and write it to parse_tree.dot")
+    print("  --ast-format <dot|json|outline>: with -p, format of the tree file (outline : no file, default: dot)")
+    print("  --ast-output <file>: with -p, file of the tree, - for stdout (default: parse_tree.dot / parse_tree.json)")
+    print("  --ast-depth <n> / --ast-nodes <n>: with -p, show the nodes down to depth n / the first n nodes (0 : all, default: 5000), the rest is collapsed")
     print("  -s: Run the semantic analysis")
     print("  -h: use <python pdfy.py -h> for help")
+    print("  --stream: compile in bounded memory, one top-level instruction at a time")
+    print("  --watch [--interval <s>] [--debounce <s>]: rebuild incrementally each time the source (or a font it uses) is saved, in a warm process")
+    print("  --incremental: reuse the analysis and layout of the unchanged instructions of the previous build (cache in .pdfy_cache/)")
+    print("  --lexer <ply|fast>: lexer backend (default: ply), fast is a single regex lexer emitting the same tokens")
+    print("  --low-memory: lay out the document section by section and keep the finished pages compressed (same PDF)")
+    print("  --parallel [-j <workers>]: build the paragraphs and break their lines in worker processes (default: number of CPUs), same PDF")
+    print("  --profile: compile and report the time and memory of each stage and the slowest instructions")
+    print("  --profile-format <text|json>: format of the profile report (default: text)")
+    print("  --cprofile <file>: with --profile, dump the cProfile statistics of the compilation to file (read with pstats)")
+    print("  --cache: reuse the PDF of an already compiled source (same source, compiler, defaults and fonts), also in batch mode")
+    print("  --cache-dir <dir>: directory of the output cache (default: .pdfy_cache/output)")
+    print("  --cache-size <MiB>: size of the output cache, the least recently used PDFs are removed (default: 256)")
+    print("  --cache-stats: print the hits, misses and size of the output cache")
+    print("  --ir-cache [--ir-cache-dir <dir>]: reuse the analysed IR of an already analysed source, whatever the output options, also in batch mode (default: .pdfy_cache/ir)")
+    print("  --font-dir <dir>: TrueType fonts usable by #font and #pageNumberFont (Brand.ttf -> \"Brand\"), also in batch mode")
+    print()
+    print("Batch mode: python pdfy.py --batch <directory|glob|file|manifest> [<output_dir>] [-j <workers>]")
+    print("  directory: compiles every *.pdfy file of the directory")
+    print("  glob: compiles every file matching the pattern (quote it), files of different directories keep their relative directory in <output_dir>")
+    print("  manifest: .json, .txt or .list file giving the output name of each input (tab separated for text)")
+    print("  --manifest <file>: read file as a manifest whatever its extension")
+    print("  -j: number of worker processes (default: number of CPUs)")
+    print()
+    print("Server mode: python pdfy.py --serve [--host 127.0.0.1] [--port 8631] [--socket <path>] [-j <workers>] [--queue 64] [--timeout 30] [--strict]")
+    print("  POST /compile with the source as body returns the PDF, GET /health the state of the server")
+    print("  --socket: listen on a unix socket instead of host:port")
+    print("  --queue: requests waiting for a worker before new ones are answered 503")
+    print("  --timeout: seconds before a compilation is answered 504")
+    print("  --strict: no PDF (422) when the document has errors")
+    print()
+    print("Check mode: python pdfy.py --check <file|directory|glob>... [-j <workers>] [--format <text|json>]")
+    print("  lex, parse and analyse the sources without generating PDFs (reportlab is not imported)")
+    print("  directory: checks every *.pdfy file of the directory and its subdirectories")
+    print("  --format: one diagnostic per line, file:line: severity: message (text, default) or a JSON object (json)")
+    print("  exits with status 1 when a source has errors")
     exit(0)
 
-def print_lexer(input_string):
-    lexer.input(input_string)
+def usage_error(message):
+    """Print an error about the command line and exit with status 1."""
+    print(f"Error: {message}, use <python pdfy.py -h> for help", file=sys.stderr)
+    exit(1)
+
+# Converters of the option values : a value they refuse raises ValueError
+def positive_int(text):
+    value = int(text)
+    if value < 1:
+        raise ValueError(text)
+    return value
+
+def non_negative_int(text):
+    value = int(text)
+    if value < 0:
+        raise ValueError(text)
+    return value
+
+def positive_float(text):
+    value = float(text)
+    if not value > 0:  # Also refuses nan
+        raise ValueError(text)
+    return value
+
+def non_negative_float(text):
+    value = float(text)
+    if not value >= 0:
+        raise ValueError(text)
+    return value
+
+def convert_option(name, text, kind=str, choices=None):
+    """Value of the option name given as text, converted with kind. An invalid value exits with a usage error."""
+    try:
+        value = kind(text)
+    except ValueError:
+        usage_error(f"invalid value {text!r} for {name}")
+    if choices is not None and value not in choices:
+        usage_error(f"invalid value {text!r} for {name} (one of {', '.join(choices)})")
+    return value
+
+def option_value(options, name, default=None, kind=str, choices=None):
+    """
+    Value of the option name (the argument after it) converted with kind, default when the option
+    is not given. A missing or invalid value exits with a usage error.
+    """
+    if name not in options:
+        return default
+    index = options.index(name) + 1
+    if index >= len(options):
+        usage_error(f"{name} needs a value")
+    return convert_option(name, options[index], kind, choices)
+
+def read_source(input_file):
+    """Source of the input file, - : the standard input."""
+    if input_file == "-":
+        return sys.stdin.read()
+    with open(input_file, 'r') as f:
+        return f.read()
+
+def output_cache(options):
+    """Output cache of the options (--cache, --cache-dir, --cache-size), None without --cache."""
+    if "--cache" not in options:
+        return None
+    from pdfOutputCache import OutputCache, default_cache_dir, default_max_size
+    cache_dir = option_value(options, "--cache-dir", default_cache_dir)
+    max_size = option_value(options, "--cache-size", None, non_negative_float)
+    return OutputCache(cache_dir, int(max_size * 1024 * 1024) if max_size is not None else default_max_size)
+
+def ir_cache(options):
+    """IR cache of the options (--ir-cache, --ir-cache-dir), None without --ir-cache."""
+    if "--ir-cache" not in options:
+        return None
+    from pdfIrCache import IrCache, default_cache_dir
+    return IrCache(option_value(options, "--ir-cache-dir", default_cache_dir))
+
+def print_cache_stats(cache):
+    from pdfOutputCache import format_statistics
+    print(format_statistics(cache.statistics()))
+
+def print_lexer(compiler, input_string):
     print("Tokens:")
-    while True:
-        tok = lexer.token()
-        if not tok:
-            break
+    for tok in compiler.tokenize(input_string):
         print(tok)
 
-def print_parser(input_string):
-    parsed_data = parser.parse(input_string)
+def print_parser(compiler, input_string, options):
+    from generate_ast import write_outline, write_tree, default_max_nodes
+
+    # Tree caps : depth of the nodes shown and number of nodes (0 : no limit), the rest is collapsed
+    max_depth = option_value(options, "--ast-depth", 0, non_negative_int) or None
+    max_nodes = option_value(options, "--ast-nodes", default_max_nodes, non_negative_int)
+    ast_format = option_value(options, "--ast-format", "dot", choices=("dot", "json", "outline"))
+    ast_output = option_value(options, "--ast-output")
+
+    parsed_data = compiler.parse(input_string)
     print("Parsed data:")
     print("-------------")
-    print(parsed_data)
-    generate_tree_image(parsed_data)
+    if parsed_data is None:
+        print("No syntax tree, the document could not be parsed")
+        return
+
+    write_outline(parsed_data, sys.stdout, max_depth, max_nodes)
+
+    # The tree file (DOT by default, rendered by graphviz as a separate step)
+    if ast_format != "outline":
+        ast_file = write_tree(parsed_data, ast_format, ast_output, max_depth, max_nodes)
+        if ast_file != "-":
+            print(f"\nSyntax tree written to '{ast_file}'")
+            if ast_format == "dot":
+                print(f"Render it with: python generate_ast.py {ast_file} png (needs the dot program of graphviz)")
     print()
 
-def print_semantic(parsed_data):
-    semantical_styles, semantical_page_number, semantical_title_numberization, semandical_doc_content, _, _ = semantical_analysis(parsed_data, print_errors=True)
+def run_batch_mode(arguments):
+    from pdfBatch import collect_jobs, run_batch, print_summary
+
+    target = None
+    output_dir = None
+    workers = None
+    manifest = False
+
+    cache = output_cache(arguments)
+
+    i = 0
+    while i < len(arguments):
+        if arguments[i] in ("-j", "--manifest", "--cache-dir", "--cache-size", "--ir-cache-dir") and i + 1 == len(arguments):
+            usage_error(f"{arguments[i]} needs a value")
+        if arguments[i] == "-j":
+            workers = convert_option("-j", arguments[i + 1], positive_int)
+            i += 1
+        elif arguments[i] == "--manifest":
+            target = arguments[i + 1]
+            manifest = True
+            i += 1
+        elif arguments[i] in ("--cache-dir", "--cache-size", "--ir-cache-dir"):
+            i += 1
+        elif arguments[i] in ("--cache", "--cache-stats", "--ir-cache"):
+            pass
+        elif target is None:
+            target = arguments[i]
+        else:
+            output_dir = arguments[i]
+        i += 1
+
+    if target is None:
+        print("No batch input given, use <python pdfy.py -h> for help")
+        exit(1)
+
+    try:
+        jobs = collect_jobs(target, output_dir, manifest)
+    except ValueError as e:
+        print(f"Error: {e}")
+        exit(1)
+    if not jobs:
+        print(f"No file to compile found for {target}")
+        exit(1)
+
+    results = run_batch(jobs, workers, output_cache=cache, ir_cache=ir_cache(arguments))
+    failed = print_summary(results)
+    if cache and "--cache-stats" in arguments:
+        print_cache_stats(cache)
+    exit(1 if failed else 0)
+
+def run_check_mode(arguments):
+    from pdfCheck import run_check
+
+    targets = []
+    workers = None
+    output_format = "text"
+
+    i = 0
+    while i < len(arguments):
+        if arguments[i] in ("-j", "--format") and i + 1 == len(arguments):
+            usage_error(f"{arguments[i]} needs a value")
+        if arguments[i] == "-j":
+            workers = convert_option("-j", arguments[i + 1], positive_int)
+            i += 1
+        elif arguments[i] == "--format":
+            output_format = convert_option("--format", arguments[i + 1], choices=("text", "json"))
+            i += 1
+        else:
+            targets.append(arguments[i])
+        i += 1
+
+    if not targets:
+        print("No file to check given, use <python pdfy.py -h> for help")
+        exit(1)
+
+    _, errors, _ = run_check(targets, workers, output_format)
+    exit(1 if errors else 0)
+
+def run_server_mode(arguments):
+    from pdfServer import serve, default_host, default_port, default_queue_size, default_timeout
+
+    serve(
+        host=option_value(arguments, "--host", default_host),
+        port=option_value(arguments, "--port", default_port, non_negative_int),
+        unix_socket=option_value(arguments, "--socket"),
+        workers=option_value(arguments, "-j", None, positive_int),
+        queue_size=option_value(arguments, "--queue", default_queue_size, non_negative_int),
+        timeout=option_value(arguments, "--timeout", default_timeout, positive_float),
+        strict="--strict" in arguments,
+        output_cache=output_cache(arguments),
+    )
+
+def print_semantic(compiler, parsed_data, source_file=None):
+    resolution = compiler.resolve_includes(parsed_data, source_file)
+    semantical_styles, semantical_page_number, semantical_title_numberization, semandical_doc_content, _, _ = compiler.analyze_resolution(resolution)
     print("Semantic data:")
     print("-------------")
     print("\nStyles:", semantical_styles)
@@ -64,39 +290,103 @@ if __name__ == '__main__':
     input_string = ""
     output_file = ""
 
+    # Font directory, for every mode
+    if "--font-dir" in sys.argv[1:]:
+        from pdfFonts import set_font_dir
+        font_dir = option_value(sys.argv, "--font-dir")
+        font_dir_index = sys.argv.index("--font-dir")
+        set_font_dir(font_dir)
+        del sys.argv[font_dir_index:font_dir_index + 2]
+
     if len(sys.argv) > 1:
 
         if sys.argv[1] == "-h":
             print_help()
+        elif sys.argv[1] == "--batch":
+            run_batch_mode(sys.argv[2:])
+        elif sys.argv[1] == "--check":
+            run_check_mode(sys.argv[2:])
+        elif sys.argv[1] == "--serve":
+            run_server_mode(sys.argv[2:])
         else:
 
-            with open(sys.argv[1], 'r') as f:
-                input_string = f.read()
+            input_file = sys.argv[1]
+            output_file = sys.argv[2] if len(sys.argv) > 2 else ""
+            if not output_file:
+                print("No output file given, use <python pdfy.py -h> for help")
+                exit(1)
 
-                if len(sys.argv) > 2:
-                    output_file = sys.argv[2]
-                else:
-                    print("No output file given, use <python pdfy.py -h> for help")
+            options = sys.argv[3:]
+            # Directory of the $include paths (the current directory for the standard input)
+            source_file = input_file if input_file != "-" else None
+            lexer_backend = option_value(options, "--lexer", default_lexer_backend, choices=tuple(lexer_backends))
 
-                
+            compiler = Compiler(print_errors=True, lexer_backend=lexer_backend)
+
+            # - as output : the PDF goes to the standard output, every message to the standard error
+            to_stdout = output_file == "-"
+            if to_stdout:
+                if "--watch" in options or "--incremental" in options:
+                    print("--watch and --incremental need an output file, not -", file=sys.stderr)
+                    exit(1)
+                output_file = sys.stdout.buffer
+
+            with contextlib.redirect_stdout(sys.stderr) if to_stdout else contextlib.nullcontext():
+
+                # The streaming compilation reads the input itself, by blocks
+                if "--stream" not in options or any(option in debug_options for option in options):
+                    input_string = read_source(input_file)
 
                 # Check if the user wants to print the tokens
                 for i in range(3, len(sys.argv)):
                     if len(sys.argv) > i and sys.argv[i] == "-l":
-                        print_lexer(input_string)
+                        print_lexer(compiler, input_string)
                     elif len(sys.argv) > i and sys.argv[i] == "-p":
-                        print_parser(input_string)
+                        print_parser(compiler, input_string, options)
                     elif len(sys.argv) > i and sys.argv[i] == "-s":
-                        parsed_data = parser.parse(input_string)
-                        print_semantic(parsed_data)
+                        parsed_data = compiler.parse(input_string)
+                        print_semantic(compiler, parsed_data, source_file)
+
+                # Compile when no debugging option is given
+                if not any(option in debug_options for option in options):
+                    render_workers = None
+                    if "--parallel" in options:
+                        render_workers = option_value(options, "-j", os.cpu_count(), positive_int)
+
+                    if "--profile" in options:
+                        from pdfProfile import format_profile
+                        profile_format = option_value(options, "--profile-format", "text", choices=("text", "json"))
+                        cprofile_file = option_value(options, "--cprofile")
+                        # Same compilation as without --profile
+                        compiler = Compiler(print_errors=True, lexer_backend=lexer_backend, low_memory="--low-memory" in options,
+                                            render_workers=render_workers, output_cache=output_cache(options), ir_cache=ir_cache(options))
+                        # The JSON report is the only output on the standard output, the messages go to the standard error
+                        with contextlib.redirect_stdout(sys.stderr) if profile_format == "json" else contextlib.nullcontext():
+                            profile = compiler.profile(input_string, output_file, cprofile_file=cprofile_file, source_file=source_file)
+                        print(format_profile(profile, profile_format))
+                    elif "--watch" in options:
+                        from pdfWatch import watch, default_interval, default_debounce
+                        interval = option_value(options, "--interval", default_interval, positive_float)
+                        debounce = option_value(options, "--debounce", default_debounce, non_negative_float)
+                        watch(input_file, output_file, Compiler(print_errors=True, lexer_backend=lexer_backend), interval=interval, debounce=debounce)
+                    elif "--stream" in options:
+                        from pdfStream import compile_stream
+                        compile_stream(sys.stdin if input_file == "-" else input_file, output_file, Compiler(lexer_backend=lexer_backend))
+                    elif "--incremental" in options:
+                        from pdfIncremental import IncrementalCompiler
+                        incremental = IncrementalCompiler(compiler=Compiler(lexer_backend=lexer_backend))
+                        incremental.compile(input_string, output_file, source_file)
+                        print(f"Incremental build: {incremental.stats['reused']} instructions reused, {incremental.stats['analysed']} analysed, {incremental.stats['built']} items laid out from scratch")
+                    else:
+                        cache = output_cache(options)
+                        Compiler(lexer_backend=lexer_backend, low_memory="--low-memory" in options, render_workers=render_workers,
+                                 output_cache=cache, ir_cache=ir_cache(options)).compile(input_string, output_file, source_file)
+                        if cache and "--cache-stats" in options:
+                            print_cache_stats(cache)
 
-                if len(sys.argv) == 3:
-                    parsed_data = parser.parse(input_string)
-                    semantical_styles, semantical_page_number, _ , semandical_doc_content, _, _ = semantical_analysis(parsed_data)
-                    semantic_data = {"Styles": semantical_styles, "PageNumberConfig": semantical_page_number , "Content": semandical_doc_content}
-                    create_pdf(semantic_data)
+            if to_stdout:
+                sys.stdout.buffer.flush()
 
-            
     else:
         print("No file to compile given, use <python pdfy.py -h> for help")
 
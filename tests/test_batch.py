@@ -0,0 +1,51 @@
+"""
+Module:
+3250.1 Compilateurs
+Auteur:
+WICKI Sélien
+Date: 18.10.2026
+"""
+
+# System imports
+import os
+import glob
+import shutil
+
+import pytest
+
+from pdfBatch import collect_jobs, run_batch
+from pdfCheck import check_source
+
+# Example sources of the repository
+root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+examples = sorted(glob.glob(os.path.join(root, "*Code", "*.txt")))
+
+
+@pytest.fixture(scope="module")
+def batch(tmp_path_factory):
+    """Summary entries of a batch compiling a copy of every example (as .pdfy files), by file name."""
+    sources = tmp_path_factory.mktemp("sources")
+    for path in examples:
+        shutil.copy(path, sources / (os.path.basename(path)[:-len(".txt")] + ".pdfy"))
+    results = run_batch(collect_jobs(str(sources), str(tmp_path_factory.mktemp("pdf"))), workers=2)
+    return {os.path.basename(result["input"]): result for result in results}
+
+
+def counts(diagnostics):
+    errors = sum(1 for item in diagnostics if item["severity"] == "error")
+    return errors, len(diagnostics) - errors
+
+
+@pytest.mark.parametrize("path", examples, ids=os.path.basename)
+def test_batch_and_check_count_the_same_messages(batch, path):
+    result = batch[os.path.basename(path)[:-len(".txt")] + ".pdfy"]
+    with open(path, 'r') as f:
+        diagnostics = check_source(f.read(), path)
+    assert (len(result["errors"]), len(result["warnings"])) == counts(diagnostics)
+    assert result["status"] == ("error" if result["errors"] else "ok")
+    assert os.path.exists(result["output"]) == (result["status"] == "ok")
+
+
+def test_valid_example_has_no_errors(batch):
+    assert batch["valid.pdfy"]["status"] == "ok"
+    assert sum(result["status"] != "ok" for result in batch.values()) == len(examples) - 1
@@ -0,0 +1,83 @@
+"""
+Module:
+3250.1 Compilateurs
+Auteur:
+WICKI Sélien
+Date: 18.10.2026
+"""
+
+# System imports
+import io
+
+import pytest
+
+from pdfCompiler import Compiler
+from pdfIncremental import IncrementalCompiler
+from pdfOutputCache import OutputCache
+from pdfIrCache import IrCache
+from synthetic_document import generate_document
+
+# A valid document followed by instructions with errors and warnings
+source = generate_document(60) + (
+    '$section(#style="missing"){Unknown style.}\n'
+    '$style(#name="huge", #fontSize=500)\n'
+    '$bold(){Outside of a section.}\n'
+)
+
+
+def compile_bytes(compiler, text=source):
+    pdf, errors, warnings = compiler.compile_bytes(text)
+    assert pdf is not None
+    return pdf, errors, warnings
+
+
+@pytest.fixture(scope="module")
+def expected():
+    return compile_bytes(Compiler(invariant=True))
+
+
+def test_messages_of_the_document(expected):
+    _, errors, warnings = expected
+    assert len(errors) == 2
+    assert warnings
+
+
+def test_low_memory_gives_the_same_pdf(expected):
+    assert compile_bytes(Compiler(invariant=True, low_memory=True)) == expected
+
+
+def test_output_cache_gives_the_same_pdf(expected, tmp_path):
+    cache = OutputCache(str(tmp_path / "output"))
+    compiler = Compiler(invariant=True, output_cache=cache)
+    assert compile_bytes(compiler) == expected
+    assert compile_bytes(compiler) == expected
+    assert cache.stats["hits"] == 1 and cache.stats["misses"] == 1
+    assert cache.statistics()["hits"] == 1
+
+
+def test_ir_cache_gives_the_same_pdf(expected, tmp_path):
+    compiler = Compiler(invariant=True, ir_cache=IrCache(str(tmp_path / "ir")))
+    assert compile_bytes(compiler) == expected
+    assert compile_bytes(compiler) == expected
+
+
+def test_incremental_gives_the_same_pdf(expected, tmp_path):
+    incremental = IncrementalCompiler(cache_dir=str(tmp_path), compiler=Compiler(invariant=True))
+    output_file = str(tmp_path / "incremental.pdf")
+
+    def build(text):
+        messages = incremental.compile(text, output_file)
+        with open(output_file, 'rb') as f:
+            return (f.read(), *messages)
+
+    assert build(source) == expected
+
+    # One changed section : only it is analysed and laid out again
+    edited = source.replace("Chapter 10 ", "Chapter ten ", 1)
+    assert build(edited) == compile_bytes(Compiler(invariant=True), edited)
+    assert incremental.stats["analysed"] == 1 and incremental.stats["built"] == 1
+
+
+def test_syntax_errors_are_errors():
+    errors, warnings = Compiler().compile("$section{\n$title(#level=1){T}\n}\n", io.BytesIO())
+    assert errors and all(message.startswith("Error: Syntax error") for message in errors)
@@ -0,0 +1,51 @@
+"""
+Module:
+3250.1 Compilateurs
+Auteur:
+WICKI Sélien
+Date: 18.10.2026
+"""
+
+# System imports
+import os
+import shutil
+
+import pytest
+import reportlab
+
+import pdfFonts
+from pdfWatch import Watcher
+
+# TrueType fonts shipped with reportlab
+reportlab_fonts = os.path.join(os.path.dirname(reportlab.__file__), "fonts")
+
+source = '$style(#name="brand", #font="Brand")\n$section(#style="brand"){Text in the font of the directory.}\n'
+
+
+@pytest.fixture
+def font_dir(tmp_path):
+    fonts = tmp_path / "fonts"
+    fonts.mkdir()
+    pdfFonts.set_font_dir(str(fonts), cache_dir=str(tmp_path / "font_cache"))
+    yield fonts
+    pdfFonts.set_font_dir(None)
+
+
+def test_swapped_font_file_changes_the_pdf(tmp_path, font_dir):
+    brand = font_dir / "Brand.ttf"
+    shutil.copy(os.path.join(reportlab_fonts, "Vera.ttf"), brand)
+    input_file = tmp_path / "document.pdfy"
+    input_file.write_text(source)
+    output_file = tmp_path / "document.pdf"
+
+    watcher = Watcher(str(input_file), str(output_file), cache_dir=str(tmp_path / "cache"))
+    watcher.build()
+    before = output_file.read_bytes()
+    assert b"BitstreamVeraSans-Roman" in before
+
+    shutil.copy(os.path.join(reportlab_fonts, "VeraBd.ttf"), brand)
+    watcher.build([str(brand)])
+    after = output_file.read_bytes()
+    assert after != before
+    assert b"BitstreamVeraSans-Bold" in after
+    assert b"BitstreamVeraSans-Roman" not in after
@@ -0,0 +1,36 @@
+"""
+Module:
+3250.1 Compilateurs
+Auteur:
+WICKI Sélien
+Date: 18.10.2026
+"""
+
+# System imports
+from reportlab.lib.styles import ParagraphStyle
+from reportlab.platypus import Paragraph
+
+import pdfGenerator
+from pdfGenerator import PlainParagraph, plain_frags
+
+text = " ".join(f"word{i}" for i in range(200))
+
+
+def lines(paragraph, width=300):
+    paragraph.wrap(width, 10000)
+    return [(round(extra, 6), words) for extra, words in paragraph.blPara.lines]
+
+
+def test_plain_paragraph_breaks_lines_as_paragraph():
+    style = ParagraphStyle("plain")
+    assert lines(PlainParagraph(text, style, frags=plain_frags(text, style))) == lines(Paragraph(text, style))
+
+
+def test_style_without_a_flag_falls_back_to_paragraph(monkeypatch):
+    style = ParagraphStyle("plain")
+    monkeypatch.setattr(pdfGenerator, "plain_style_flags", pdfGenerator.plain_style_flags + ("unknownFlag",))
+    broken = []
+    monkeypatch.setattr(Paragraph, "breakLines", lambda self, width, original=Paragraph.breakLines: broken.append(width) or original(self, width))
+    plain_lines = lines(PlainParagraph(text, style, frags=plain_frags(text, style)))
+    assert broken
+    assert plain_lines == lines(Paragraph(text, style))
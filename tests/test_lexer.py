@@ -0,0 +1,30 @@
+"""
+Module:
+3250.1 Compilateurs
+Auteur:
+WICKI Sélien
+Date: 18.10.2026
+"""
+
+# System imports
+import pytest
+
+from pdfLexer import lexer as ply_lexer
+from pdfFastLexer import lexer as fast_lexer
+from lexer_equivalence import corpus, tokens
+from synthetic_document import generate_document
+
+documents = list(corpus(200, seed=0))
+
+
+@pytest.mark.parametrize("source", [source for _, source in documents], ids=[name for name, _ in documents])
+def test_fast_lexer_gives_the_tokens_of_ply(source):
+    assert tokens(fast_lexer, source) == tokens(ply_lexer, source)
+
+
+@pytest.mark.parametrize("separator", ["\n", " "])
+def test_fast_lexer_on_generated_documents(separator):
+    source = generate_document(300, inline_density=1.5, separator=separator)
+    stream, messages = tokens(fast_lexer, source)
+    assert (stream, messages) == tokens(ply_lexer, source)
+    assert not messages